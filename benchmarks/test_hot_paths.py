@@ -0,0 +1,31 @@
+"""pytest-benchmark suite over the ``private_ops.bench`` cases.
+
+Usage: pip install pytest-benchmark && python -m pytest benchmarks --benchmark-only
+Size the graph with BENCH_NODES / BENCH_SHAPE; ``private-ops bench`` runs the same
+cases without the plugin and writes the JSON report and baseline comparison.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from private_ops.bench import CASES, synthetic_graph
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return synthetic_graph(
+        int(os.getenv("BENCH_NODES", "10000")),
+        shape=os.getenv("BENCH_SHAPE", "star"),
+    )
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_case(benchmark, graph, name: str) -> None:
+    batches = CASES[name](graph)
+    benchmark.extra_info["ops"] = sum(items for _, items in batches)
+    benchmark(lambda: [op() for op, _ in batches])
@@ -1,3 +1,15 @@
-from private_ops.adapters.maltego import to_maltego_mapping
+from private_ops.adapters.maltego import (
+    MaltegoXmlWriter,
+    iter_maltego_entities,
+    iter_maltego_links,
+    to_maltego_mapping,
+)
+from private_ops.adapters.ndjson import NdjsonGraphWriter
 
-__all__ = ["to_maltego_mapping"]
+__all__ = [
+    "to_maltego_mapping",
+    "iter_maltego_entities",
+    "iter_maltego_links",
+    "MaltegoXmlWriter",
+    "NdjsonGraphWriter",
+]
@@ -1,35 +1,266 @@
 from __future__ import annotations
 
-from typing import Any
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache
+from typing import Any, BinaryIO
+from xml.etree import ElementTree
 
-from private_ops.protocol.models import GraphPayload
+from private_ops.protocol.models import Edge, GraphPayload, Node, TransformRequest
+from private_ops.telemetry import span
+
+
+def maltego_entity(node: Node) -> dict[str, Any]:
+    return {
+        "id": node.id,
+        "type": node.type,
+        "value": node.label,
+        "canonical_key": node.canonical_key,
+        "properties": node.properties,
+    }
+
+
+def maltego_link(edge: Edge) -> dict[str, Any]:
+    return {
+        "id": edge.id,
+        "type": edge.type,
+        "from": edge.from_id,
+        "to": edge.to_id,
+        "canonical_key": edge.canonical_key,
+        "properties": edge.properties,
+    }
+
+
+def iter_maltego_entities(nodes: Iterable[Node]) -> Iterator[dict[str, Any]]:
+    return map(maltego_entity, nodes)
+
+
+def iter_maltego_links(edges: Iterable[Edge]) -> Iterator[dict[str, Any]]:
+    return map(maltego_link, edges)
 
 
 def to_maltego_mapping(graph: GraphPayload) -> dict[str, Any]:
-    entities: list[dict[str, Any]] = []
-    links: list[dict[str, Any]] = []
-
-    for node in graph.nodes:
-        entities.append(
-            {
-                "id": node.id,
-                "type": node.type,
-                "value": node.label,
-                "canonical_key": node.canonical_key,
-                "properties": node.properties,
-            }
-        )
-
-    for edge in graph.edges:
-        links.append(
-            {
-                "id": edge.id,
-                "type": edge.type,
-                "from": edge.from_id,
-                "to": edge.to_id,
-                "canonical_key": edge.canonical_key,
-                "properties": edge.properties,
-            }
-        )
-
-    return {"entities": entities, "links": links}
+    with span("maltego_mapping", entities=len(graph.nodes), links=len(graph.edges)):
+        return {
+            "entities": list(iter_maltego_entities(graph.nodes)),
+            "links": list(iter_maltego_links(graph.edges)),
+        }
+
+
+MALTEGO_ENTITY_TYPES = {
+    "phone": "maltego.PhoneNumber",
+    "email": "maltego.EmailAddress",
+    "person": "maltego.Person",
+    "organization": "maltego.Organization",
+    "domain": "maltego.Domain",
+    "ip": "maltego.IPv4Address",
+    "url": "maltego.URL",
+}
+_ENTITY_TYPES_BY_MALTEGO = {v: k for k, v in MALTEGO_ENTITY_TYPES.items()}
+
+
+def maltego_entity_type(entity_type: str) -> str:
+    return MALTEGO_ENTITY_TYPES.get(entity_type, f"private_ops.{entity_type}")
+
+
+def entity_type_from_maltego(maltego_type: str) -> str:
+    known = _ENTITY_TYPES_BY_MALTEGO.get(maltego_type)
+    if known is not None:
+        return known
+    return maltego_type.rsplit(".", 1)[-1].lower()
+
+
+def parse_maltego_request(body: bytes, transform: str) -> TransformRequest:
+    """Map a Maltego ``MaltegoTransformRequestMessage`` onto a ``TransformRequest``.
+
+    The first input entity's value becomes ``inputs[<entity type>]``; its
+    additional fields and the transform fields are passed through as inputs.
+    """
+    root = ElementTree.fromstring(body)
+    message = root.find("MaltegoTransformRequestMessage")
+    if message is None:
+        raise ValueError("missing MaltegoTransformRequestMessage")
+    entity = message.find("Entities/Entity")
+    if entity is None:
+        raise ValueError("request has no input entity")
+
+    inputs: dict[str, Any] = {}
+    field_groups = (
+        entity.findall("AdditionalFields/Field"),
+        message.findall("TransformFields/Field"),
+    )
+    for fields in field_groups:
+        for item in fields:
+            name = item.get("Name")
+            if name:
+                inputs[name] = item.text or ""
+    entity_type = entity_type_from_maltego(entity.get("Type", ""))
+    inputs[entity_type] = (entity.findtext("Value") or "").strip()
+    return TransformRequest(transform=transform, inputs=inputs)
+
+
+_XML_ESCAPES = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        # Everything XML 1.0 forbids: C0 controls other than tab/LF/CR, lone
+        # surrogates and the U+FFFE/U+FFFF non-characters.
+        **{chr(c): None for c in range(32) if c not in (9, 10, 13)},
+        **{chr(c): None for c in range(0xD800, 0xE000)},
+        "\ufffe": None,
+        "\uffff": None,
+    }
+)
+_encode_value = json.JSONEncoder(sort_keys=True).encode
+
+
+def xml_escape(value: str) -> str:
+    """Escape text or attribute content; drops characters XML 1.0 forbids."""
+    if (
+        value.isprintable()
+        and "&" not in value
+        and "<" not in value
+        and ">" not in value
+        and '"' not in value
+    ):
+        return value
+    return value.translate(_XML_ESCAPES)
+
+
+@lru_cache(maxsize=1024)
+def _entity_open(entity_type: str) -> str:
+    return f'<Entity Type="{xml_escape(maltego_entity_type(entity_type))}"><Value>'
+
+
+@lru_cache(maxsize=4096)
+def _field_open(name: str) -> str:
+    escaped = xml_escape(name)
+    return f'<Field Name="{escaped}" DisplayName="{escaped}">'
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, str):
+        return xml_escape(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return xml_escape(_encode_value(value))
+
+
+def link_labels(edges: Iterable[Edge]) -> dict[str, str]:
+    """Target node id -> type of the first edge pointing at it."""
+    labels: dict[str, str] = {}
+    for edge in edges:
+        labels.setdefault(edge.to_id, edge.type)
+    return labels
+
+
+class MaltegoXmlWriter:
+    """Incremental writer for a ``MaltegoTransformResponseMessage``.
+
+    Entities are rendered straight from ``Node`` objects into a byte buffer
+    that is written to ``handle`` every ``buffer_bytes``, so a graph can be
+    streamed to a file or socket without building the mapping or an element
+    tree. Escaping uses a precomputed translate table and per-type/per-field
+    tag prefixes are cached. Maltego links every returned entity to the input
+    entity; an edge's type is carried as that entity's link label. Errors
+    become ``PartialError`` UI messages.
+    """
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        *,
+        buffer_bytes: int = 64 * 1024,
+        weight: int = 100,
+    ) -> None:
+        if buffer_bytes < 1:
+            raise ValueError("buffer_bytes must be >= 1")
+        self._handle = handle
+        self._buffer_bytes = buffer_bytes
+        self._parts: list[str] = [
+            "<MaltegoMessage>\n<MaltegoTransformResponseMessage>\n<Entities>\n"
+        ]
+        self._size = 0
+        self._weight = f"</Value><Weight>{int(weight)}</Weight>"
+        self._messages: list[tuple[str, str]] = []
+        self._closed = False
+        self.entities_written = 0
+
+    def _emit(self, chunk: str) -> None:
+        self._parts.append(chunk)
+        self._size += len(chunk)
+        if self._size >= self._buffer_bytes:
+            self._drain()
+
+    def _drain(self) -> None:
+        if self._parts:
+            self._handle.write("".join(self._parts).encode("utf-8"))
+            self._parts.clear()
+            self._size = 0
+
+    def flush(self) -> None:
+        self._drain()
+        self._handle.flush()
+
+    def write_entity(self, node: Node, *, link_label: str | None = None) -> None:
+        parts = [
+            _entity_open(node.type),
+            xml_escape(node.label),
+            self._weight,
+            "<AdditionalFields>",
+            _field_open("private_ops.id"),
+            xml_escape(node.id),
+            "</Field>",
+            _field_open("private_ops.canonical_key"),
+            xml_escape(node.canonical_key),
+            "</Field>",
+        ]
+        for name, value in node.properties.items():
+            parts.extend((_field_open(name), _field_text(value), "</Field>"))
+        if link_label is not None:
+            parts.extend(
+                (_field_open("link#maltego.link.label"), xml_escape(link_label), "</Field>")
+            )
+        parts.append("</AdditionalFields></Entity>\n")
+        self._emit("".join(parts))
+        self.entities_written += 1
+
+    def write_entities(
+        self,
+        nodes: Iterable[Node],
+        labels: Mapping[str, str] | None = None,
+    ) -> None:
+        labels = labels or {}
+        for node in nodes:
+            self.write_entity(node, link_label=labels.get(node.id))
+
+    def write_messages(self, messages: Iterable[str], message_type: str = "PartialError") -> None:
+        """Queue UI messages; Maltego expects them after the entity list."""
+        self._messages.extend((message_type, message) for message in messages)
+
+    def write_graph(self, graph: GraphPayload, errors: Iterable[str] = ()) -> None:
+        self.write_entities(graph.nodes, link_labels(graph.edges))
+        self.write_messages(errors)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._emit("</Entities>\n<UIMessages>\n")
+        for message_type, message in self._messages:
+            self._emit(
+                f'<UIMessage MessageType="{xml_escape(message_type)}">'
+                f"{xml_escape(message)}</UIMessage>\n"
+            )
+        self._emit("</UIMessages>\n</MaltegoTransformResponseMessage>\n</MaltegoMessage>\n")
+        self.flush()
+
+    def __enter__(self) -> "MaltegoXmlWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
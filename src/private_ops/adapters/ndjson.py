@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable
+from typing import Any, TextIO
+
+from private_ops.adapters.maltego import iter_maltego_entities, iter_maltego_links
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta
+
+_encode = json.JSONEncoder(sort_keys=True).encode
+
+
+class NdjsonGraphWriter:
+    """Incremental writer for the ``run-transform --ndjson`` record stream.
+
+    Records are encoded one at a time and written in bulk every
+    ``buffer_records`` records; the ``maltego`` record is streamed entity by
+    entity, so no intermediate mapping of the whole graph is built. The output
+    is byte-identical to dumping each record with ``json.dumps(sort_keys=True)``.
+    """
+
+    def __init__(
+        self,
+        handle: TextIO,
+        *,
+        buffer_records: int = 1024,
+        fsync_every: int = 0,
+    ) -> None:
+        if buffer_records < 1:
+            raise ValueError("buffer_records must be >= 1")
+        if fsync_every < 0:
+            raise ValueError("fsync_every must be >= 0")
+        self._handle = handle
+        self._buffer: list[str] = []
+        self._buffer_records = buffer_records
+        self._fsync_every = fsync_every
+        self._since_fsync = 0
+        self.records_written = 0
+
+    def _emit(self, chunk: str, *, record_end: bool = True) -> None:
+        self._buffer.append(chunk)
+        if record_end:
+            self.records_written += 1
+            self._since_fsync += 1
+        if len(self._buffer) >= self._buffer_records:
+            self._drain()
+        if record_end and self._fsync_every and self._since_fsync >= self._fsync_every:
+            self.flush(fsync=True)
+
+    def _drain(self) -> None:
+        if self._buffer:
+            self._handle.write("".join(self._buffer))
+            self._buffer.clear()
+
+    def flush(self, *, fsync: bool = False) -> None:
+        self._drain()
+        self._handle.flush()
+        if fsync:
+            os.fsync(self._handle.fileno())
+            self._since_fsync = 0
+
+    def write_record(self, record_type: str, data: Any) -> None:
+        self._emit(_encode({"type": record_type, "data": data}) + "\n")
+
+    def write_run_meta(self, run_meta: RunMeta) -> None:
+        self.write_record("run_meta", run_meta.to_dict())
+
+    def write_nodes(self, nodes: Iterable[Node]) -> None:
+        for node in nodes:
+            self.write_record("node", node.to_dict())
+
+    def write_edges(self, edges: Iterable[Edge]) -> None:
+        for edge in edges:
+            self.write_record("edge", edge.to_dict())
+
+    def write_maltego(self, nodes: Iterable[Node], edges: Iterable[Edge]) -> None:
+        self.write_maltego_json(
+            map(_encode, iter_maltego_entities(nodes)),
+            map(_encode, iter_maltego_links(edges)),
+        )
+
+    def write_maltego_json(self, entities: Iterable[str], links: Iterable[str]) -> None:
+        """Write the ``maltego`` record from already-encoded entity/link JSON."""
+        self._emit('{"data": {"entities": [', record_end=False)
+        self._write_items(entities)
+        self._emit('], "links": [', record_end=False)
+        self._write_items(links)
+        self._emit(']}, "type": "maltego"}\n')
+
+    def _write_items(self, items: Iterable[str]) -> None:
+        separator = ""
+        for item in items:
+            self._emit(separator + item, record_end=False)
+            separator = ", "
+
+    def write_errors(self, errors: list[str]) -> None:
+        self.write_record("errors", errors)
+
+    def write_graph(self, graph: GraphPayload, errors: list[str]) -> None:
+        self.write_run_meta(graph.run_meta)
+        self.write_nodes(graph.nodes)
+        self.write_edges(graph.edges)
+        self.write_maltego(graph.nodes, graph.edges)
+        self.write_errors(errors)
+
+    def close(self) -> None:
+        self.flush(fsync=self._fsync_every > 0)
+
+    def __enter__(self) -> "NdjsonGraphWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
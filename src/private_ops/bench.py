@@ -0,0 +1,438 @@
+"""
+CTW: Ephesians 4:25 — “speak every man truth with his neighbour”
+Intent: Measure hot paths reproducibly and report regressions plainly.
+Theme: Truth
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from multiprocessing import get_context
+from typing import Any, TypeVar
+from xml.etree import ElementTree
+
+from private_ops.adapters.maltego import (
+    MaltegoXmlWriter,
+    maltego_entity_type,
+    to_maltego_mapping,
+)
+from private_ops.adapters.ndjson import NdjsonGraphWriter
+from private_ops.protocol.ids import clear_id_cache, edge_id, edge_ids, node_id, node_ids
+from private_ops.protocol.models import (
+    Edge,
+    GraphPayload,
+    Node,
+    RunMeta,
+    SourceRef,
+    TransformRequest,
+)
+from private_ops.protocol.normalize import (
+    normalize_email,
+    normalize_emails,
+    normalize_phone,
+    normalize_phones,
+    normalize_text,
+    normalize_texts,
+)
+from private_ops.transforms import dispatch
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+SHAPES = ("star", "chain", "random")
+DISPATCH_REQUESTS = 1000
+SAMPLE_BATCH = 100
+
+BenchOp = Callable[[], object]
+# A case is a list of (operation, items it covers) timed one by one.
+BenchBatches = list[tuple[BenchOp, int]]
+BenchCase = Callable[[GraphPayload], BenchBatches]
+
+_T = TypeVar("_T")
+
+_ENTITY_TYPES = ("phone", "email", "person")
+
+
+def _synthetic_key(entity_type: str, index: int) -> tuple[str, str]:
+    if entity_type == "phone":
+        key = f"+1555{index:07d}"
+        return key, key
+    if entity_type == "email":
+        key = f"user{index}@example.test"
+        return key, key
+    return f"person-{index}", f"Person {index}"
+
+
+def synthetic_graph(
+    nodes: int,
+    *,
+    shape: str = "star",
+    edges_per_node: float = 1.0,
+    seed: int = 0,
+) -> GraphPayload:
+    """Deterministic graph of ``nodes`` nodes and ``nodes * edges_per_node`` edges.
+
+    ``star`` links node 0 to every other node, ``chain`` links each node to
+    the next (wrapping around), and ``random`` picks endpoints with a
+    ``random.Random(seed)``. The same arguments always give the same graph.
+    """
+    if nodes < 1:
+        raise ValueError("nodes must be >= 1")
+    if shape not in SHAPES:
+        raise ValueError(f"shape must be one of {', '.join(SHAPES)}")
+    rng = random.Random(seed)
+    source = SourceRef.shared(source_id="synthetic", title="Synthetic generator")
+
+    specs = []
+    for index in range(nodes):
+        entity_type = _ENTITY_TYPES[index % len(_ENTITY_TYPES)]
+        key, label = _synthetic_key(entity_type, index)
+        specs.append((entity_type, key, label))
+    ids = node_ids((entity_type, key) for entity_type, key, _ in specs)
+    node_list = [
+        Node(
+            id=ids[index],
+            type=entity_type,
+            canonical_key=key,
+            label=label,
+            properties={"confidence": 0.5 + (index % 50) / 100},
+            sources=[source],
+        )
+        for index, (entity_type, key, label) in enumerate(specs)
+    ]
+
+    endpoints = []
+    for index in range(round(nodes * edges_per_node)):
+        if shape == "star":
+            pair = (0, index % (nodes - 1) + 1 if nodes > 1 else 0)
+        elif shape == "chain":
+            pair = (index % nodes, (index + 1) % nodes)
+        else:
+            pair = (rng.randrange(nodes), rng.randrange(nodes))
+        endpoints.append((ids[pair[0]], ids[pair[1]], f"link-{index}"))
+    eids = edge_ids(("linked_to", from_id, to_id, key) for from_id, to_id, key in endpoints)
+    edge_list = [
+        Edge(
+            id=eids[index],
+            type="linked_to",
+            from_id=from_id,
+            to_id=to_id,
+            canonical_key=key,
+            sources=[source],
+        )
+        for index, (from_id, to_id, key) in enumerate(endpoints)
+    ]
+    return GraphPayload(
+        run_meta=RunMeta(run_id=f"synthetic-{shape}-{nodes}-{seed}", transform="synthetic"),
+        nodes=node_list,
+        edges=edge_list,
+    )
+
+
+def _sampled(items: Sequence[_T], run: Callable[[Sequence[_T]], object]) -> BenchBatches:
+    """Split an item-wise case into ``SAMPLE_BATCH``-sized batches timed separately."""
+    chunks = (items[start : start + SAMPLE_BATCH] for start in range(0, len(items), SAMPLE_BATCH))
+    return [(partial(run, chunk), len(chunk)) for chunk in chunks]
+
+
+def _whole(op: BenchOp, items: int) -> BenchBatches:
+    return [(op, items)]
+
+
+def _node_ids(pairs: Sequence[tuple[str, str]]) -> None:
+    clear_id_cache()
+    for entity_type, key in pairs:
+        node_id(entity_type, key)
+
+
+def _edge_ids(items: Sequence[tuple[str, str, str, str]]) -> None:
+    clear_id_cache()
+    for edge_type, from_id, to_id, key in items:
+        edge_id(edge_type, from_id, to_id, key)
+
+
+def _case_node_id(graph: GraphPayload) -> BenchBatches:
+    return _sampled([(node.type, node.canonical_key) for node in graph.nodes], _node_ids)
+
+
+def _case_edge_id(graph: GraphPayload) -> BenchBatches:
+    items = [(e.type, e.from_id, e.to_id, e.canonical_key) for e in graph.edges]
+    return _sampled(items, _edge_ids)
+
+
+def _normalize_case(
+    single: Callable[[str], str],
+    bulk: Callable[[Iterable[str]], list[str]] | None,
+    make: Callable[[int], str],
+) -> BenchCase:
+    def case(graph: GraphPayload) -> BenchBatches:
+        values = [make(index) for index in range(len(graph.nodes))]
+        if bulk is not None:
+            return _sampled(values, bulk)
+        return _sampled(values, lambda batch: [single(value) for value in batch])
+
+    return case
+
+
+def _phone(index: int) -> str:
+    return f"+1 (555) {index % 1000:03d}-{index % 10000:04d}"
+
+
+def _email(index: int) -> str:
+    return f"  User.{index}@Example.COM "
+
+
+def _text(index: int) -> str:
+    return f"  Some   Mixed Case\ttext {index}  "
+
+
+def _case_from_dict(graph: GraphPayload) -> BenchBatches:
+    data = graph.to_dict()
+    return _whole(lambda: GraphPayload.from_dict(data), len(graph.nodes) + len(graph.edges))
+
+
+def _case_to_dict(graph: GraphPayload) -> BenchBatches:
+    return _whole(graph.to_dict, len(graph.nodes) + len(graph.edges))
+
+
+def _case_validate(graph: GraphPayload) -> BenchBatches:
+    return _whole(graph.validate, len(graph.nodes) + len(graph.edges))
+
+
+def _case_maltego_mapping(graph: GraphPayload) -> BenchBatches:
+    return _whole(lambda: to_maltego_mapping(graph), len(graph.nodes) + len(graph.edges))
+
+
+def _case_maltego_xml(graph: GraphPayload) -> BenchBatches:
+    def run() -> None:
+        with MaltegoXmlWriter(io.BytesIO()) as writer:
+            writer.write_graph(graph)
+
+    return _whole(run, len(graph.nodes))
+
+
+def _case_maltego_xml_etree(graph: GraphPayload) -> BenchBatches:
+    # Baseline for ``maltego_xml``: the same document via the mapping and ElementTree.
+    def run() -> bytes:
+        mapping = to_maltego_mapping(graph)
+        labels = {link["to"]: link["type"] for link in reversed(mapping["links"])}
+        root = ElementTree.Element("MaltegoMessage")
+        message = ElementTree.SubElement(root, "MaltegoTransformResponseMessage")
+        entities = ElementTree.SubElement(message, "Entities")
+        for entity in mapping["entities"]:
+            element = ElementTree.SubElement(
+                entities, "Entity", Type=maltego_entity_type(entity["type"])
+            )
+            ElementTree.SubElement(element, "Value").text = entity["value"]
+            ElementTree.SubElement(element, "Weight").text = "100"
+            fields = ElementTree.SubElement(element, "AdditionalFields")
+            values = {
+                "private_ops.id": entity["id"],
+                "private_ops.canonical_key": entity["canonical_key"],
+                **{key: str(value) for key, value in entity["properties"].items()},
+            }
+            if entity["id"] in labels:
+                values["link#maltego.link.label"] = labels[entity["id"]]
+            for name, value in values.items():
+                ElementTree.SubElement(fields, "Field", Name=name, DisplayName=name).text = value
+        ElementTree.SubElement(message, "UIMessages")
+        return ElementTree.tostring(root)
+
+    return _whole(run, len(graph.nodes))
+
+
+def _case_ndjson_write(graph: GraphPayload) -> BenchBatches:
+    def run() -> None:
+        with NdjsonGraphWriter(io.StringIO()) as writer:
+            writer.write_graph(graph, [])
+
+    return _whole(run, len(graph.nodes) + len(graph.edges))
+
+
+def _case_dispatch(graph: GraphPayload) -> BenchBatches:
+    requests = [
+        TransformRequest(transform="resolve.phone_to_entities", inputs={"phone": _phone(index)})
+        for index in range(min(len(graph.nodes), DISPATCH_REQUESTS))
+    ]
+
+    # One request per sample: dispatch is slow enough to time on its own.
+    return [(partial(dispatch, request, use_cache=False), 1) for request in requests]
+
+
+CASES: dict[str, BenchCase] = {
+    "node_id": _case_node_id,
+    "edge_id": _case_edge_id,
+    "normalize_phone": _normalize_case(normalize_phone, None, _phone),
+    "normalize_phones": _normalize_case(normalize_phone, normalize_phones, _phone),
+    "normalize_email": _normalize_case(normalize_email, None, _email),
+    "normalize_emails": _normalize_case(normalize_email, normalize_emails, _email),
+    "normalize_text": _normalize_case(normalize_text, None, _text),
+    "normalize_texts": _normalize_case(normalize_text, normalize_texts, _text),
+    "from_dict": _case_from_dict,
+    "to_dict": _case_to_dict,
+    "validate": _case_validate,
+    "maltego_mapping": _case_maltego_mapping,
+    "maltego_xml": _case_maltego_xml,
+    "maltego_xml_etree": _case_maltego_xml_etree,
+    "ndjson_write": _case_ndjson_write,
+    "dispatch": _case_dispatch,
+}
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    ops: int
+    rounds: int
+    ops_per_sec: float
+    min_us: float
+    p50_us: float
+    p99_us: float
+    max_us: float
+    peak_rss_mb: float | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted, non-empty list.
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_case(name: str, graph: GraphPayload, *, rounds: int = 5) -> BenchResult:
+    """Time ``rounds`` runs of one case after a warm-up run.
+
+    Item-wise cases are timed in batches of ``SAMPLE_BATCH`` items (``dispatch``
+    one request at a time), and each batch's mean per item is one latency
+    sample; min/p50/p99/max are over all samples of all rounds. Whole-graph
+    cases (``to_dict``, ``validate``, ...) give one sample per round.
+    ``ops_per_sec`` uses the median round.
+    """
+    if rounds < 1:
+        raise ValueError("rounds must be >= 1")
+    batches = CASES[name](graph)
+    ops = sum(items for _, items in batches)
+    for op, _ in batches:
+        op()
+    samples: list[float] = []
+    totals: list[float] = []
+    clock = time.perf_counter
+    for _ in range(rounds):
+        total = 0.0
+        for op, items in batches:
+            started = clock()
+            op()
+            elapsed = clock() - started
+            total += elapsed
+            samples.append(elapsed / max(items, 1))
+        totals.append(total)
+    samples.sort()
+    median = statistics.median(totals) / max(ops, 1) if samples else 0.0
+    return BenchResult(
+        name=name,
+        ops=ops,
+        rounds=rounds,
+        ops_per_sec=round(1 / median, 1) if median else 0.0,
+        min_us=round(samples[0] * 1e6, 3) if samples else 0.0,
+        p50_us=round(_percentile(samples, 0.50) * 1e6, 3) if samples else 0.0,
+        p99_us=round(_percentile(samples, 0.99) * 1e6, 3) if samples else 0.0,
+        max_us=round(samples[-1] * 1e6, 3) if samples else 0.0,
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def _run_isolated(name: str, graph_args: dict[str, Any], rounds: int) -> BenchResult:
+    return run_case(name, synthetic_graph(**graph_args), rounds=rounds)
+
+
+def run_suite(
+    cases: Iterable[str] | None = None,
+    *,
+    nodes: int = 10_000,
+    shape: str = "star",
+    edges_per_node: float = 1.0,
+    seed: int = 0,
+    rounds: int = 5,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """Run cases and return the JSON-ready result document.
+
+    With ``isolate`` every case runs in a fresh spawned process, so
+    ``peak_rss_mb`` is that case's own peak (graph generation included);
+    otherwise the graph is built once and the peak is cumulative.
+    """
+    names = list(cases) if cases is not None else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"unknown bench cases: {', '.join(unknown)}")
+    graph_args = {"nodes": nodes, "shape": shape, "edges_per_node": edges_per_node, "seed": seed}
+
+    results: list[BenchResult] = []
+    if isolate:
+        for name in names:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                results.append(pool.submit(_run_isolated, name, graph_args, rounds).result())
+    else:
+        graph = synthetic_graph(**graph_args)
+        results.extend(run_case(name, graph, rounds=rounds) for name in names)
+
+    return {
+        "meta": {
+            **graph_args,
+            "rounds": rounds,
+            "isolated": isolate,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": {result.name: result.to_dict() for result in results},
+    }
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float = 0.10,
+) -> list[dict[str, Any]]:
+    """Compare ``ops_per_sec`` per case against a stored baseline document.
+
+    A case is ``regressed`` when throughput fell by more than ``threshold``
+    (a fraction) and ``improved`` when it rose by more than that.
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base or not base.get("ops_per_sec"):
+            rows.append({"name": name, "status": "new", "change": None})
+            continue
+        change = result["ops_per_sec"] / base["ops_per_sec"] - 1
+        if change < -threshold:
+            status = "regressed"
+        elif change > threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "status": status, "change": round(change, 4)})
+    return rows
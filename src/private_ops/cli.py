@@ -8,13 +8,13 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
-from private_ops.config import OpsConfig
-from private_ops.adapters.maltego import to_maltego_mapping
-from private_ops.protocol.models import GraphPayload, TransformRequest
-from private_ops.transforms import dispatch
+from private_ops.telemetry import disable_telemetry, enable_telemetry, span
 
 
 def _load_json(path: str) -> dict[str, Any]:
@@ -22,6 +22,8 @@ def _load_json(path: str) -> dict[str, Any]:
 
 
 def _cmd_validate_config() -> int:
+    from private_ops.config import OpsConfig
+
     cfg = OpsConfig.from_env()
     errors = cfg.validate()
     if errors:
@@ -49,53 +51,466 @@ def _cmd_plan() -> int:
     return 0
 
 
-def _cmd_run_transform(request_path: str, out_path: str, ndjson_path: str | None) -> int:
+def _cmd_run_transform(
+    request_path: str,
+    out_path: str,
+    ndjson_path: str | None,
+    fsync_every: int = 0,
+    store_path: str | None = None,
+    cache_dir: str | None = None,
+    use_cache: bool = True,
+    refresh_cache: bool = False,
+    maltego_xml_path: str | None = None,
+) -> int:
+    from private_ops.adapters.maltego import MaltegoXmlWriter, to_maltego_mapping
+    from private_ops.adapters.ndjson import NdjsonGraphWriter
+    from private_ops.protocol.graph_io import WRITE_BUFFER_BYTES
+    from private_ops.protocol.models import TransformRequest
+    from private_ops.store import GraphStore
+    from private_ops.transforms import TransformCache, dispatch
+
     request = TransformRequest.from_dict(_load_json(request_path))
-    response = dispatch(request)
+    cache = TransformCache(cache_dir) if cache_dir and use_cache else None
+    response = dispatch(request, cache=cache, use_cache=use_cache, refresh=refresh_cache)
 
     response_payload = response.to_dict()
     response_payload["maltego"] = to_maltego_mapping(response.graph)
 
-    Path(out_path).write_text(
-        json.dumps(response_payload, indent=2, sort_keys=True),
-        encoding="utf-8",
-    )
+    with span("write", path=out_path, format="json"):
+        with Path(out_path).open("w", encoding="utf-8") as handle:
+            json.dump(response_payload, handle, indent=2, sort_keys=True)
+    del response_payload
 
     if ndjson_path:
-        lines: list[dict[str, Any]] = [
-            {"type": "run_meta", "data": response.graph.run_meta.to_dict()},
-        ]
-        lines.extend({"type": "node", "data": node.to_dict()} for node in response.graph.nodes)
-        lines.extend({"type": "edge", "data": edge.to_dict()} for edge in response.graph.edges)
-        lines.append({"type": "maltego", "data": to_maltego_mapping(response.graph)})
-        lines.append({"type": "errors", "data": response.errors})
-        with Path(ndjson_path).open("w", encoding="utf-8") as handle:
-            for line in lines:
-                handle.write(json.dumps(line, sort_keys=True) + "\n")
+        with span("write", path=ndjson_path, format="ndjson"):
+            with Path(ndjson_path).open(
+                "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES
+            ) as handle:
+                with NdjsonGraphWriter(handle, fsync_every=fsync_every) as writer:
+                    writer.write_graph(response.graph, response.errors)
+
+    if maltego_xml_path:
+        with span("write", path=maltego_xml_path, format="maltego_xml"):
+            with Path(maltego_xml_path).open("wb", buffering=0) as handle:
+                with MaltegoXmlWriter(handle, buffer_bytes=WRITE_BUFFER_BYTES) as xml_writer:
+                    xml_writer.write_graph(response.graph, response.errors)
+
+    if store_path:
+        with GraphStore(store_path) as store:
+            store.put_graph(response.graph)
 
     return 0 if response.ok else 1
 
 
-def _cmd_validate_graph(graph_path: str) -> int:
-    raw = _load_json(graph_path)
-    graph_data = raw.get("graph", raw)
-    graph = GraphPayload.from_dict(graph_data)
-    errors = graph.validate()
-    if errors:
-        print("Graph is invalid:")
-        for err in errors:
+def _cmd_run_batch(
+    requests_path: str,
+    out_path: str,
+    workers: int,
+    executor: str,
+    ordered: bool,
+    max_in_flight: int | None,
+    chunk_size: int,
+) -> int:
+    from private_ops.transforms.batch import BatchSummary, dispatch_batch
+
+    summary = BatchSummary()
+    source = sys.stdin if requests_path == "-" else Path(requests_path).open("r", encoding="utf-8")
+    try:
+        with Path(out_path).open("w", encoding="utf-8") as handle:
+            for result in dispatch_batch(
+                source,
+                workers=workers,
+                executor=executor,
+                ordered=ordered,
+                max_in_flight=max_in_flight,
+                chunk_size=chunk_size,
+            ):
+                summary.record(result)
+                handle.write(json.dumps(result.to_dict(), sort_keys=True) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    print(f"Processed {summary.total} requests: {summary.ok} ok, {summary.errors} error.")
+    return 0 if summary.errors == 0 else 1
+
+
+def _cmd_merge(
+    input_paths: list[str],
+    out_path: str,
+    run_id: str,
+    partitions: int,
+    spill_dir: str | None,
+    shards: int = 0,
+    workers: int = 1,
+) -> int:
+    from private_ops.adapters.ndjson import NdjsonGraphWriter
+    from private_ops.protocol.graph_io import (
+        WRITE_BUFFER_BYTES,
+        is_ndjson,
+        iter_numbered_records,
+        write_json_stream,
+    )
+    from private_ops.protocol.merge import SpillingMerger
+    from private_ops.protocol.models import RunMeta
+    from private_ops.protocol.validation import StreamingGraphValidator
+
+    run_meta = RunMeta(run_id=run_id, transform="merge")
+    if shards:
+        return _cmd_merge_sharded(input_paths, out_path, run_meta, shards, workers, spill_dir)
+    with SpillingMerger(spill_dir, partitions=partitions) as merger:
+        for path in input_paths:
+            merger.add_file(path)
+
+        validator = StreamingGraphValidator()
+        # Feed run_meta too, so ordinals line up with a replay of the output file.
+        validator.add(1, "run_meta", run_meta.to_dict())
+
+        def _checked(kind: str, items: Iterable[Any]) -> Iterator[Any]:
+            # Every record after the run_meta line is counted by the report.
+            for item in items:
+                report = validator.report
+                validator.add(report.nodes + report.edges + 2, kind, item.to_dict())
+                yield item
+
+        # Both formats stream from the spill partitions; nothing holds the merged graph.
+        ndjson = is_ndjson(out_path)
+        with span("write", path=out_path, format="ndjson" if ndjson else "json"), Path(
+            out_path
+        ).open("w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as handle:
+            nodes = _checked("node", merger.iter_nodes())
+            edges = _checked("edge", merger.iter_edges())
+            if ndjson:
+                with NdjsonGraphWriter(handle) as writer:
+                    writer.write_run_meta(run_meta)
+                    writer.write_nodes(nodes)
+                    writer.write_edges(edges)
+            else:
+                write_json_stream(handle, run_meta, nodes, edges)
+        report = validator.finish(iter_numbered_records(out_path, on_error=lambda *_: None))
+        print(
+            f"Merged {merger.records_in} records from {len(input_paths)} inputs "
+            f"into {report.nodes} nodes and {report.edges} edges."
+        )
+        for err in report.errors:
             print(f"- {err}")
+        if report.omitted:
+            print(f"... and {report.omitted} more errors")
+        return 0 if report.ok else 1
+
+
+def _cmd_merge_sharded(
+    input_paths: list[str],
+    out_path: str,
+    run_meta: Any,
+    shards: int,
+    workers: int,
+    shard_dir: str | None,
+) -> int:
+    from private_ops.protocol.shard import ShardedGraph
+
+    with ShardedGraph.from_files(input_paths, shard_dir, shards=shards) as graph:
+        report = graph.validate(workers=workers, allow_duplicates=True)
+        nodes, edges = graph.export(out_path, run_meta, workers=workers)
+    print(
+        f"Merged {report.nodes + report.edges} records from {len(input_paths)} inputs "
+        f"into {nodes} nodes and {edges} edges over {shards} shards."
+    )
+    for err in report.errors:
+        print(f"- {err}")
+    return 0 if report.ok else 1
+
+
+def _cmd_expand(seeds_path: str, policy_path: str, out_path: str, workers: int) -> int:
+    from private_ops.adapters.ndjson import NdjsonGraphWriter
+    from private_ops.protocol.graph_io import WRITE_BUFFER_BYTES, is_ndjson, read_graph
+    from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta
+    from private_ops.transforms.expand import ExpansionEngine, ExpansionPolicy
+
+    seeds = read_graph(seeds_path).nodes
+    engine = ExpansionEngine(ExpansionPolicy.from_dict(_load_json(policy_path)), workers=workers)
+    run_meta = RunMeta(run_id=f"expand:{Path(seeds_path).name}", transform="expand")
+
+    graph = GraphPayload(run_meta=run_meta)
+    errors: list[str] = []
+    with Path(out_path).open("w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as handle:
+        writer = NdjsonGraphWriter(handle) if is_ndjson(out_path) else None
+        if writer is not None:
+            writer.write_run_meta(run_meta)
+        # Each hop re-emits entities a later transform merged into, so readers merge by id
+        # (``GraphIndex(read_graph(path))``); unchanged entities are written once.
+        written: dict[str, Node | Edge] = {}
+        for hop in engine.iter_hops(seeds, run_meta):
+            graph = hop.graph
+            errors.extend(hop.errors)
+            if writer is not None:
+                nodes = [n for n in graph.nodes if written.get(n.id) != n]
+                edges = [e for e in graph.edges if written.get(e.id) != e]
+                writer.write_nodes(nodes)
+                writer.write_edges(edges)
+                written.update((item.id, item) for item in (*nodes, *edges))
+                writer.write_record("hop", hop.to_dict())
+                writer.flush()
+            print(f"Hop {hop.depth}: expanded {hop.expanded}, graph has {len(graph.nodes)} nodes.")
+        if writer is not None:
+            writer.close()
+        else:
+            with span("write", path=out_path, format="json"):
+                json.dump(graph.to_dict(), handle, indent=2, sort_keys=True)
+
+    for err in errors:
+        print(f"- {err}")
+    return 0 if not errors else 1
+
+
+def _print_errors(errors: list[str], omitted: int = 0) -> None:
+    print("Graph is invalid:")
+    for err in errors:
+        print(f"- {err}")
+    if omitted:
+        print(f"... and {omitted} more errors")
+
+
+def _cmd_validate_graph(
+    graph_path: str | None,
+    store_path: str | None = None,
+    run_id: str | None = None,
+    max_errors: int = 100,
+    shards: int = 0,
+    workers: int = 1,
+) -> int:
+    from private_ops.protocol.binary import BinaryGraphReader, is_binary
+    from private_ops.protocol.shard import ShardedGraph
+    from private_ops.protocol.validation import validate_graph_file
+    from private_ops.store import GraphStore
+
+    if graph_path and shards:
+        with ShardedGraph.from_files([graph_path], shards=shards) as sharded:
+            report = sharded.validate(workers=workers, max_errors=max_errors)
+        if not report.ok:
+            _print_errors(report.errors, report.omitted)
+            return 1
+        print(f"Graph is valid ({report.nodes} nodes, {report.edges} edges).")
+        return 0
+    if store_path:
+        if not run_id:
+            print("--run-id is required with --store")
+            return 1
+        with GraphStore(store_path) as store:
+            graph = store.load_run(run_id)
+        if graph is None:
+            print(f"Run '{run_id}' not found in {store_path}")
+            return 1
+        errors = graph.validate()
+    elif graph_path and is_binary(graph_path):
+        with BinaryGraphReader(graph_path) as reader:
+            errors = reader.validate()
+    elif graph_path:
+        report = validate_graph_file(graph_path, max_errors=max_errors)
+        if not report.ok:
+            _print_errors(report.errors, report.omitted)
+            return 1
+        print(f"Graph is valid ({report.nodes} nodes, {report.edges} edges).")
+        return 0
+    else:
+        print("Provide a graph JSON path or --store with --run-id")
+        return 1
+
+    if errors:
+        _print_errors(errors[:max_errors], max(0, len(errors) - max_errors))
         return 1
 
     print("Graph is valid.")
     return 0
 
 
+def _cmd_stats(
+    input_paths: list[str], shards: int, workers: int, top: int, out_path: str | None
+) -> int:
+    from private_ops.protocol.shard import ShardedGraph
+
+    with ShardedGraph.from_files(input_paths, shards=shards) as graph:
+        stats = graph.stats(workers=workers, top=top)
+    if out_path:
+        Path(out_path).write_text(json.dumps(stats, indent=2, sort_keys=True), encoding="utf-8")
+
+    print(
+        f"{stats['nodes']} nodes, {stats['edges']} edges "
+        f"({stats['cross_shard_edges']} across {stats['shards']} shards)"
+    )
+    for label, counts in (("nodes", stats["nodes_by_type"]), ("edges", stats["edges_by_type"])):
+        print(f"{label} by type: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    for row in stats["top_degree"]:
+        print(f"{row['degree']:>8} {row['type']:<12} {row['label']} ({row['id']})")
+    return 0
+
+
+def _cmd_convert(input_path: str, out_path: str) -> int:
+    from private_ops.protocol.binary import BinaryGraphReader, is_binary, write_binary_graph
+    from private_ops.protocol.graph_io import read_columnar, read_graph, write_graph
+
+    if is_binary(out_path):
+        columnar = read_columnar(input_path)
+        write_binary_graph(columnar, out_path)
+        nodes, edges = len(columnar.node_ids), len(columnar.edge_ids)
+    elif is_binary(input_path):
+        with BinaryGraphReader(input_path) as reader:
+            write_graph(reader.as_payload(), out_path)
+            nodes, edges = reader.node_count, reader.edge_count
+    else:
+        graph = read_graph(input_path)
+        write_graph(graph, out_path)
+        nodes, edges = len(graph.nodes), len(graph.edges)
+    print(f"Converted {nodes} nodes and {edges} edges to {out_path}.")
+    return 0
+
+
+def _load_graph(path_or_run: str, store_path: str | None) -> Any:
+    """A graph file, or the run named ``path_or_run`` in ``store_path`` when one is given."""
+    from private_ops.protocol.graph_io import read_graph
+    from private_ops.store import GraphStore
+
+    if not store_path:
+        return read_graph(path_or_run)
+    with GraphStore(store_path) as store:
+        graph = store.load_run(path_or_run)
+    if graph is None:
+        raise ValueError(f"Run '{path_or_run}' not found in {store_path}")
+    return graph
+
+
+def _graph_records(path_or_run: str, store_path: str | None) -> Any:
+    from private_ops.protocol.diff import iter_payload_records
+    from private_ops.protocol.graph_io import iter_graph_records
+
+    if not store_path:
+        return iter_graph_records(path_or_run)
+    return iter_payload_records(_load_graph(path_or_run, store_path))
+
+
+def _cmd_diff(base: str, target: str, out_path: str, store_path: str | None) -> int:
+    from private_ops.protocol.diff import DeltaSummary, iter_delta, write_delta
+
+    summary = DeltaSummary()
+    try:
+        records = iter_delta(
+            _graph_records(base, store_path), _graph_records(target, store_path), summary
+        )
+        with span("write", path=out_path, format="delta"):
+            write_delta(records, out_path)
+    except ValueError as exc:
+        print(exc)
+        return 1
+    print(
+        f"Delta: {summary.added} added, {summary.removed} removed, {summary.changed} changed "
+        f"({summary.unchanged} unchanged)."
+    )
+    return 0
+
+
+def _cmd_apply(base: str, delta_path: str, out_path: str, store_path: str | None) -> int:
+    from private_ops.protocol.diff import apply_delta, read_delta
+    from private_ops.protocol.graph_io import write_graph
+
+    try:
+        graph = apply_delta(_load_graph(base, store_path), read_delta(delta_path))
+    except ValueError as exc:
+        print(exc)
+        return 1
+    write_graph(graph, out_path)
+    print(f"Patched graph has {len(graph.nodes)} nodes and {len(graph.edges)} edges.")
+    errors = graph.validate()
+    for err in errors:
+        print(f"- {err}")
+    return 0 if not errors else 1
+
+
+def _cmd_bench(
+    cases: list[str] | None,
+    nodes: int,
+    shape: str,
+    edges_per_node: float,
+    seed: int,
+    rounds: int,
+    isolate: bool,
+    out_path: str | None,
+    baseline_path: str | None,
+    threshold: float,
+) -> int:
+    from private_ops.bench import compare_results, run_suite
+
+    document = run_suite(
+        cases,
+        nodes=nodes,
+        shape=shape,
+        edges_per_node=edges_per_node,
+        seed=seed,
+        rounds=rounds,
+        isolate=isolate,
+    )
+    if out_path:
+        Path(out_path).write_text(json.dumps(document, indent=2, sort_keys=True), encoding="utf-8")
+
+    status: dict[str, str] = {}
+    if baseline_path:
+        for row in compare_results(document, _load_json(baseline_path), threshold=threshold):
+            change = "" if row["change"] is None else f" {row['change']:+.1%}"
+            status[row["name"]] = f"{row['status']}{change}"
+
+    print(
+        f"{'case':<18} {'ops/sec':>14} {'min us':>10} {'p50 us':>10} {'p99 us':>10} "
+        f"{'max us':>10} {'rss MB':>8}"
+    )
+    for name, result in document["results"].items():
+        rss = result["peak_rss_mb"]
+        print(
+            f"{name:<18} {result['ops_per_sec']:>14,.1f} {result['min_us']:>10.3f} "
+            f"{result['p50_us']:>10.3f} {result['p99_us']:>10.3f} {result['max_us']:>10.3f} "
+            f"{rss if rss is not None else '-':>8} "
+            f"{status.get(name, '')}".rstrip()
+        )
+    regressed = sorted(name for name, text in status.items() if text.startswith("regressed"))
+    if regressed:
+        print(f"Regressions against {baseline_path}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+def _cmd_serve(
+    host: str,
+    port: int,
+    workers: int,
+    max_queue: int,
+    request_timeout: float,
+) -> int:
+    from private_ops.server import TransformServer
+
+    server = TransformServer(
+        host,
+        port,
+        workers=workers,
+        max_queue=max_queue,
+        request_timeout=request_timeout,
+    )
+    enable_telemetry()
+    bound_host, bound_port = server.address
+    print(f"Serving transforms on http://{bound_host}:{bound_port} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="private_ops",
         description="Maltego GPT Private Ops bootstrap CLI",
     )
+    parser.add_argument("--trace", help="Write NDJSON span records for this run here")
+    parser.add_argument("--metrics", help="Write Prometheus-style metrics for this run here")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     subparsers.add_parser("validate-config", help="Validate runtime config")
@@ -107,11 +522,155 @@ def build_parser() -> argparse.ArgumentParser:
     run_transform.add_argument("request_json", help="Path to TransformRequest JSON")
     run_transform.add_argument("--out", required=True, help="Path to output JSON")
     run_transform.add_argument("--ndjson", help="Optional streaming NDJSON output path")
+    run_transform.add_argument(
+        "--maltego-xml", help="Optional MaltegoTransformResponseMessage XML output path",
+    )
+    run_transform.add_argument(
+        "--fsync-every",
+        type=int,
+        default=0,
+        help="fsync the NDJSON output every N records (0 disables)",
+    )
+    run_transform.add_argument("--store", help="Also upsert the graph into this SQLite store")
+    run_transform.add_argument(
+        "--cache-dir",
+        default=os.getenv("PRIVATE_OPS_CACHE_DIR"),
+        help="On-disk transform result cache (default: $PRIVATE_OPS_CACHE_DIR)",
+    )
+    run_transform.add_argument(
+        "--no-cache", action="store_true", help="Bypass the transform result cache",
+    )
+    run_transform.add_argument(
+        "--refresh-cache", action="store_true", help="Re-run the transform and overwrite the cache",
+    )
+
+    run_batch = subparsers.add_parser(
+        "run-batch", help="Execute NDJSON transform requests over a worker pool",
+    )
+    run_batch.add_argument("requests_ndjson", help="Path to NDJSON TransformRequests ('-' for stdin)")
+    run_batch.add_argument("--out", required=True, help="Path to output NDJSON responses")
+    run_batch.add_argument("--workers", type=int, default=4, help="Worker pool size")
+    run_batch.add_argument(
+        "--executor", default="thread", help="Worker pool kind: thread or process",
+    )
+    run_batch.add_argument(
+        "--unordered", action="store_true", help="Write responses as they finish",
+    )
+    run_batch.add_argument(
+        "--max-in-flight", type=int, help="Maximum queued chunks (default: 2x workers)",
+    )
+    run_batch.add_argument(
+        "--chunk-size", type=int, default=1, help="Requests handed to a worker at once",
+    )
+
+    merge = subparsers.add_parser(
+        "merge", help="Merge graph/response files by stable id",
+    )
+    merge.add_argument("inputs", nargs="+", help="Graph or response JSON/NDJSON files")
+    merge.add_argument("--out", required=True, help="Output path (.json or .ndjson)")
+    merge.add_argument("--run-id", default="merge", help="run_id for the merged graph")
+    merge.add_argument(
+        "--partitions", type=int, default=64, help="Spill partitions (bounds peak memory)",
+    )
+    merge.add_argument("--spill-dir", help="Directory for spill files (default: temp dir)")
+    merge.add_argument(
+        "--shards", type=int, default=0, help="Merge N id-hashed shards in a process pool",
+    )
+    merge.add_argument("--workers", type=int, default=1, help="Processes for --shards")
+
+    expand = subparsers.add_parser(
+        "expand", help="Chain transforms over output entities (multi-hop BFS)",
+    )
+    expand.add_argument("seeds", help="Graph JSON/NDJSON whose nodes seed the expansion")
+    expand.add_argument(
+        "--policy",
+        required=True,
+        help="Policy JSON: {transforms: {type: [names]}, max_depth, max_fanout, max_nodes}",
+    )
+    expand.add_argument(
+        "--out",
+        required=True,
+        help="Output path (.ndjson streams each hop's new and updated entities; merge by id)",
+    )
+    expand.add_argument("--workers", type=int, default=8, help="Parallel transform calls per hop")
+
+    convert = subparsers.add_parser(
+        "convert", help="Convert graphs between JSON, NDJSON and binary (.pogb)",
+    )
+    convert.add_argument("input", help="Graph JSON/NDJSON/.pogb file")
+    convert.add_argument("--out", required=True, help="Output path; format follows the suffix")
+
+    bench = subparsers.add_parser(
+        "bench", help="Benchmark hot paths on a synthetic graph",
+    )
+    bench.add_argument("--cases", nargs="+", help="Cases to run (default: all)")
+    bench.add_argument("--nodes", type=int, default=10_000, help="Synthetic graph node count")
+    bench.add_argument(
+        "--shape", default="star", help="Synthetic graph shape: star, chain or random",
+    )
+    bench.add_argument("--edges-per-node", type=float, default=1.0, help="Edges per node")
+    bench.add_argument("--seed", type=int, default=0, help="Generator seed")
+    bench.add_argument("--rounds", type=int, default=5, help="Timed rounds per case")
+    bench.add_argument(
+        "--no-isolate", action="store_true", help="Run every case in this process",
+    )
+    bench.add_argument("--out", help="Write results JSON here")
+    bench.add_argument("--baseline", help="Results JSON to compare against")
+    bench.add_argument(
+        "--threshold", type=float, default=0.10, help="Throughput drop that counts as a regression",
+    )
+
+    serve = subparsers.add_parser(
+        "serve", help="Serve transforms over HTTP for a local Maltego client",
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="Bind address")
+    serve.add_argument("--port", type=int, default=8787, help="Bind port")
+    serve.add_argument("--workers", type=int, default=8, help="Transform worker threads")
+    serve.add_argument(
+        "--max-queue", type=int, default=64, help="Requests queued beyond busy workers before 503",
+    )
+    serve.add_argument(
+        "--request-timeout", type=float, default=30.0, help="Seconds to wait for a transform",
+    )
+
+    diff = subparsers.add_parser(
+        "diff", help="Write the delta between two graphs as NDJSON",
+    )
+    diff.add_argument("base", help="Base graph JSON/NDJSON/.pogb (a run id with --store)")
+    diff.add_argument("target", help="Target graph JSON/NDJSON/.pogb (a run id with --store)")
+    diff.add_argument("--out", required=True, help="Path to output delta NDJSON")
+    diff.add_argument("--store", help="Read both runs from this SQLite store")
+
+    apply = subparsers.add_parser(
+        "apply", help="Patch a base graph with a delta from 'diff'",
+    )
+    apply.add_argument("base", help="Base graph JSON/NDJSON/.pogb (a run id with --store)")
+    apply.add_argument("delta", help="Delta NDJSON written by 'diff'")
+    apply.add_argument("--out", required=True, help="Output path; format follows the suffix")
+    apply.add_argument("--store", help="Read the base run from this SQLite store")
 
     validate_graph = subparsers.add_parser(
-        "validate-graph", help="Validate canonical graph JSON",
+        "validate-graph", help="Validate canonical graph JSON/NDJSON (streamed) or .pogb",
+    )
+    validate_graph.add_argument("graph_json", nargs="?", help="Path to graph JSON/NDJSON/.pogb")
+    validate_graph.add_argument("--store", help="Read the graph from this SQLite store")
+    validate_graph.add_argument("--run-id", help="Run to load from --store")
+    validate_graph.add_argument(
+        "--max-errors", type=int, default=100, help="Stop listing errors after this many",
+    )
+    validate_graph.add_argument(
+        "--shards", type=int, default=0, help="Validate N id-hashed shards in a process pool",
+    )
+    validate_graph.add_argument("--workers", type=int, default=1, help="Processes for --shards")
+
+    stats = subparsers.add_parser(
+        "stats", help="Count entities and rank nodes by degree, one shard per process",
     )
-    validate_graph.add_argument("graph_json", help="Path to graph JSON")
+    stats.add_argument("inputs", nargs="+", help="Graph JSON/NDJSON/.pogb files")
+    stats.add_argument("--shards", type=int, default=16, help="Id-hashed shard count")
+    stats.add_argument("--workers", type=int, default=4, help="Worker processes")
+    stats.add_argument("--top", type=int, default=10, help="Highest-degree nodes to list")
+    stats.add_argument("--out", help="Write the stats JSON here")
 
     return parser
 
@@ -119,15 +678,115 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
+    if not (args.trace or args.metrics):
+        return _run_command(parser, args)
+
+    telemetry = enable_telemetry(reset=True)
+    trace = Path(args.trace).open("w", encoding="utf-8") if args.trace else None
+    telemetry.stream_spans(trace)
+    try:
+        with span("command", command=args.command):
+            return _run_command(parser, args)
+    finally:
+        disable_telemetry()
+        if trace is not None:
+            trace.close()
+        if args.metrics:
+            Path(args.metrics).write_text(telemetry.prometheus_text(), encoding="utf-8")
+
+
+def _check_choices(
+    parser: argparse.ArgumentParser,
+    flag: str,
+    values: list[str] | None,
+    choices: tuple[str, ...],
+) -> None:
+    # Choices live in modules the CLI only imports once a command needs them.
+    for value in values or ():
+        if value not in choices:
+            parser.error(
+                f"argument {flag}: invalid choice: {value!r} (choose from {', '.join(choices)})"
+            )
 
+
+def _run_command(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
     if args.command == "validate-config":
         return _cmd_validate_config()
     if args.command == "plan":
         return _cmd_plan()
     if args.command == "run-transform":
-        return _cmd_run_transform(args.request_json, args.out, args.ndjson)
+        return _cmd_run_transform(
+            args.request_json,
+            args.out,
+            args.ndjson,
+            args.fsync_every,
+            args.store,
+            args.cache_dir,
+            not args.no_cache,
+            args.refresh_cache,
+            args.maltego_xml,
+        )
+    if args.command == "run-batch":
+        from private_ops.transforms.batch import EXECUTOR_KINDS
+
+        _check_choices(parser, "--executor", [args.executor], EXECUTOR_KINDS)
+        return _cmd_run_batch(
+            args.requests_ndjson,
+            args.out,
+            args.workers,
+            args.executor,
+            not args.unordered,
+            args.max_in_flight,
+            args.chunk_size,
+        )
+    if args.command == "merge":
+        return _cmd_merge(
+            args.inputs,
+            args.out,
+            args.run_id,
+            args.partitions,
+            args.spill_dir,
+            args.shards,
+            args.workers,
+        )
+    if args.command == "expand":
+        return _cmd_expand(args.seeds, args.policy, args.out, args.workers)
+    if args.command == "convert":
+        return _cmd_convert(args.input, args.out)
+    if args.command == "bench":
+        from private_ops.bench import CASES, SHAPES
+
+        _check_choices(parser, "--cases", args.cases, tuple(sorted(CASES)))
+        _check_choices(parser, "--shape", [args.shape], SHAPES)
+        return _cmd_bench(
+            args.cases,
+            args.nodes,
+            args.shape,
+            args.edges_per_node,
+            args.seed,
+            args.rounds,
+            not args.no_isolate,
+            args.out,
+            args.baseline,
+            args.threshold,
+        )
+    if args.command == "serve":
+        return _cmd_serve(args.host, args.port, args.workers, args.max_queue, args.request_timeout)
+    if args.command == "diff":
+        return _cmd_diff(args.base, args.target, args.out, args.store)
+    if args.command == "apply":
+        return _cmd_apply(args.base, args.delta, args.out, args.store)
     if args.command == "validate-graph":
-        return _cmd_validate_graph(args.graph_json)
+        return _cmd_validate_graph(
+            args.graph_json,
+            args.store,
+            args.run_id,
+            args.max_errors,
+            args.shards,
+            args.workers,
+        )
+    if args.command == "stats":
+        return _cmd_stats(args.inputs, args.shards, args.workers, args.top, args.out)
 
     parser.print_help()
     return 1
@@ -6,28 +6,47 @@ Theme: Truth
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 
 
+def _int_env(name: str, default: int, problems: list[str]) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        problems.append(f"{name} must be an integer, got '{raw}'")
+        return default
+
+
 @dataclass(frozen=True)
 class OpsConfig:
     env: str = "dev"
     provider: str = "ollama"
     model: str = "llama3.1"
     log_level: str = "INFO"
+    llm_url: str = ""
+    llm_concurrency: int = 4
+    # Environment values from_env could not parse; validate() reports them.
+    parse_errors: tuple[str, ...] = field(default=(), compare=False)
 
     @classmethod
     def from_env(cls) -> "OpsConfig":
+        problems: list[str] = []
         return cls(
             env=os.getenv("PRIVATE_OPS_ENV", "dev"),
             provider=os.getenv("PRIVATE_OPS_PROVIDER", "ollama"),
             model=os.getenv("PRIVATE_OPS_MODEL", "llama3.1"),
             log_level=os.getenv("PRIVATE_OPS_LOG_LEVEL", "INFO"),
+            llm_url=os.getenv("PRIVATE_OPS_LLM_URL", ""),
+            llm_concurrency=_int_env("PRIVATE_OPS_LLM_CONCURRENCY", 4, problems),
+            parse_errors=tuple(problems),
         )
 
     def validate(self) -> list[str]:
-        errors: list[str] = []
+        errors: list[str] = list(self.parse_errors)
 
         if self.env not in {"dev", "staging", "prod"}:
             errors.append(
@@ -42,6 +61,12 @@ class OpsConfig:
         if not self.model.strip():
             errors.append("model must not be empty")
 
+        if self.llm_url and not self.llm_url.startswith(("http://", "https://")):
+            errors.append(f"llm_url must be an http(s) URL, got '{self.llm_url}'")
+
+        if self.llm_concurrency < 1:
+            errors.append("llm_concurrency must be >= 1")
+
         if self.log_level.upper() not in {
             "DEBUG",
             "INFO",
@@ -0,0 +1,29 @@
+from private_ops.llm.client import CompletionCache, LLMClient
+from private_ops.llm.context import ContextPacker, PackedContext, estimate_tokens
+from private_ops.llm.models import Completion, CompletionRequest, LLMError, completion_key
+from private_ops.llm.pool import ConnectionPool
+from private_ops.llm.providers import (
+    AzureOpenAIProvider,
+    OllamaProvider,
+    OpenAIProvider,
+    Provider,
+    provider_from_config,
+)
+
+__all__ = [
+    "CompletionRequest",
+    "Completion",
+    "LLMError",
+    "completion_key",
+    "ConnectionPool",
+    "Provider",
+    "OllamaProvider",
+    "OpenAIProvider",
+    "AzureOpenAIProvider",
+    "provider_from_config",
+    "CompletionCache",
+    "LLMClient",
+    "ContextPacker",
+    "PackedContext",
+    "estimate_tokens",
+]
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from private_ops.llm.models import Completion, CompletionRequest, completion_key
+from private_ops.llm.providers import Provider
+from private_ops.telemetry import count
+
+
+@dataclass
+class CompletionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    coalesced: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "coalesced": self.coalesced,
+        }
+
+
+class CompletionCache:
+    """In-process LRU of completions, optionally backed by JSON files in ``directory``."""
+
+    def __init__(self, directory: str | Path | None = None, *, max_entries: int = 1024) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        self._memory: OrderedDict[str, Completion] = OrderedDict()
+        self._max_entries = max_entries
+        self._dir = Path(directory) if directory is not None else None
+        self._lock = threading.Lock()
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        assert self._dir is not None
+        return self._dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Completion | None:
+        with self._lock:
+            completion = self._memory.get(key)
+            if completion is not None:
+                self._memory.move_to_end(key)
+                return completion
+        if self._dir is None:
+            return None
+        try:
+            record = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        completion = Completion.from_dict(record, cached=True)
+        self._remember(key, completion)
+        return completion
+
+    def _remember(self, key: str, completion: Completion) -> None:
+        if self._max_entries == 0:
+            return
+        with self._lock:
+            self._memory[key] = completion
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+
+    def put(self, key: str, completion: Completion) -> None:
+        cached = replace(completion, cached=True, raw={})
+        self._remember(key, cached)
+        if self._dir is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(cached.to_dict()), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class LLMClient:
+    """Cached, coalescing front end for a ``Provider``.
+
+    Deterministic requests (temperature 0 or a fixed seed) are cached under
+    a hash of provider, model, prompt and sampling settings, and identical
+    deterministic requests already in flight share one provider call.
+    Sampled requests always reach the provider. ``complete_many`` runs a
+    batch over the provider's connection pool, so at most
+    ``provider.max_concurrency`` calls are in flight.
+    """
+
+    def __init__(self, provider: Provider, *, cache: CompletionCache | None = None) -> None:
+        self.provider = provider
+        self.cache = cache if cache is not None else CompletionCache()
+        self.stats = CompletionCacheStats()
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future[Completion]] = {}
+
+    def _key(self, request: CompletionRequest) -> str | None:
+        return completion_key(self.provider.name, request) if request.deterministic else None
+
+    def _cached(self, key: str | None) -> Completion | None:
+        if key is None:
+            return None
+        completion = self.cache.get(key)
+        with self._lock:
+            if completion is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        if completion is not None:
+            count("private_ops_llm_cache_hits_total", provider=self.provider.name)
+        return completion
+
+    def complete(self, request: CompletionRequest) -> Completion:
+        key = self._key(request)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        if key is None:
+            return self.provider.complete(request)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.stats.coalesced += 1
+        assert future is not None
+        if not leader:
+            return future.result()
+
+        try:
+            completion = self.provider.complete(request)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            self._store(key, completion)
+            future.set_result(completion)
+            return completion
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _store(self, key: str, completion: Completion) -> None:
+        self.cache.put(key, completion)
+        with self._lock:
+            self.stats.stores += 1
+
+    def stream(self, request: CompletionRequest) -> Iterator[str]:
+        """Yield text as it arrives; a cached completion is yielded whole.
+
+        A deterministic stream read to the end is cached like ``complete``.
+        """
+        key = self._key(request)
+        cached = self._cached(key)
+        if cached is not None:
+            yield cached.text
+            return
+        parts: list[str] = []
+        for text in self.provider.stream(request):
+            parts.append(text)
+            yield text
+        if key is not None:
+            self._store(
+                key,
+                Completion(text="".join(parts), model=request.model, provider=self.provider.name),
+            )
+
+    def complete_many(self, requests: Iterable[CompletionRequest]) -> list[Completion]:
+        """Complete a batch concurrently; results are in request order."""
+        requests = list(requests)
+        if not requests:
+            return []
+        workers = min(self.provider.max_concurrency, len(requests))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="private-ops-llm") as pool:
+            return list(pool.map(self.complete, requests))
+
+    def close(self) -> None:
+        self.provider.close()
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import threading
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from private_ops.protocol.index import GraphIndex
+from private_ops.protocol.models import Edge, GraphPayload, Node, SourceRef
+from private_ops.telemetry import span
+
+TokenCounter = Callable[[str], int]
+
+DEFAULT_CONFIDENCE = 0.5
+DISTANCE_DECAY = 0.5
+_MAX_VALUE_CHARS = 80
+_HEADERS = ("# sources", "# entities", "# links")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: about four characters per token, never below one."""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def confidence(item: Node | Edge) -> float:
+    """``properties["confidence"]`` when numeric, else the best source confidence."""
+    value = item.properties.get("confidence")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if item.sources:
+        return max(source.confidence for source in item.sources)
+    return DEFAULT_CONFIDENCE
+
+
+@dataclass(frozen=True)
+class PackedContext:
+    text: str
+    tokens: int
+    aliases: dict[str, str]
+    node_ids: tuple[str, ...]
+    edge_ids: tuple[str, ...]
+    omitted_nodes: int
+    omitted_edges: int
+
+    def resolve(self, alias: str) -> str | None:
+        """Map an alias such as ``N3`` from model output back to the node id."""
+        return self.aliases.get(alias)
+
+
+def _value(value: Any) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    if len(text) > _MAX_VALUE_CHARS:
+        text = text[: _MAX_VALUE_CHARS - 1] + "…"
+    return json.dumps(text, ensure_ascii=False) if isinstance(value, str) else text
+
+
+def _attributes(item: Node | Edge, source_aliases: list[str]) -> str:
+    parts = [f"conf={confidence(item):.2g}"]
+    if source_aliases:
+        parts.append("src=" + ",".join(source_aliases))
+    for key, value in item.properties.items():
+        if key == "confidence" or isinstance(value, (dict, list)) or value is None:
+            continue
+        parts.append(f"{key}={_value(value)}")
+    return " ".join(parts)
+
+
+def _source_line(alias: str, source: SourceRef) -> str:
+    line = f"{alias} {_value(source.title)} id={source.source_id}"
+    return f"{line} url={source.url}" if source.url else line
+
+
+class ContextPacker:
+    """Pack the most relevant part of a graph into a token budget for a prompt.
+
+    Nodes within ``max_depth`` hops of the focus entities are ranked by
+    ``confidence * DISTANCE_DECAY ** distance``; an edge becomes a candidate
+    once both of its endpoints are packed and ranks by its own confidence
+    and nearer endpoint. Candidates are added best first while they fit.
+    The text lists each source once as ``S<n>``, and nodes by ``N<n>``
+    aliases instead of their 24-hex ids; ``PackedContext.aliases`` maps
+    them back.
+
+    Results are memoized per graph, focus and budget without reading the
+    graph: a ``GraphIndex`` is keyed by identity (weakly) plus its
+    ``version`` counter, so mutating it invalidates its entries. A
+    ``GraphPayload`` is keyed by identity and treated as unchanged while the
+    same object is passed; pass a new ``version`` after mutating its lists
+    in place. Cached payload entries keep their graph alive until evicted.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int,
+        *,
+        max_depth: int = 3,
+        count_tokens: TokenCounter = estimate_tokens,
+        cache_size: int = 64,
+    ) -> None:
+        if budget_tokens < 1:
+            raise ValueError("budget_tokens must be >= 1")
+        if max_depth < 0:
+            raise ValueError("max_depth must be >= 0")
+        self.budget_tokens = budget_tokens
+        self.max_depth = max_depth
+        self._count = count_tokens
+        # Payload entries hold the graph itself so its id() cannot be reused meanwhile.
+        self._cache: OrderedDict[Hashable, tuple[GraphPayload, PackedContext]] = OrderedDict()
+        self._index_caches: weakref.WeakKeyDictionary[
+            GraphIndex, OrderedDict[Hashable, PackedContext]
+        ] = weakref.WeakKeyDictionary()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def pack(
+        self,
+        graph: GraphPayload | GraphIndex,
+        focus: Iterable[str],
+        *,
+        version: Hashable | None = None,
+    ) -> PackedContext:
+        """Pack ``graph`` around the ``focus`` node ids.
+
+        ``version`` is an extra memo discriminator for callers that mutate a
+        ``GraphPayload`` in place.
+        """
+        focus_ids = tuple(dict.fromkeys(focus))
+        settings = (focus_ids, self.budget_tokens, self.max_depth)
+        if isinstance(graph, GraphIndex):
+            return self._pack_index(graph, focus_ids, (graph.version, version, *settings))
+        key = (id(graph), version, *settings)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        packed = self._timed_pack(graph.nodes, graph.edges, focus_ids)
+        with self._lock:
+            self._cache[key] = (graph, packed)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return packed
+
+    def _pack_index(
+        self, index: GraphIndex, focus: tuple[str, ...], key: Hashable
+    ) -> PackedContext:
+        with self._lock:
+            cache = self._index_caches.get(index)
+            if cache is None:
+                cache = self._index_caches[index] = OrderedDict()
+            packed = cache.get(key)
+            if packed is not None:
+                cache.move_to_end(key)
+                self.hits += 1
+                return packed
+            self.misses += 1
+        packed = self._timed_pack(index.nodes(), index.edges(), focus)
+        with self._lock:
+            cache[key] = packed
+            while len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        return packed
+
+    def _timed_pack(
+        self, nodes: list[Node], edges: list[Edge], focus: tuple[str, ...]
+    ) -> PackedContext:
+        with span("pack_context", nodes=len(nodes), budget=self.budget_tokens):
+            return self._pack(nodes, edges, focus)
+
+    def _distances(self, edges: list[Edge], focus: tuple[str, ...]) -> dict[str, int]:
+        adjacency: dict[str, list[str]] = {}
+        for edge in edges:
+            adjacency.setdefault(edge.from_id, []).append(edge.to_id)
+            adjacency.setdefault(edge.to_id, []).append(edge.from_id)
+        distances = {node_id: 0 for node_id in focus}
+        queue = deque(focus)
+        while queue:
+            current = queue.popleft()
+            depth = distances[current]
+            if depth >= self.max_depth:
+                continue
+            for neighbour in adjacency.get(current, ()):
+                if neighbour not in distances:
+                    distances[neighbour] = depth + 1
+                    queue.append(neighbour)
+        return distances
+
+    def _pack(
+        self, node_list: list[Node], edge_list: list[Edge], focus: tuple[str, ...]
+    ) -> PackedContext:
+        nodes = {node.id: node for node in node_list}
+        missing = [node_id for node_id in focus if node_id not in nodes]
+        if missing:
+            raise ValueError(f"focus node(s) not in graph: {', '.join(missing)}")
+        distances = self._distances(edge_list, focus)
+        edges_by_node: dict[str, list[Edge]] = {}
+        for edge in edge_list:
+            if edge.from_id in distances and edge.to_id in distances:
+                edges_by_node.setdefault(edge.from_id, []).append(edge)
+                edges_by_node.setdefault(edge.to_id, []).append(edge)
+
+        # (-score, insertion order, item); focus nodes come first, in the order given.
+        candidates: list[tuple[float, int, Node | Edge]] = []
+        for order, (node_id, distance) in enumerate(distances.items()):
+            node = nodes.get(node_id)
+            if node is None:
+                continue
+            score = -math.inf if distance == 0 else -confidence(node) * DISTANCE_DECAY**distance
+            candidates.append((score, order, node))
+        heapq.heapify(candidates)
+        order = len(distances)
+
+        used = sum(self._count(header + "\n") for header in _HEADERS)
+        aliases: dict[str, str] = {}
+        node_alias: dict[str, str] = {}
+        source_alias: dict[SourceRef, str] = {}
+        queued_edges: set[str] = set()
+        sections: tuple[list[str], list[str], list[str]] = ([], [], [])
+        edge_ids: list[str] = []
+
+        while candidates:
+            _, _, item = heapq.heappop(candidates)
+            sources = list(dict.fromkeys(item.sources))
+            pending: dict[SourceRef, str] = {}
+            for source in sources:
+                if source not in source_alias:
+                    pending[source] = f"S{len(source_alias) + len(pending) + 1}"
+            refs = [source_alias.get(source) or pending[source] for source in sources]
+            source_lines = [_source_line(alias, source) for source, alias in pending.items()]
+            if isinstance(item, Node):
+                alias = f"N{len(aliases) + 1}"
+                line = f"{alias} {item.type} {_value(item.label)} {_attributes(item, refs)}"
+            else:
+                line = (
+                    f"{node_alias[item.from_id]} -{item.type}-> {node_alias[item.to_id]} "
+                    f"{_attributes(item, refs)}"
+                )
+            # Counting each line with its newline keeps the sum an upper bound on the text.
+            cost = sum(self._count(text + "\n") for text in (line, *source_lines))
+            if used + cost > self.budget_tokens:
+                continue
+            used += cost
+            source_alias.update(pending)
+            sections[0].extend(source_lines)
+            if isinstance(item, Edge):
+                sections[2].append(line)
+                edge_ids.append(item.id)
+                continue
+            sections[1].append(line)
+            aliases[alias] = item.id
+            node_alias[item.id] = alias
+            for edge in edges_by_node.get(item.id, ()):
+                if edge.id in queued_edges:
+                    continue
+                if edge.from_id not in node_alias or edge.to_id not in node_alias:
+                    continue
+                queued_edges.add(edge.id)
+                nearer = min(distances[edge.from_id], distances[edge.to_id])
+                heapq.heappush(
+                    candidates, (-confidence(edge) * DISTANCE_DECAY**nearer, order, edge)
+                )
+                order += 1
+
+        text = "\n".join(
+            line for header, section in zip(_HEADERS, sections) for line in (header, *section)
+        )
+        return PackedContext(
+            text=text,
+            tokens=self._count(text),
+            aliases=aliases,
+            node_ids=tuple(aliases.values()),
+            edge_ids=tuple(edge_ids),
+            omitted_nodes=len(nodes) - len(aliases),
+            omitted_edges=len(edge_list) - len(edge_ids),
+        )
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import http.client
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from private_ops.llm.models import LLMError
+
+# Errors that mean an idle keep-alive connection was closed by the server.
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one origin.
+
+    At most ``max_connections`` requests are in flight at once; callers
+    beyond that wait for a free connection. Idle connections are reused
+    most-recently-used first, and a request that fails because the server
+    dropped an idle connection is retried once on a fresh one. A response
+    that is not read to the end closes its connection instead of returning
+    it to the pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        max_connections: int = 4,
+        timeout: float = 60.0,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("max_connections must be >= 1")
+        parts = urlsplit(base_url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"base_url must be an http(s) URL, got '{base_url}'")
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return cls(self._host, self._port, timeout=self._timeout)
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _send(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> http.client.HTTPResponse:
+        connection.request(method, self._prefix + path, body=body, headers=headers)
+        with self._lock:
+            self.requests_sent += 1
+        return connection.getresponse()
+
+    @contextmanager
+    def open(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send a request and yield the response while holding its connection."""
+        headers = {"Connection": "keep-alive", **(headers or {})}
+        self._slots.acquire()
+        try:
+            connection, reused = self._checkout()
+            try:
+                try:
+                    response = self._send(connection, method, path, body, headers)
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    connection.close()
+                    connection = self._connect()
+                    response = self._send(connection, method, path, body, headers)
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                raise LLMError(f"request to {self.base_url} failed: {exc}") from exc
+
+            try:
+                yield response
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                raise LLMError(f"reading from {self.base_url} failed: {exc}") from exc
+            except BaseException:
+                connection.close()
+                raise
+            if response.isclosed() and not response.will_close:
+                with self._lock:
+                    self._idle.append(connection)
+            else:
+                connection.close()
+        finally:
+            self._slots.release()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, bytes]:
+        with self.open(method, path, body, headers) as response:
+            return response.status, response.read()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
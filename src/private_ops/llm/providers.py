@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import Any
+
+from private_ops.config import OpsConfig
+from private_ops.llm.models import Completion, CompletionRequest, LLMError
+from private_ops.llm.pool import ConnectionPool
+from private_ops.telemetry import span
+
+_JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+
+class Provider(ABC):
+    """Completion API over a pooled, keep-alive connection.
+
+    ``max_concurrency`` caps the requests this provider has in flight;
+    further calls wait for a free connection. Subclasses describe the
+    wire format with ``_path``, ``_payload``, ``_parse`` and ``_parse_line``.
+    """
+
+    name = ""
+    default_url = ""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        url = base_url or self.default_url
+        if not url:
+            raise ValueError(f"{self.name} provider needs a base URL")
+        self.pool = ConnectionPool(url, max_connections=max_concurrency, timeout=timeout)
+        self._headers = {**_JSON_HEADERS, **(headers or {})}
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.pool.max_connections
+
+    @abstractmethod
+    def _path(self, request: CompletionRequest) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _payload(self, request: CompletionRequest, stream: bool) -> dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _parse(self, request: CompletionRequest, data: dict[str, Any]) -> Completion:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _parse_line(self, line: bytes) -> tuple[str, bool]:
+        """Decode one streamed line into ``(text, done)``."""
+        raise NotImplementedError
+
+    def _body(self, request: CompletionRequest, stream: bool) -> bytes:
+        return json.dumps(self._payload(request, stream), separators=(",", ":")).encode("utf-8")
+
+    def _check(self, status: int, body: bytes) -> None:
+        if not 200 <= status < 300:
+            detail = body[:200].decode("utf-8", "replace")
+            raise LLMError(f"{self.name} returned HTTP {status}: {detail}", status=status)
+
+    def complete(self, request: CompletionRequest) -> Completion:
+        with span("llm", provider=self.name, model=request.model):
+            status, body = self.pool.request(
+                "POST", self._path(request), self._body(request, False), self._headers
+            )
+        self._check(status, body)
+        try:
+            return self._parse(request, json.loads(body))
+        except (ValueError, KeyError, IndexError, TypeError) as exc:
+            raise LLMError(f"{self.name} returned an unexpected body: {exc}") from exc
+
+    def stream(self, request: CompletionRequest) -> Iterator[str]:
+        """Yield text fragments as the provider produces them.
+
+        Stopping early closes the connection rather than draining it.
+        """
+        with self.pool.open(
+            "POST", self._path(request), self._body(request, True), self._headers
+        ) as response:
+            if not 200 <= response.status < 300:
+                self._check(response.status, response.read())
+            for line in response:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    text, done = self._parse_line(line)
+                except (ValueError, KeyError, IndexError, TypeError) as exc:
+                    raise LLMError(f"{self.name} sent an unexpected chunk: {exc}") from exc
+                if text:
+                    yield text
+                if done:
+                    response.read()
+                    return
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class OllamaProvider(Provider):
+    """Ollama ``/api/generate``; streaming responses are NDJSON."""
+
+    name = "ollama"
+    default_url = "http://127.0.0.1:11434"
+
+    def _path(self, request: CompletionRequest) -> str:
+        return "/api/generate"
+
+    def _payload(self, request: CompletionRequest, stream: bool) -> dict[str, Any]:
+        options: dict[str, Any] = {"temperature": request.temperature}
+        if request.max_tokens is not None:
+            options["num_predict"] = request.max_tokens
+        if request.seed is not None:
+            options["seed"] = request.seed
+        if request.stop:
+            options["stop"] = list(request.stop)
+        payload: dict[str, Any] = {
+            "model": request.model,
+            "prompt": request.prompt,
+            "stream": stream,
+            "options": options,
+        }
+        if request.system is not None:
+            payload["system"] = request.system
+        return payload
+
+    def _parse(self, request: CompletionRequest, data: dict[str, Any]) -> Completion:
+        return Completion(
+            text=data["response"],
+            model=data.get("model", request.model),
+            provider=self.name,
+            prompt_tokens=data.get("prompt_eval_count"),
+            completion_tokens=data.get("eval_count"),
+            raw=data,
+        )
+
+    def _parse_line(self, line: bytes) -> tuple[str, bool]:
+        data = json.loads(line)
+        if "error" in data:
+            raise LLMError(f"{self.name} stream failed: {data['error']}")
+        return data.get("response", ""), bool(data.get("done"))
+
+
+class OpenAIProvider(Provider):
+    """OpenAI-compatible ``/v1/chat/completions``; streaming is server-sent events."""
+
+    name = "openai"
+    default_url = "https://api.openai.com"
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        api_key: str | None = None,
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+    ) -> None:
+        super().__init__(
+            base_url,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            headers=self._auth_headers(api_key),
+        )
+
+    def _auth_headers(self, api_key: str | None) -> dict[str, str]:
+        return {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    def _path(self, request: CompletionRequest) -> str:
+        return "/v1/chat/completions"
+
+    def _payload(self, request: CompletionRequest, stream: bool) -> dict[str, Any]:
+        messages = []
+        if request.system is not None:
+            messages.append({"role": "system", "content": request.system})
+        messages.append({"role": "user", "content": request.prompt})
+        payload: dict[str, Any] = {
+            "model": request.model,
+            "messages": messages,
+            "temperature": request.temperature,
+            "stream": stream,
+        }
+        if request.max_tokens is not None:
+            payload["max_tokens"] = request.max_tokens
+        if request.seed is not None:
+            payload["seed"] = request.seed
+        if request.stop:
+            payload["stop"] = list(request.stop)
+        return payload
+
+    def _parse(self, request: CompletionRequest, data: dict[str, Any]) -> Completion:
+        usage = data.get("usage") or {}
+        return Completion(
+            text=data["choices"][0]["message"]["content"] or "",
+            model=data.get("model", request.model),
+            provider=self.name,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            raw=data,
+        )
+
+    def _parse_line(self, line: bytes) -> tuple[str, bool]:
+        if not line.startswith(b"data:"):
+            return "", False
+        data = line[len(b"data:"):].strip()
+        if data == b"[DONE]":
+            return "", True
+        choices = json.loads(data).get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content") or "", False
+
+
+class AzureOpenAIProvider(OpenAIProvider):
+    """Azure OpenAI; ``request.model`` names the deployment."""
+
+    name = "azure"
+    default_url = ""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        api_key: str | None = None,
+        api_version: str = "2024-06-01",
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+    ) -> None:
+        self.api_version = api_version
+        super().__init__(
+            base_url, api_key=api_key, max_concurrency=max_concurrency, timeout=timeout
+        )
+
+    def _auth_headers(self, api_key: str | None) -> dict[str, str]:
+        return {"api-key": api_key} if api_key else {}
+
+    def _path(self, request: CompletionRequest) -> str:
+        return (
+            f"/openai/deployments/{request.model}/chat/completions"
+            f"?api-version={self.api_version}"
+        )
+
+    def _payload(self, request: CompletionRequest, stream: bool) -> dict[str, Any]:
+        payload = super()._payload(request, stream)
+        del payload["model"]
+        return payload
+
+
+def provider_from_config(
+    config: OpsConfig,
+    *,
+    max_concurrency: int | None = None,
+    timeout: float = 60.0,
+) -> Provider:
+    """Build the provider ``config.provider`` names.
+
+    ``config.llm_url`` overrides the provider's default endpoint; API keys
+    come from ``OPENAI_API_KEY`` / ``AZURE_OPENAI_API_KEY`` so they never sit
+    in the config object, and Azure also reads ``AZURE_OPENAI_ENDPOINT`` and
+    ``AZURE_OPENAI_API_VERSION``.
+    """
+    url = config.llm_url or None
+    concurrency = max_concurrency if max_concurrency is not None else config.llm_concurrency
+    if config.provider == "ollama":
+        return OllamaProvider(url, max_concurrency=concurrency, timeout=timeout)
+    if config.provider == "openai":
+        return OpenAIProvider(
+            url,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_concurrency=concurrency,
+            timeout=timeout,
+        )
+    if config.provider == "azure":
+        return AzureOpenAIProvider(
+            url or os.getenv("AZURE_OPENAI_ENDPOINT"),
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-06-01"),
+            max_concurrency=concurrency,
+            timeout=timeout,
+        )
+    raise ValueError(f"provider must be one of ollama/openai/azure, got '{config.provider}'")
@@ -1,4 +1,7 @@
-from private_ops.protocol.ids import edge_id, node_id
+from private_ops.protocol.builder import GraphBuilder
+from private_ops.protocol.columnar import ColumnarGraph, StringTable
+from private_ops.protocol.index import GraphIndex
+from private_ops.protocol.ids import edge_id, edge_ids, node_id, node_ids
 from private_ops.protocol.models import (
     Edge,
     GraphPayload,
@@ -8,7 +11,15 @@ from private_ops.protocol.models import (
     TransformRequest,
     TransformResponse,
 )
-from private_ops.protocol.normalize import normalize_email, normalize_phone, normalize_text
+from private_ops.protocol.normalize import (
+    normalize_email,
+    normalize_emails,
+    normalize_phone,
+    normalize_phones,
+    normalize_text,
+    normalize_texts,
+    split_e164,
+)
 
 __all__ = [
     "SourceRef",
@@ -18,9 +29,19 @@ __all__ = [
     "GraphPayload",
     "TransformRequest",
     "TransformResponse",
+    "GraphBuilder",
+    "GraphIndex",
+    "ColumnarGraph",
+    "StringTable",
     "node_id",
     "edge_id",
+    "node_ids",
+    "edge_ids",
     "normalize_phone",
     "normalize_email",
     "normalize_text",
+    "normalize_phones",
+    "normalize_emails",
+    "normalize_texts",
+    "split_e164",
 ]
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any
+
+from private_ops.protocol.columnar import ColumnarGraph, StringTable, _RowView
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta, SourceRef
+
+MAGIC = b"POGB"
+VERSION = 1
+BINARY_SUFFIXES = (".pogb",)
+
+# magic, version, flags, strings, sources, nodes, edges, then section offsets:
+# run_meta, run_meta length, string offsets, string data, sources, nodes, edges, refs
+_HEADER = struct.Struct("<4sHH4I8Q")
+_SOURCE = struct.Struct("<3Id")
+NODE_FIELDS = 7  # id, type, key, label, properties, first source ref, source count
+EDGE_FIELDS = 8  # id, type, from, to, key, properties, first source ref, source count
+NO_PROPERTIES = 0xFFFFFFFF
+
+_encode_compact = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def is_binary(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in BINARY_SUFFIXES
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _padded(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_binary_graph(graph: GraphPayload | ColumnarGraph, path: str | Path) -> None:
+    """Write ``graph`` in the versioned ``.pogb`` binary format.
+
+    Every string (ids, types, keys, labels, source fields and the JSON of
+    non-empty property maps) is stored once in a string table addressed by
+    an offset index. Nodes and edges are fixed-width little-endian ``uint32``
+    records of string codes plus a slice into a shared source-ref array, so
+    a reader can seek to any row without parsing the rows before it.
+    """
+    columnar = graph if isinstance(graph, ColumnarGraph) else ColumnarGraph.from_payload(graph)
+    strings = StringTable(columnar.strings.values)
+    code = strings.code
+
+    sources = b"".join(
+        _SOURCE.pack(code(s.source_id), code(s.title), code(s.url), s.confidence)
+        for s in columnar.sources
+    )
+
+    def properties_code(properties: dict[str, Any] | None) -> int:
+        return code(_encode_compact(properties)) if properties else NO_PROPERTIES
+
+    node_offsets = columnar.node_source_offsets
+    nodes = array("I")
+    for row in range(len(columnar.node_ids)):
+        nodes.extend(
+            (
+                columnar.node_ids[row],
+                columnar.node_types[row],
+                columnar.node_keys[row],
+                columnar.node_labels[row],
+                properties_code(columnar.node_properties.get(row)),
+                node_offsets[row],
+                node_offsets[row + 1] - node_offsets[row],
+            )
+        )
+
+    edge_offsets = columnar.edge_source_offsets
+    edge_base = len(columnar.node_source_refs)
+    edges = array("I")
+    for row in range(len(columnar.edge_ids)):
+        edges.extend(
+            (
+                columnar.edge_ids[row],
+                columnar.edge_types[row],
+                columnar.edge_from[row],
+                columnar.edge_to[row],
+                columnar.edge_keys[row],
+                properties_code(columnar.edge_properties.get(row)),
+                edge_base + edge_offsets[row],
+                edge_offsets[row + 1] - edge_offsets[row],
+            )
+        )
+
+    encoded = [value.encode("utf-8") for value in strings.values]
+    string_offsets = array("Q", [0])
+    total = 0
+    for item in encoded:
+        total += len(item)
+        string_offsets.append(total)
+
+    run_meta = _encode_compact(columnar.run_meta.to_dict()).encode("utf-8")
+    sections = [
+        run_meta,
+        _le_bytes(string_offsets),
+        b"".join(encoded),
+        sources,
+        _le_bytes(nodes),
+        _le_bytes(edges),
+        _le_bytes(columnar.node_source_refs) + _le_bytes(columnar.edge_source_refs),
+    ]
+    offsets = []
+    cursor = _HEADER.size
+    for section in sections:
+        cursor = _padded(cursor)
+        offsets.append(cursor)
+        cursor += len(section)
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(strings),
+        len(columnar.sources),
+        len(columnar.node_ids),
+        len(columnar.edge_ids),
+        offsets[0],
+        len(run_meta),
+        *offsets[1:],
+    )
+    with Path(path).open("wb") as handle:
+        handle.write(header)
+        position = _HEADER.size
+        for offset, section in zip(offsets, sections):
+            handle.write(b"\0" * (offset - position))
+            handle.write(section)
+            position = offset + len(section)
+
+
+class BinaryGraphReader:
+    """Memory-mapped reader for ``.pogb`` files.
+
+    Opening a file parses only the header, run metadata and source table;
+    ``node(row)``/``edge(row)`` decode one record straight from the mapping,
+    and ``as_payload`` exposes lazy ``nodes``/``edges`` sequences.
+    ``validate`` compares string codes and never decodes a string.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{self.path}: not a binary graph file") from None
+        self._views: list[memoryview] = []
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _words(self, offset: int, count: int, typecode: str) -> memoryview | array:
+        size = array(typecode).itemsize * count
+        raw = memoryview(self._map)[offset : offset + size]
+        self._views.append(raw)
+        if sys.byteorder == "big":
+            values = array(typecode, raw.tobytes())
+            values.byteswap()
+            return values
+        view = raw.cast(typecode)
+        self._views.append(view)
+        return view
+
+    def _load(self) -> None:
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{self.path}: not a binary graph file")
+        (
+            magic,
+            version,
+            _flags,
+            string_count,
+            source_count,
+            self.node_count,
+            self.edge_count,
+            run_meta_offset,
+            run_meta_size,
+            string_index_offset,
+            self._string_data,
+            sources_offset,
+            nodes_offset,
+            edges_offset,
+            refs_offset,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not a binary graph file")
+        if version != VERSION:
+            raise ValueError(f"{self.path}: unsupported binary graph version {version}")
+
+        self.run_meta = RunMeta.from_dict(
+            json.loads(self._map[run_meta_offset : run_meta_offset + run_meta_size])
+        )
+        self._string_offsets = self._words(string_index_offset, string_count + 1, "Q")
+        self._nodes = self._words(nodes_offset, self.node_count * NODE_FIELDS, "I")
+        self._edges = self._words(edges_offset, self.edge_count * EDGE_FIELDS, "I")
+        self._refs = self._words(refs_offset, (len(self._map) - refs_offset) // 4, "I")
+        string = self.string
+        self.sources = [
+            SourceRef.shared(string(source_id), string(title), string(url), confidence)
+            for source_id, title, url, confidence in (
+                _SOURCE.unpack_from(self._map, sources_offset + i * _SOURCE.size)
+                for i in range(source_count)
+            )
+        ]
+
+    def string(self, code: int) -> str:
+        start = self._string_data + self._string_offsets[code]
+        end = self._string_data + self._string_offsets[code + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def _properties(self, code: int) -> dict[str, Any]:
+        return {} if code == NO_PROPERTIES else json.loads(self.string(code))
+
+    def _sources(self, start: int, count: int) -> list[SourceRef]:
+        return [self.sources[code] for code in self._refs[start : start + count]]
+
+    def node(self, row: int) -> Node:
+        if not 0 <= row < self.node_count:
+            raise IndexError("node row out of range")
+        base = row * NODE_FIELDS
+        id_, type_, key, label, properties, start, count = self._nodes[base : base + NODE_FIELDS]
+        string = self.string
+        return Node(
+            id=string(id_),
+            type=string(type_),
+            canonical_key=string(key),
+            label=string(label),
+            properties=self._properties(properties),
+            sources=self._sources(start, count),
+        )
+
+    def edge(self, row: int) -> Edge:
+        if not 0 <= row < self.edge_count:
+            raise IndexError("edge row out of range")
+        base = row * EDGE_FIELDS
+        id_, type_, from_id, to_id, key, properties, start, count = self._edges[
+            base : base + EDGE_FIELDS
+        ]
+        string = self.string
+        return Edge(
+            id=string(id_),
+            type=string(type_),
+            from_id=string(from_id),
+            to_id=string(to_id),
+            canonical_key=string(key),
+            properties=self._properties(properties),
+            sources=self._sources(start, count),
+        )
+
+    def as_payload(self) -> GraphPayload:
+        return GraphPayload(
+            run_meta=self.run_meta,
+            nodes=_RowView(range(self.node_count), self.node),  # type: ignore[arg-type]
+            edges=_RowView(range(self.edge_count), self.edge),  # type: ignore[arg-type]
+        )
+
+    def validate(self) -> list[str]:
+        errors: list[str] = []
+        node_codes = set(self._nodes[0::NODE_FIELDS])
+        if len(node_codes) != self.node_count:
+            errors.append("node ids must be unique")
+        if len(set(self._edges[0::EDGE_FIELDS])) != self.edge_count:
+            errors.append("edge ids must be unique")
+
+        edge_from = self._edges[2::EDGE_FIELDS]
+        edge_to = self._edges[3::EDGE_FIELDS]
+        if node_codes.issuperset(edge_from) and node_codes.issuperset(edge_to):
+            return errors
+
+        string = self.string
+        edge_ids = self._edges[0::EDGE_FIELDS]
+        for row, (from_code, to_code) in enumerate(zip(edge_from, edge_to)):
+            if from_code not in node_codes:
+                errors.append(
+                    f"edge {string(edge_ids[row])} has unknown from node {string(from_code)}"
+                )
+            if to_code not in node_codes:
+                errors.append(f"edge {string(edge_ids[row])} has unknown to node {string(to_code)}")
+        return errors
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "BinaryGraphReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def read_binary_graph(path: str | Path) -> GraphPayload:
+    """Decode a whole ``.pogb`` file into an in-memory ``GraphPayload``."""
+    with BinaryGraphReader(path) as reader:
+        payload = reader.as_payload()
+        return GraphPayload(
+            run_meta=reader.run_meta,
+            nodes=list(payload.nodes),
+            edges=list(payload.edges),
+        )
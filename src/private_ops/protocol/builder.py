@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import replace
+from typing import Any, TypeVar
+
+from private_ops.protocol.ids import edge_id, node_id
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta, SourceRef
+
+EntityT = TypeVar("EntityT", Node, Edge)
+
+
+def entity_confidence(properties: dict[str, Any], sources: Iterable[SourceRef]) -> float:
+    value = properties.get("confidence")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return max((source.confidence for source in sources), default=0.0)
+
+
+def union_sources(left: list[SourceRef], right: Iterable[SourceRef]) -> list[SourceRef]:
+    merged = list(left)
+    seen = set(merged)
+    for source in right:
+        if source not in seen:
+            seen.add(source)
+            merged.append(source)
+    return merged
+
+
+def merge_entity(existing: EntityT, incoming: EntityT) -> EntityT:
+    """Merge two records of the same entity.
+
+    Sources are unioned in first-seen order. Properties are unioned; on a
+    conflicting key the more confident record wins, ties keep ``existing``.
+    """
+    incoming_wins = entity_confidence(incoming.properties, incoming.sources) > entity_confidence(
+        existing.properties, existing.sources
+    )
+    if incoming_wins:
+        properties = {**existing.properties, **incoming.properties}
+    else:
+        properties = {**incoming.properties, **existing.properties}
+
+    changes: dict[str, Any] = {
+        "properties": properties,
+        "sources": union_sources(existing.sources, incoming.sources),
+    }
+    if isinstance(existing, Node) and incoming_wins:
+        changes["label"] = incoming.label
+    return replace(existing, **changes)
+
+
+class GraphBuilder:
+    """Incrementally assemble a ``GraphPayload``.
+
+    Nodes and edges are indexed by id (and nodes by ``(type, canonical_key)``)
+    as they are added. Re-adding an entity merges it into the existing one;
+    a node whose ``(type, canonical_key)`` is already taken by another id is
+    merged into that node too, and edges naming its id are re-pointed at the
+    first one. Edges whose endpoints are not present yet are tracked as
+    dangling until the node arrives. ``freeze`` hands the running validation result to the
+    payload, so ``GraphPayload.validate`` does not rescan it.
+    """
+
+    def __init__(self, run_meta: RunMeta) -> None:
+        self.run_meta = run_meta
+        self._nodes: dict[str, Node] = {}
+        self._edges: dict[str, Edge] = {}
+        self._by_key: dict[tuple[str, str], str] = {}
+        self._aliases: dict[str, str] = {}
+        self._waiting: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes) + len(self._edges)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    def add_node(
+        self,
+        entity_type: str,
+        canonical_key: str,
+        label: str,
+        *,
+        properties: dict[str, Any] | None = None,
+        sources: Iterable[SourceRef] = (),
+    ) -> Node:
+        return self.merge_node(
+            Node(
+                id=node_id(entity_type, canonical_key),
+                type=entity_type,
+                canonical_key=canonical_key,
+                label=label,
+                properties=dict(properties or {}),
+                sources=list(sources),
+            )
+        )
+
+    def add_edge(
+        self,
+        edge_type: str,
+        from_id: str,
+        to_id: str,
+        canonical_key: str,
+        *,
+        properties: dict[str, Any] | None = None,
+        sources: Iterable[SourceRef] = (),
+    ) -> Edge:
+        return self.merge_edge(
+            Edge(
+                id=edge_id(edge_type, from_id, to_id, canonical_key),
+                type=edge_type,
+                from_id=from_id,
+                to_id=to_id,
+                canonical_key=canonical_key,
+                properties=dict(properties or {}),
+                sources=list(sources),
+            )
+        )
+
+    def merge_node(self, node: Node) -> Node:
+        owner = self._by_key.setdefault((node.type, node.canonical_key), node.id)
+        if owner != node.id:
+            self._alias(node.id, owner)
+            node = replace(node, id=owner)
+        existing = self._nodes.get(node.id)
+        if existing is not None:
+            node = merge_entity(existing, node)
+        self._nodes[node.id] = node
+        self._waiting.pop(node.id, None)
+        return node
+
+    def _alias(self, alias: str, owner: str) -> None:
+        self._aliases[alias] = owner
+        for waiting_id in self._waiting.pop(alias, ()):
+            # Re-pointing changes the edge id, so re-merge it under the new one.
+            edge = self._edges.pop(waiting_id)
+            for endpoint in (edge.from_id, edge.to_id):
+                waiting = self._waiting.get(endpoint)
+                if waiting is not None:
+                    waiting.discard(waiting_id)
+                    if not waiting:
+                        del self._waiting[endpoint]
+            self.merge_edge(edge)
+
+    def _resolve_endpoints(self, edge: Edge) -> Edge:
+        from_id = self._aliases.get(edge.from_id, edge.from_id)
+        to_id = self._aliases.get(edge.to_id, edge.to_id)
+        if (from_id, to_id) == (edge.from_id, edge.to_id):
+            return edge
+        return replace(
+            edge,
+            id=edge_id(edge.type, from_id, to_id, edge.canonical_key),
+            from_id=from_id,
+            to_id=to_id,
+        )
+
+    def merge_edge(self, edge: Edge) -> Edge:
+        edge = self._resolve_endpoints(edge)
+        existing = self._edges.get(edge.id)
+        if existing is not None:
+            edge = merge_entity(existing, edge)
+        self._edges[edge.id] = edge
+        for endpoint in (edge.from_id, edge.to_id):
+            if endpoint not in self._nodes:
+                self._waiting.setdefault(endpoint, set()).add(edge.id)
+        return edge
+
+    def merge_graph(self, graph: GraphPayload) -> None:
+        for node in graph.nodes:
+            self.merge_node(node)
+        for edge in graph.edges:
+            self.merge_edge(edge)
+
+    def get_node(self, entity_id: str) -> Node | None:
+        return self._nodes.get(self._aliases.get(entity_id, entity_id))
+
+    def find_node(self, entity_type: str, canonical_key: str) -> Node | None:
+        entity_id = self._by_key.get((entity_type, canonical_key))
+        return self._nodes.get(entity_id) if entity_id is not None else None
+
+    def dangling(self) -> dict[str, set[str]]:
+        """Missing node ids mapped to the edge ids that reference them."""
+        return {missing: set(edges) for missing, edges in self._waiting.items()}
+
+    def errors(self) -> list[str]:
+        if not self._waiting:
+            return []
+        errors: list[str] = []
+        for edge in self._edges.values():
+            if edge.from_id in self._waiting:
+                errors.append(f"edge {edge.id} has unknown from node {edge.from_id}")
+            if edge.to_id in self._waiting:
+                errors.append(f"edge {edge.id} has unknown to node {edge.to_id}")
+        return errors
+
+    def freeze(self) -> GraphPayload:
+        return GraphPayload.prevalidated(
+            run_meta=self.run_meta,
+            nodes=list(self._nodes.values()),
+            edges=list(self._edges.values()),
+            errors=self.errors(),
+        )
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from json.encoder import encode_basestring_ascii
+from typing import Any, TypeVar, overload
+
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta, SourceRef
+
+T = TypeVar("T")
+
+_encode = json.JSONEncoder(sort_keys=True).encode
+
+
+class StringTable:
+    """Dictionary encoding: each distinct string is stored once and addressed by code."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int | None:
+        return self._codes.get(value)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class _RowView(Sequence[T]):
+    """Read-only sequence that builds entity objects from columns on access."""
+
+    def __init__(self, column: array, factory: Callable[[int], T]) -> None:
+        self._column = column
+        self._factory = factory
+
+    def __len__(self) -> int:
+        return len(self._column)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self._factory(row) for row in range(len(self._column))[index]]
+        if index < 0:
+            index += len(self._column)
+        if not 0 <= index < len(self._column):
+            raise IndexError("row index out of range")
+        return self._factory(index)
+
+    def __iter__(self) -> Iterator[T]:
+        return map(self._factory, range(len(self._column)))
+
+
+class ColumnarGraph:
+    """Struct-of-arrays graph representation for very large payloads.
+
+    String columns (ids, types, canonical keys, labels, edge endpoints) are
+    dictionary-encoded into a shared ``StringTable`` and stored as ``array``
+    codes. Sources are deduplicated into ``sources`` and referenced per row in
+    CSR form; non-empty properties live in per-row side tables.
+    """
+
+    def __init__(self, run_meta: RunMeta) -> None:
+        self.run_meta = run_meta
+        self.strings = StringTable()
+        self.sources: list[SourceRef] = []
+        self._source_codes: dict[SourceRef, int] = {}
+
+        self.node_ids = array("I")
+        self.node_types = array("I")
+        self.node_keys = array("I")
+        self.node_labels = array("I")
+        self.node_source_offsets = array("I", [0])
+        self.node_source_refs = array("I")
+        self.node_properties: dict[int, dict[str, Any]] = {}
+
+        self.edge_ids = array("I")
+        self.edge_types = array("I")
+        self.edge_from = array("I")
+        self.edge_to = array("I")
+        self.edge_keys = array("I")
+        self.edge_source_offsets = array("I", [0])
+        self.edge_source_refs = array("I")
+        self.edge_properties: dict[int, dict[str, Any]] = {}
+
+    def _source_code(self, source: SourceRef) -> int:
+        code = self._source_codes.get(source)
+        if code is None:
+            code = self._source_codes[source] = len(self.sources)
+            self.sources.append(source)
+        return code
+
+    def add_node(self, node: Node) -> int:
+        code = self.strings.code
+        row = len(self.node_ids)
+        self.node_ids.append(code(node.id))
+        self.node_types.append(code(node.type))
+        self.node_keys.append(code(node.canonical_key))
+        self.node_labels.append(code(node.label))
+        self.node_source_refs.extend(self._source_code(s) for s in node.sources)
+        self.node_source_offsets.append(len(self.node_source_refs))
+        if node.properties:
+            self.node_properties[row] = node.properties
+        return row
+
+    def add_edge(self, edge: Edge) -> int:
+        code = self.strings.code
+        row = len(self.edge_ids)
+        self.edge_ids.append(code(edge.id))
+        self.edge_types.append(code(edge.type))
+        self.edge_from.append(code(edge.from_id))
+        self.edge_to.append(code(edge.to_id))
+        self.edge_keys.append(code(edge.canonical_key))
+        self.edge_source_refs.extend(self._source_code(s) for s in edge.sources)
+        self.edge_source_offsets.append(len(self.edge_source_refs))
+        if edge.properties:
+            self.edge_properties[row] = edge.properties
+        return row
+
+    @classmethod
+    def from_payload(cls, graph: GraphPayload) -> "ColumnarGraph":
+        columnar = cls(graph.run_meta)
+        for node in graph.nodes:
+            columnar.add_node(node)
+        for edge in graph.edges:
+            columnar.add_edge(edge)
+        return columnar
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ColumnarGraph":
+        columnar = cls(RunMeta.from_dict(data["run_meta"]))
+        for node in data.get("nodes", []):
+            columnar.add_node(Node.from_dict(node))
+        for edge in data.get("edges", []):
+            columnar.add_edge(Edge.from_dict(edge))
+        return columnar
+
+    def node(self, row: int) -> Node:
+        strings = self.strings.values
+        start, end = self.node_source_offsets[row], self.node_source_offsets[row + 1]
+        return Node(
+            id=strings[self.node_ids[row]],
+            type=strings[self.node_types[row]],
+            canonical_key=strings[self.node_keys[row]],
+            label=strings[self.node_labels[row]],
+            properties=self.node_properties.get(row, {}),
+            sources=[self.sources[code] for code in self.node_source_refs[start:end]],
+        )
+
+    def edge(self, row: int) -> Edge:
+        strings = self.strings.values
+        start, end = self.edge_source_offsets[row], self.edge_source_offsets[row + 1]
+        return Edge(
+            id=strings[self.edge_ids[row]],
+            type=strings[self.edge_types[row]],
+            from_id=strings[self.edge_from[row]],
+            to_id=strings[self.edge_to[row]],
+            canonical_key=strings[self.edge_keys[row]],
+            properties=self.edge_properties.get(row, {}),
+            sources=[self.sources[code] for code in self.edge_source_refs[start:end]],
+        )
+
+    def as_payload(self) -> GraphPayload:
+        """Expose the columns through the object API without copying them.
+
+        ``nodes`` and ``edges`` are read-only sequences that build each
+        ``Node``/``Edge`` on access.
+        """
+        return GraphPayload(
+            run_meta=self.run_meta,
+            nodes=_RowView(self.node_ids, self.node),  # type: ignore[arg-type]
+            edges=_RowView(self.edge_ids, self.edge),  # type: ignore[arg-type]
+        )
+
+    def validate(self) -> list[str]:
+        errors: list[str] = []
+        node_codes = set(self.node_ids)
+        if len(node_codes) != len(self.node_ids):
+            errors.append("node ids must be unique")
+
+        if len(set(self.edge_ids)) != len(self.edge_ids):
+            errors.append("edge ids must be unique")
+
+        if node_codes.issuperset(self.edge_from) and node_codes.issuperset(self.edge_to):
+            return errors
+
+        strings = self.strings.values
+        for row, (from_code, to_code) in enumerate(zip(self.edge_from, self.edge_to)):
+            if from_code not in node_codes:
+                errors.append(
+                    f"edge {strings[self.edge_ids[row]]} has unknown from node {strings[from_code]}"
+                )
+            if to_code not in node_codes:
+                errors.append(
+                    f"edge {strings[self.edge_ids[row]]} has unknown to node {strings[to_code]}"
+                )
+        return errors
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.as_payload().to_dict()
+
+    def _encoded_strings(self) -> list[str]:
+        return [encode_basestring_ascii(value) for value in self.strings.values]
+
+    def iter_maltego_entity_json(self) -> Iterator[str]:
+        """Yield Maltego entity records as JSON text straight from the columns.
+
+        Every distinct string is JSON-encoded once; the output matches
+        ``json.dumps(maltego_entity(node), sort_keys=True)`` byte for byte.
+        """
+        encoded = self._encoded_strings()
+        properties = self.node_properties
+        for row in range(len(self.node_ids)):
+            props = properties.get(row)
+            yield (
+                f'{{"canonical_key": {encoded[self.node_keys[row]]}, '
+                f'"id": {encoded[self.node_ids[row]]}, '
+                f'"properties": {_encode(props) if props else "{}"}, '
+                f'"type": {encoded[self.node_types[row]]}, '
+                f'"value": {encoded[self.node_labels[row]]}}}'
+            )
+
+    def iter_maltego_link_json(self) -> Iterator[str]:
+        encoded = self._encoded_strings()
+        properties = self.edge_properties
+        for row in range(len(self.edge_ids)):
+            props = properties.get(row)
+            yield (
+                f'{{"canonical_key": {encoded[self.edge_keys[row]]}, '
+                f'"from": {encoded[self.edge_from[row]]}, '
+                f'"id": {encoded[self.edge_ids[row]]}, '
+                f'"properties": {_encode(props) if props else "{}"}, '
+                f'"to": {encoded[self.edge_to[row]]}, '
+                f'"type": {encoded[self.edge_types[row]]}}}'
+            )
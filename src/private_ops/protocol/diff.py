@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from private_ops.adapters.ndjson import NdjsonGraphWriter
+from private_ops.protocol.graph_io import WRITE_BUFFER_BYTES
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta
+
+DELTA_KINDS = ("run_meta", "added", "removed", "changed")
+Record = tuple[str, dict[str, Any]]
+
+_encode = json.JSONEncoder(sort_keys=True, separators=(",", ":")).encode
+_MODELS: dict[str, type[Node] | type[Edge]] = {"node": Node, "edge": Edge}
+_HASH_LENGTH = 24
+
+
+def content_hash(data: dict[str, Any]) -> str:
+    """Hash of an entity's canonical JSON; equal hashes mean nothing changed."""
+    return hashlib.sha256(_encode(data).encode("utf-8")).hexdigest()[:_HASH_LENGTH]
+
+
+def _canonical(kind: str, data: dict[str, Any]) -> dict[str, Any]:
+    return _MODELS[kind].from_dict(data).to_dict()
+
+
+def iter_payload_records(graph: GraphPayload) -> Iterator[Record]:
+    """Yield a graph as ``(kind, data)`` records, like ``iter_graph_records`` does for files."""
+    yield "run_meta", graph.run_meta.to_dict()
+    for node in graph.nodes:
+        yield "node", node.to_dict()
+    for edge in graph.edges:
+        yield "edge", edge.to_dict()
+
+
+@dataclass
+class DeltaSummary:
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+        }
+
+
+def _change(
+    kind: str, old: dict[str, Any], new: dict[str, Any], old_hash: str, new_hash: str
+) -> dict[str, Any]:
+    fields = {
+        key: value
+        for key, value in new.items()
+        if key not in ("id", "properties") and old.get(key) != value
+    }
+    old_props, new_props = old["properties"], new["properties"]
+    return {
+        "kind": kind,
+        "id": new["id"],
+        "base_hash": old_hash,
+        "hash": new_hash,
+        "fields": fields,
+        "set": {k: v for k, v in new_props.items() if k not in old_props or old_props[k] != v},
+        "unset": sorted(k for k in old_props if k not in new_props),
+    }
+
+
+def iter_delta(
+    base: Iterable[Record],
+    target: Iterable[Record],
+    summary: DeltaSummary | None = None,
+) -> Iterator[Record]:
+    """Yield the delta that turns ``base`` into ``target``, matched by stable id.
+
+    Only ``base`` is held in memory; ``target`` is streamed. ``added``
+    records carry the whole entity, ``changed`` records the top-level fields
+    and properties that differ, and ``changed``/``removed`` records the
+    ``base_hash`` that ``apply_delta`` checks before patching. The target's
+    ``run_meta`` is passed through. Removals come last.
+    """
+    summary = summary if summary is not None else DeltaSummary()
+    entities: dict[tuple[str, str], dict[str, Any]] = {}
+    for kind, data in base:
+        if kind in _MODELS:
+            entities[(kind, str(data["id"]))] = _canonical(kind, data)
+
+    seen: set[tuple[str, str]] = set()
+    for kind, data in target:
+        if kind == "run_meta":
+            yield kind, data
+            continue
+        if kind not in _MODELS:
+            continue
+        new = _canonical(kind, data)
+        key = (kind, new["id"])
+        if key in seen:
+            raise ValueError(f"duplicate {kind} id {new['id']} in target graph")
+        seen.add(key)
+        old = entities.pop(key, None)
+        if old is None:
+            summary.added += 1
+            yield "added", {"kind": kind, "entity": new}
+            continue
+        old_hash, new_hash = content_hash(old), content_hash(new)
+        if old_hash == new_hash:
+            summary.unchanged += 1
+            continue
+        summary.changed += 1
+        yield "changed", _change(kind, old, new, old_hash, new_hash)
+
+    for (kind, entity_id), old in entities.items():
+        summary.removed += 1
+        yield "removed", {"kind": kind, "id": entity_id, "base_hash": content_hash(old)}
+
+
+def diff_graphs(base: GraphPayload, target: GraphPayload) -> list[Record]:
+    return list(iter_delta(iter_payload_records(base), iter_payload_records(target)))
+
+
+def apply_delta(base: GraphPayload, delta: Iterable[Record]) -> GraphPayload:
+    """Patch ``base`` with a delta from ``iter_delta``.
+
+    Raises ``ValueError`` when the delta does not fit ``base``: an entity it
+    changes or removes is missing or has a different content hash, or an
+    added entity already exists with different content. Entities keep their
+    order in ``base``; added ones are appended.
+    """
+    run_meta = base.run_meta
+    entities: dict[str, dict[str, dict[str, Any]]] = {
+        "node": {node.id: node.to_dict() for node in base.nodes},
+        "edge": {edge.id: edge.to_dict() for edge in base.edges},
+    }
+    for record_type, data in delta:
+        if record_type == "run_meta":
+            run_meta = RunMeta.from_dict(data)
+            continue
+        if record_type not in DELTA_KINDS:
+            raise ValueError(f"unknown delta record type '{record_type}'")
+        kind = data["kind"]
+        if kind not in _MODELS:
+            raise ValueError(f"unknown delta entity kind '{kind}'")
+        current = entities[kind]
+
+        if record_type == "added":
+            entity = _canonical(kind, data["entity"])
+            existing = current.get(entity["id"])
+            if existing is not None and content_hash(existing) != content_hash(entity):
+                raise ValueError(f"added {kind} {entity['id']} already exists with other content")
+            current[entity["id"]] = entity
+            continue
+
+        entity_id = data["id"]
+        existing = current.get(entity_id)
+        if existing is None:
+            raise ValueError(f"{record_type} {kind} {entity_id} is not in the base graph")
+        if content_hash(existing) != data["base_hash"]:
+            raise ValueError(f"{kind} {entity_id} in the base graph does not match the delta")
+        if record_type == "removed":
+            del current[entity_id]
+            continue
+
+        properties = dict(existing["properties"])
+        properties.update(data.get("set", {}))
+        for key in data.get("unset", ()):
+            properties.pop(key, None)
+        patched = {**existing, **data.get("fields", {}), "properties": properties}
+        if content_hash(patched) != data["hash"]:
+            raise ValueError(f"patched {kind} {entity_id} does not match the delta's hash")
+        current[entity_id] = patched
+
+    return GraphPayload(
+        run_meta=run_meta,
+        nodes=[Node.from_dict(data) for data in entities["node"].values()],
+        edges=[Edge.from_dict(data) for data in entities["edge"].values()],
+    )
+
+
+def write_delta(records: Iterable[Record], path: str | Path) -> int:
+    """Write delta records as NDJSON; returns how many were written."""
+    with Path(path).open("w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as handle:
+        with NdjsonGraphWriter(handle) as writer:
+            for record_type, data in records:
+                writer.write_record(record_type, data)
+        return writer.records_written
+
+
+def read_delta(path: str | Path) -> Iterator[Record]:
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield record["type"], record["data"]
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(f"{path}:{number}: invalid delta record: {exc}") from None
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+from private_ops.adapters.ndjson import NdjsonGraphWriter
+from private_ops.protocol.binary import (
+    BinaryGraphReader,
+    is_binary,
+    read_binary_graph,
+    write_binary_graph,
+)
+from private_ops.protocol.columnar import ColumnarGraph
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta
+from private_ops.telemetry import span
+
+WRITE_BUFFER_BYTES = 1 << 20
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def is_ndjson(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in NDJSON_SUFFIXES
+
+
+GRAPH_KINDS = ("run_meta", "node", "edge")
+NumberedRecord = tuple[int, str, dict[str, Any]]
+_ITEM_KINDS = {"nodes": "node", "edges": "edge"}
+_WHITESPACE = " \t\n\r"
+
+
+class _JsonStream:
+    """Pull-based reader over one JSON document that never holds all of it.
+
+    Values are decoded with ``raw_decode`` one at a time from a sliding
+    buffer, so memory is bounded by the largest single node/edge (or other
+    skipped element), not by the document.
+    """
+
+    def __init__(self, handle: TextIO, chunk_size: int = 1 << 20) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._line = 1
+        self._line_pos = 0
+        self._decode = json.JSONDecoder().raw_decode
+
+    @property
+    def line(self) -> int:
+        self._line += self._buffer.count("\n", self._line_pos, self._pos)
+        self._line_pos = self._pos
+        return self._line
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        self._line += self._buffer.count("\n", self._line_pos, self._pos)
+        chunk = self._handle.read(size)
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = self._line_pos = 0
+        if not chunk:
+            self._eof = True
+        return bool(chunk)
+
+    def peek(self) -> str:
+        while True:
+            buffer, pos = self._buffer, self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"line {self.line}: expected {char!r}")
+        self._pos += 1
+
+    def accept(self, char: str) -> bool:
+        if self.peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+    def value(self) -> Any:
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                if not self._fill(size):
+                    raise ValueError(f"line {self.line}: {exc.msg}") from None
+                size *= 2
+                continue
+            # A number may continue past the end of the buffer.
+            if end == len(self._buffer) and not self._eof and self._fill(size):
+                continue
+            self._pos = end
+            return value
+
+    def items(self) -> Iterator[tuple[int, Any]]:
+        """Yield ``(line, element)`` for the array at the cursor."""
+        self.expect("[")
+        if self.accept("]"):
+            return
+        while True:
+            self.peek()
+            line = self.line
+            yield line, self.value()
+            if self.accept("]"):
+                return
+            self.expect(",")
+
+    def skip(self) -> None:
+        char = self.peek()
+        if char == "{":
+            for _ in self.members():
+                self.skip()
+        elif char == "[":
+            for _ in self.items():
+                pass
+        else:
+            self.value()
+
+    def members(self) -> Iterator[str]:
+        """Yield each key of the object at the cursor; the caller consumes its value."""
+        self.expect("{")
+        if self.accept("}"):
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.accept("}"):
+                return
+            self.expect(",")
+
+
+def _graph_object(stream: _JsonStream) -> Iterator[NumberedRecord]:
+    for key in stream.members():
+        if key in _ITEM_KINDS and stream.peek() == "[":
+            kind = _ITEM_KINDS[key]
+            for line, item in stream.items():
+                yield line, kind, item
+        elif key == "run_meta":
+            line = stream.line
+            yield line, "run_meta", stream.value()
+        elif key == "graph" and stream.peek() == "{":
+            yield from _graph_object(stream)
+        else:
+            stream.skip()
+
+
+def _graph_records(graph: dict[str, Any], line: int) -> Iterator[NumberedRecord]:
+    if "run_meta" in graph:
+        yield line, "run_meta", graph["run_meta"]
+    for node in graph.get("nodes", []):
+        yield line, "node", node
+    for edge in graph.get("edges", []):
+        yield line, "edge", edge
+
+
+def _line_records(record: Any, line: int) -> Iterator[NumberedRecord]:
+    if not isinstance(record, dict):
+        raise ValueError(f"line {line}: expected a JSON object")
+    kind = record.get("type")
+    if kind in GRAPH_KINDS:
+        yield line, kind, record["data"]
+    elif "graph" in record and record["graph"]:
+        yield from _graph_records(record["graph"], line)
+
+
+def iter_numbered_records(
+    path: str | Path,
+    *,
+    on_error: Callable[[int, str], None] | None = None,
+) -> Iterator[NumberedRecord]:
+    """Yield ``(line, kind, data)`` for a JSON or NDJSON graph file.
+
+    JSON documents (a graph, a ``TransformResponse`` or an array of NDJSON
+    style records) are parsed incrementally. ``line`` is where the record
+    starts. Unparseable NDJSON lines raise ``ValueError`` unless ``on_error``
+    is given, in which case it receives ``(line, message)`` and reading goes on.
+    """
+    with Path(path).open("r", encoding="utf-8") as handle:
+        if not is_ndjson(path):
+            stream = _JsonStream(handle)
+            char = stream.peek()
+            if char == "{":
+                yield from _graph_object(stream)
+            elif char == "[":
+                for line, record in stream.items():
+                    yield from _line_records(record, line)
+            else:
+                raise ValueError(f"{path}: expected a JSON object or array")
+            return
+
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield from _line_records(record, number)
+            except (ValueError, KeyError) as exc:
+                message = f"invalid record: {exc}"
+                if on_error is None:
+                    raise ValueError(f"{path}:{number}: {message}") from None
+                on_error(number, message)
+
+
+def iter_graph_records(path: str | Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield ``(kind, data)`` records for ``run_meta``, ``node`` and ``edge``.
+
+    Accepts a graph or ``TransformResponse`` JSON document, the
+    ``run-transform --ndjson`` record stream, ``run-batch`` response lines,
+    or a ``.pogb`` binary graph.
+    """
+    if is_binary(path):
+        with BinaryGraphReader(path) as reader:
+            graph = reader.as_payload()
+            yield "run_meta", graph.run_meta.to_dict()
+            for node in graph.nodes:
+                yield "node", node.to_dict()
+            for edge in graph.edges:
+                yield "edge", edge.to_dict()
+        return
+
+    for _, kind, data in iter_numbered_records(path):
+        yield kind, data
+
+
+def _default_run_meta(path: str | Path) -> RunMeta:
+    return RunMeta(run_id=f"file:{Path(path).name}", transform="unknown")
+
+
+def read_graph(path: str | Path) -> GraphPayload:
+    if is_binary(path):
+        return read_binary_graph(path)
+    run_meta: RunMeta | None = None
+    nodes: list[Node] = []
+    edges: list[Edge] = []
+    for kind, data in iter_graph_records(path):
+        if kind == "node":
+            nodes.append(Node.from_dict(data))
+        elif kind == "edge":
+            edges.append(Edge.from_dict(data))
+        elif run_meta is None:
+            run_meta = RunMeta.from_dict(data)
+    if run_meta is None:
+        run_meta = _default_run_meta(path)
+    return GraphPayload(run_meta=run_meta, nodes=nodes, edges=edges)
+
+
+def read_columnar(path: str | Path) -> ColumnarGraph:
+    """Like ``read_graph`` but keeps only the columns, not one object per entity."""
+    columnar: ColumnarGraph | None = None
+    for kind, data in iter_graph_records(path):
+        if kind == "run_meta":
+            if columnar is None:
+                columnar = ColumnarGraph(RunMeta.from_dict(data))
+            continue
+        if columnar is None:
+            columnar = ColumnarGraph(_default_run_meta(path))
+        if kind == "node":
+            columnar.add_node(Node.from_dict(data))
+        else:
+            columnar.add_edge(Edge.from_dict(data))
+    return columnar if columnar is not None else ColumnarGraph(_default_run_meta(path))
+
+
+def _format(path: str | Path) -> str:
+    if is_binary(path):
+        return "binary"
+    return "ndjson" if is_ndjson(path) else "json"
+
+
+def write_json_stream(
+    handle: TextIO, run_meta: RunMeta, nodes: Iterable[Node], edges: Iterable[Edge]
+) -> None:
+    """Write a graph JSON document one node or edge per line, without holding them.
+
+    Members keep ``GraphPayload.to_dict`` order (run_meta, nodes, edges)
+    rather than sorted order, so a streaming reader sees nodes before the
+    edges that name them.
+    """
+    handle.write('{"run_meta": ' + json.dumps(run_meta.to_dict(), sort_keys=True))
+    for key, items in (("nodes", nodes), ("edges", edges)):
+        handle.write(f', "{key}": [')
+        separator = "\n"
+        for item in items:
+            handle.write(separator + json.dumps(item.to_dict(), sort_keys=True))
+            separator = ",\n"
+        handle.write("\n]")
+    handle.write("}\n")
+
+
+def write_graph(graph: GraphPayload, path: str | Path) -> None:
+    """Write a graph as JSON, as NDJSON records (``.ndjson``) or as binary (``.pogb``)."""
+    with span("write", path=str(path), format=_format(path)):
+        if is_binary(path):
+            write_binary_graph(graph, path)
+            return
+        with Path(path).open("w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as handle:
+            if is_ndjson(path):
+                with NdjsonGraphWriter(handle) as writer:
+                    writer.write_graph(graph, graph.validate())
+            else:
+                json.dump(graph.to_dict(), handle, indent=2, sort_keys=True)
@@ -1,21 +1,40 @@
 from __future__ import annotations
 
 import hashlib
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+ID_CACHE_SIZE = 1 << 16
+_HEX_LENGTH = 24
+
+
+def _update(hasher: Any, part: str) -> None:
+    encoded = part.encode("utf-8")
+    hasher.update(len(encoded).to_bytes(4, byteorder="big"))
+    hasher.update(encoded)
 
 
 def _stable_hash(parts: tuple[str, ...]) -> str:
     hasher = hashlib.sha256()
     for part in parts:
-        encoded = part.encode("utf-8")
-        hasher.update(len(encoded).to_bytes(4, byteorder="big"))
-        hasher.update(encoded)
-    return hasher.hexdigest()[:24]
+        _update(hasher, part)
+    return hasher.hexdigest()[:_HEX_LENGTH]
 
 
+def _seeded_hasher(*prefix: str) -> Any:
+    hasher = hashlib.sha256()
+    for part in prefix:
+        _update(hasher, part)
+    return hasher
+
+
+@lru_cache(maxsize=ID_CACHE_SIZE)
 def node_id(entity_type: str, canonical_key: str) -> str:
     return f"n_{_stable_hash(('node', entity_type, canonical_key))}"
 
 
+@lru_cache(maxsize=ID_CACHE_SIZE)
 def edge_id(
     edge_type: str,
     from_node_id: str,
@@ -23,3 +42,42 @@ def edge_id(
     canonical_key: str,
 ) -> str:
     return f"e_{_stable_hash(('edge', edge_type, from_node_id, to_node_id, canonical_key))}"
+
+
+def node_ids(items: Iterable[tuple[str, str]]) -> list[str]:
+    """Compute ``node_id`` for many ``(entity_type, canonical_key)`` pairs.
+
+    The hasher state for each distinct entity type is seeded once and copied
+    per item, which skips re-hashing the shared prefix.
+    """
+    seeds: dict[str, Any] = {}
+    result: list[str] = []
+    for entity_type, canonical_key in items:
+        seed = seeds.get(entity_type)
+        if seed is None:
+            seed = seeds[entity_type] = _seeded_hasher("node", entity_type)
+        hasher = seed.copy()
+        _update(hasher, canonical_key)
+        result.append(f"n_{hasher.hexdigest()[:_HEX_LENGTH]}")
+    return result
+
+
+def edge_ids(items: Iterable[tuple[str, str, str, str]]) -> list[str]:
+    """Compute ``edge_id`` for many ``(edge_type, from_id, to_id, canonical_key)`` tuples."""
+    seeds: dict[str, Any] = {}
+    result: list[str] = []
+    for edge_type, from_node_id, to_node_id, canonical_key in items:
+        seed = seeds.get(edge_type)
+        if seed is None:
+            seed = seeds[edge_type] = _seeded_hasher("edge", edge_type)
+        hasher = seed.copy()
+        _update(hasher, from_node_id)
+        _update(hasher, to_node_id)
+        _update(hasher, canonical_key)
+        result.append(f"e_{hasher.hexdigest()[:_HEX_LENGTH]}")
+    return result
+
+
+def clear_id_cache() -> None:
+    node_id.cache_clear()
+    edge_id.cache_clear()
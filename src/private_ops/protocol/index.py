@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Collection, Iterable, Iterator
+
+from private_ops.protocol.builder import merge_entity
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta
+
+DIRECTIONS = ("out", "in", "both")
+
+# node id -> edge type -> edge id -> edge; the inner dicts keep insertion order.
+_Adjacency = dict[str, dict[str, dict[str, Edge]]]
+
+
+def _check_direction(direction: str) -> None:
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of out/in/both, got '{direction}'")
+
+
+class GraphIndex:
+    """In-memory indexes over a graph for lookups without scanning it.
+
+    Edges are kept in per-node adjacency maps in both directions, grouped by
+    edge type, next to by-type and by-``canonical_key`` node maps. Neighbour,
+    k-hop, shortest-path and subgraph queries touch only the edges they
+    follow. ``add_graph`` merges new transform results in place with the
+    ``GraphBuilder`` rules; every change bumps ``version``. ``version``
+    counts changes to this index only, so cache keys built from it must
+    also identify the index (``ContextPacker.pack`` keys on both).
+    """
+
+    def __init__(self, graph: GraphPayload | None = None) -> None:
+        self._nodes: dict[str, Node] = {}
+        self._edges: dict[str, Edge] = {}
+        self._out: _Adjacency = {}
+        self._in: _Adjacency = {}
+        self._by_type: dict[str, dict[str, None]] = {}
+        self._by_key: dict[str, dict[str, None]] = {}
+        self.version = 0
+        if graph is not None:
+            self.add_graph(graph)
+
+    def __len__(self) -> int:
+        return len(self._nodes) + len(self._edges)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._nodes or entity_id in self._edges
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    def nodes(self) -> list[Node]:
+        return list(self._nodes.values())
+
+    def edges(self) -> list[Edge]:
+        return list(self._edges.values())
+
+    def add_node(self, node: Node) -> Node:
+        existing = self._nodes.get(node.id)
+        if existing is not None:
+            node = merge_entity(existing, node)
+        else:
+            self._by_type.setdefault(node.type, {})[node.id] = None
+            self._by_key.setdefault(node.canonical_key, {})[node.id] = None
+        self._nodes[node.id] = node
+        self.version += 1
+        return node
+
+    def add_edge(self, edge: Edge) -> Edge:
+        existing = self._edges.get(edge.id)
+        if existing is not None:
+            edge = merge_entity(existing, edge)
+        self._edges[edge.id] = edge
+        self._out.setdefault(edge.from_id, {}).setdefault(edge.type, {})[edge.id] = edge
+        self._in.setdefault(edge.to_id, {}).setdefault(edge.type, {})[edge.id] = edge
+        self.version += 1
+        return edge
+
+    def add_graph(self, graph: GraphPayload) -> None:
+        for node in graph.nodes:
+            self.add_node(node)
+        for edge in graph.edges:
+            self.add_edge(edge)
+
+    def remove_edge(self, edge_id: str) -> Edge | None:
+        edge = self._edges.pop(edge_id, None)
+        if edge is None:
+            return None
+        for adjacency, endpoint in ((self._out, edge.from_id), (self._in, edge.to_id)):
+            by_type = adjacency[endpoint]
+            del by_type[edge.type][edge_id]
+            if not by_type[edge.type]:
+                del by_type[edge.type]
+            if not by_type:
+                del adjacency[endpoint]
+        self.version += 1
+        return edge
+
+    def remove_node(self, node_id: str) -> Node | None:
+        """Remove a node together with every edge that touches it."""
+        node = self._nodes.pop(node_id, None)
+        if node is None:
+            return None
+        for edge in list(self._iter_edges(node_id, "both", None)):
+            self.remove_edge(edge.id)
+        for index, key in ((self._by_type, node.type), (self._by_key, node.canonical_key)):
+            del index[key][node_id]
+            if not index[key]:
+                del index[key]
+        self.version += 1
+        return node
+
+    def get_node(self, entity_id: str) -> Node | None:
+        return self._nodes.get(entity_id)
+
+    def get_edge(self, entity_id: str) -> Edge | None:
+        return self._edges.get(entity_id)
+
+    def nodes_by_type(self, entity_type: str) -> list[Node]:
+        return [self._nodes[node_id] for node_id in self._by_type.get(entity_type, ())]
+
+    def nodes_by_canonical_key(self, canonical_key: str) -> list[Node]:
+        return [self._nodes[node_id] for node_id in self._by_key.get(canonical_key, ())]
+
+    def find_node(self, entity_type: str, canonical_key: str) -> Node | None:
+        for node in self.nodes_by_canonical_key(canonical_key):
+            if node.type == entity_type:
+                return node
+        return None
+
+    def _iter_edges(
+        self,
+        entity_id: str,
+        direction: str,
+        edge_types: Collection[str] | None,
+    ) -> Iterator[Edge]:
+        sides = {"out": (self._out,), "in": (self._in,), "both": (self._out, self._in)}
+        for adjacency in sides[direction]:
+            by_type = adjacency.get(entity_id)
+            if not by_type:
+                continue
+            if edge_types is None:
+                for edges in by_type.values():
+                    yield from edges.values()
+            else:
+                for edge_type in edge_types:
+                    yield from by_type.get(edge_type, {}).values()
+
+    def edges_of(
+        self,
+        entity_id: str,
+        *,
+        direction: str = "both",
+        edge_types: Collection[str] | None = None,
+    ) -> list[Edge]:
+        _check_direction(direction)
+        edges = self._iter_edges(entity_id, direction, edge_types)
+        if direction != "both":
+            return list(edges)
+        # A self-loop sits in both maps; list it once.
+        return list({edge.id: edge for edge in edges}.values())
+
+    def _steps(
+        self,
+        entity_id: str,
+        direction: str,
+        edge_types: Collection[str] | None,
+    ) -> Iterator[tuple[Edge, str]]:
+        for edge in self._iter_edges(entity_id, direction, edge_types):
+            yield edge, edge.to_id if edge.from_id == entity_id else edge.from_id
+
+    def neighbors(
+        self,
+        entity_id: str,
+        *,
+        direction: str = "both",
+        edge_types: Collection[str] | None = None,
+    ) -> list[Node]:
+        _check_direction(direction)
+        seen: dict[str, None] = {}
+        for _, other in self._steps(entity_id, direction, edge_types):
+            if other in self._nodes:
+                seen.setdefault(other)
+        return [self._nodes[node_id] for node_id in seen]
+
+    def k_hop(
+        self,
+        seeds: Iterable[str],
+        hops: int,
+        *,
+        direction: str = "both",
+        edge_types: Collection[str] | None = None,
+        node_types: Collection[str] | None = None,
+    ) -> dict[str, int]:
+        """Node id -> hop distance for nodes within ``hops`` of ``seeds``.
+
+        Traversal follows ``edge_types`` (all when ``None``) through any
+        node; ``node_types`` only filters what is returned, so "phones within
+        two hops" is ``k_hop([x], 2, node_types={"phone"})``.
+        """
+        _check_direction(direction)
+        if hops < 0:
+            raise ValueError("hops must be >= 0")
+        distances = {node_id: 0 for node_id in seeds if node_id in self._nodes}
+        frontier = deque(distances)
+        while frontier:
+            current = frontier.popleft()
+            depth = distances[current]
+            if depth == hops:
+                continue
+            for _, other in self._steps(current, direction, edge_types):
+                if other not in distances and other in self._nodes:
+                    distances[other] = depth + 1
+                    frontier.append(other)
+        if node_types is None:
+            return distances
+        return {
+            node_id: depth
+            for node_id, depth in distances.items()
+            if self._nodes[node_id].type in node_types
+        }
+
+    def shortest_path(
+        self,
+        from_id: str,
+        to_id: str,
+        *,
+        direction: str = "both",
+        edge_types: Collection[str] | None = None,
+        max_hops: int | None = None,
+    ) -> list[Edge] | None:
+        """Edges of a fewest-hop path, ``[]`` when the ids match, ``None`` if unreachable.
+
+        Searches breadth-first from both ends at once, expanding the
+        smaller frontier each round.
+        """
+        _check_direction(direction)
+        if from_id not in self._nodes or to_id not in self._nodes:
+            return None
+        if from_id == to_id:
+            return []
+        backward_direction = {"out": "in", "in": "out", "both": "both"}[direction]
+        # node id -> (edge reached by, previous node id) for each search side.
+        forward: dict[str, tuple[Edge, str] | None] = {from_id: None}
+        backward: dict[str, tuple[Edge, str] | None] = {to_id: None}
+        forward_frontier, backward_frontier = [from_id], [to_id]
+        hops = 0
+        while forward_frontier and backward_frontier:
+            if max_hops is not None and hops >= max_hops:
+                return None
+            hops += 1
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, parents, others, step = forward_frontier, forward, backward, direction
+            else:
+                frontier, parents, others, step = (
+                    backward_frontier, backward, forward, backward_direction
+                )
+            next_frontier: list[str] = []
+            for current in frontier:
+                for edge, other in self._steps(current, step, edge_types):
+                    if other in parents or other not in self._nodes:
+                        continue
+                    parents[other] = (edge, current)
+                    if other in others:
+                        return self._join(forward, backward, other)
+                    next_frontier.append(other)
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        return None
+
+    @staticmethod
+    def _join(
+        forward: dict[str, tuple[Edge, str] | None],
+        backward: dict[str, tuple[Edge, str] | None],
+        meeting: str,
+    ) -> list[Edge]:
+        path: list[Edge] = []
+        node = meeting
+        while (step := forward[node]) is not None:
+            path.append(step[0])
+            node = step[1]
+        path.reverse()
+        node = meeting
+        while (step := backward[node]) is not None:
+            path.append(step[0])
+            node = step[1]
+        return path
+
+    def subgraph(
+        self,
+        node_ids: Iterable[str],
+        run_meta: RunMeta,
+        *,
+        edge_types: Collection[str] | None = None,
+    ) -> GraphPayload:
+        """Induced subgraph: the given nodes and every edge between two of them."""
+        nodes = {node_id: self._nodes[node_id] for node_id in node_ids if node_id in self._nodes}
+        edges = [
+            edge
+            for node_id in nodes
+            for edge in self._iter_edges(node_id, "out", edge_types)
+            if edge.to_id in nodes
+        ]
+        return GraphPayload(run_meta=run_meta, nodes=list(nodes.values()), edges=edges)
+
+    def to_graph(self, run_meta: RunMeta) -> GraphPayload:
+        return GraphPayload(run_meta=run_meta, nodes=self.nodes(), edges=self.edges())
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from private_ops.protocol.builder import GraphBuilder, merge_entity
+from private_ops.protocol.graph_io import iter_graph_records
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta
+
+_encode = json.JSONEncoder(sort_keys=True).encode
+
+
+def merge_graphs(graphs: Iterable[GraphPayload], run_meta: RunMeta) -> GraphPayload:
+    """Merge graphs in memory, deduplicating by stable id."""
+    builder = GraphBuilder(run_meta)
+    for graph in graphs:
+        builder.merge_graph(graph)
+    return builder.freeze()
+
+
+class SpillingMerger:
+    """Stream-merge graph records whose union may not fit in memory.
+
+    Incoming nodes and edges are hash-partitioned by id into spill files on
+    disk. ``iter_nodes``/``iter_edges`` then merge one partition at a time, so peak memory
+    is bounded by the largest partition instead of the whole input. Records
+    are merged with the same rules as ``GraphBuilder``.
+    """
+
+    def __init__(self, spill_dir: str | Path | None = None, *, partitions: int = 64) -> None:
+        if partitions < 1:
+            raise ValueError("partitions must be >= 1")
+        self._owns_dir = spill_dir is None
+        if spill_dir is None:
+            spill_dir = tempfile.mkdtemp(prefix="private-ops-merge-")
+        self._dir = Path(spill_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._partitions = partitions
+        self._handles: dict[tuple[str, int], IO[str]] = {}
+        self.run_metas: list[RunMeta] = []
+        self.records_in = 0
+
+    def _partition(self, entity_id: str) -> int:
+        return zlib.crc32(entity_id.encode("utf-8")) % self._partitions
+
+    def _spill_path(self, kind: str, partition: int) -> Path:
+        return self._dir / f"{kind}-{partition:05d}.ndjson"
+
+    def add_record(self, kind: str, data: dict[str, Any]) -> None:
+        if kind == "run_meta":
+            self.run_metas.append(RunMeta.from_dict(data))
+            return
+        if kind not in ("node", "edge"):
+            raise ValueError(f"cannot merge record of type '{kind}'")
+        key = (kind, self._partition(str(data["id"])))
+        handle = self._handles.get(key)
+        if handle is None:
+            handle = self._handles[key] = self._spill_path(*key).open("w", encoding="utf-8")
+        handle.write(_encode(data) + "\n")
+        self.records_in += 1
+
+    def add_graph(self, graph: GraphPayload) -> None:
+        self.run_metas.append(graph.run_meta)
+        for node in graph.nodes:
+            self.add_record("node", node.to_dict())
+        for edge in graph.edges:
+            self.add_record("edge", edge.to_dict())
+
+    def add_file(self, path: str | Path) -> None:
+        for kind, data in iter_graph_records(path):
+            self.add_record(kind, data)
+
+    def _merged_partition(self, kind: str, partition: int) -> Iterator[Node | Edge]:
+        if (kind, partition) not in self._handles:
+            return
+        path = self._spill_path(kind, partition)
+        parse = Node.from_dict if kind == "node" else Edge.from_dict
+        merged: dict[str, Any] = {}
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                entity = parse(json.loads(line))
+                existing = merged.get(entity.id)
+                merged[entity.id] = entity if existing is None else merge_entity(existing, entity)
+        yield from merged.values()
+
+    def iter_nodes(self) -> Iterator[Node]:
+        self._flush()
+        for partition in range(self._partitions):
+            yield from self._merged_partition("node", partition)  # type: ignore[misc]
+
+    def iter_edges(self) -> Iterator[Edge]:
+        self._flush()
+        for partition in range(self._partitions):
+            yield from self._merged_partition("edge", partition)  # type: ignore[misc]
+
+    def to_graph(self, run_meta: RunMeta) -> GraphPayload:
+        return GraphPayload(
+            run_meta=run_meta,
+            nodes=list(self.iter_nodes()),
+            edges=list(self.iter_edges()),
+        )
+
+    def _flush(self) -> None:
+        for handle in self._handles.values():
+            handle.flush()
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+        if self._owns_dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self) -> "SpillingMerger":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Any
 
+from private_ops.telemetry import span
 
-@dataclass(frozen=True)
+SOURCE_POOL_LIMIT = 1 << 16
+_intern = sys.intern
+
+
+@dataclass(frozen=True, slots=True)
 class SourceRef:
     source_id: str
     title: str
@@ -19,9 +25,26 @@ class SourceRef:
             "confidence": self.confidence,
         }
 
+    @classmethod
+    def shared(
+        cls,
+        source_id: str,
+        title: str,
+        url: str = "",
+        confidence: float = 1.0,
+    ) -> "SourceRef":
+        """Return a pooled instance so identical sources share one object."""
+        ref = cls(source_id=source_id, title=title, url=url, confidence=confidence)
+        pooled = _SOURCE_POOL.get(ref)
+        if pooled is not None:
+            return pooled
+        if len(_SOURCE_POOL) < SOURCE_POOL_LIMIT:
+            _SOURCE_POOL[ref] = ref
+        return ref
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "SourceRef":
-        return cls(
+        return cls.shared(
             source_id=str(data["source_id"]),
             title=str(data["title"]),
             url=str(data.get("url", "")),
@@ -29,7 +52,14 @@ class SourceRef:
         )
 
 
-@dataclass(frozen=True)
+_SOURCE_POOL: dict[SourceRef, SourceRef] = {}
+
+
+def clear_source_pool() -> None:
+    _SOURCE_POOL.clear()
+
+
+@dataclass(frozen=True, slots=True)
 class Node:
     id: str
     type: str
@@ -51,16 +81,16 @@ class Node:
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Node":
         return cls(
-            id=str(data["id"]),
-            type=str(data["type"]),
-            canonical_key=str(data["canonical_key"]),
+            id=_intern(str(data["id"])),
+            type=_intern(str(data["type"])),
+            canonical_key=_intern(str(data["canonical_key"])),
             label=str(data["label"]),
             properties=dict(data.get("properties", {})),
             sources=[SourceRef.from_dict(s) for s in data.get("sources", [])],
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Edge:
     id: str
     type: str
@@ -84,17 +114,17 @@ class Edge:
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Edge":
         return cls(
-            id=str(data["id"]),
-            type=str(data["type"]),
-            from_id=str(data["from"]),
-            to_id=str(data["to"]),
-            canonical_key=str(data["canonical_key"]),
+            id=_intern(str(data["id"])),
+            type=_intern(str(data["type"])),
+            from_id=_intern(str(data["from"])),
+            to_id=_intern(str(data["to"])),
+            canonical_key=_intern(str(data["canonical_key"])),
             properties=dict(data.get("properties", {})),
             sources=[SourceRef.from_dict(s) for s in data.get("sources", [])],
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RunMeta:
     run_id: str
     transform: str
@@ -119,28 +149,53 @@ class RunMeta:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GraphPayload:
     run_meta: RunMeta
     nodes: list[Node] = field(default_factory=list)
     edges: list[Edge] = field(default_factory=list)
+    _known_errors: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    @classmethod
+    def prevalidated(
+        cls,
+        run_meta: RunMeta,
+        nodes: list[Node],
+        edges: list[Edge],
+        errors: list[str],
+    ) -> "GraphPayload":
+        """Build a payload whose validation result is already known.
+
+        Used by builders that validate while assembling; ``validate`` then
+        returns ``errors`` instead of rescanning. Callers must not mutate the
+        node/edge lists afterwards.
+        """
+        graph = cls(run_meta=run_meta, nodes=nodes, edges=edges)
+        object.__setattr__(graph, "_known_errors", tuple(errors))
+        return graph
 
     def validate(self) -> list[str]:
-        errors: list[str] = []
-        node_ids = {node.id for node in self.nodes}
-        if len(node_ids) != len(self.nodes):
-            errors.append("node ids must be unique")
-
-        edge_ids = {edge.id for edge in self.edges}
-        if len(edge_ids) != len(self.edges):
-            errors.append("edge ids must be unique")
-
-        for edge in self.edges:
-            if edge.from_id not in node_ids:
-                errors.append(f"edge {edge.id} has unknown from node {edge.from_id}")
-            if edge.to_id not in node_ids:
-                errors.append(f"edge {edge.id} has unknown to node {edge.to_id}")
-        return errors
+        if self._known_errors is not None:
+            return list(self._known_errors)
+
+        with span("validate", nodes=len(self.nodes), edges=len(self.edges)):
+            errors: list[str] = []
+            node_ids = {node.id for node in self.nodes}
+            if len(node_ids) != len(self.nodes):
+                errors.append("node ids must be unique")
+
+            edge_ids = {edge.id for edge in self.edges}
+            if len(edge_ids) != len(self.edges):
+                errors.append("edge ids must be unique")
+
+            for edge in self.edges:
+                if edge.from_id not in node_ids:
+                    errors.append(f"edge {edge.id} has unknown from node {edge.from_id}")
+                if edge.to_id not in node_ids:
+                    errors.append(f"edge {edge.id} has unknown to node {edge.to_id}")
+            return errors
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -158,7 +213,7 @@ class GraphPayload:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TransformRequest:
     transform: str
     inputs: dict[str, Any] = field(default_factory=dict)
@@ -175,15 +230,20 @@ class TransformRequest:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "TransformRequest":
+        if not isinstance(data, dict):
+            raise TypeError(f"request must be a JSON object, got {type(data).__name__}")
+        inputs = data.get("inputs", {})
+        if not isinstance(inputs, dict):
+            raise TypeError(f"inputs must be a JSON object, got {type(inputs).__name__}")
         run_meta_raw = data.get("run_meta")
         return cls(
             transform=str(data["transform"]),
-            inputs=dict(data.get("inputs", {})),
+            inputs=dict(inputs),
             run_meta=RunMeta.from_dict(run_meta_raw) if run_meta_raw else None,
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TransformResponse:
     ok: bool
     status: str
@@ -197,3 +257,12 @@ class TransformResponse:
             "graph": self.graph.to_dict(),
             "errors": self.errors,
         }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TransformResponse":
+        return cls(
+            ok=bool(data["ok"]),
+            status=str(data["status"]),
+            graph=GraphPayload.from_dict(data["graph"]),
+            errors=[str(e) for e in data.get("errors", [])],
+        )
@@ -1,22 +1,106 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 
-def normalize_phone(value: str) -> str:
-    digits = "".join(ch for ch in value if ch.isdigit())
+
+class _DigitsOnly(dict[int, "str | None"]):
+    """``str.translate`` table that keeps digits and drops everything else."""
+
+    def __missing__(self, codepoint: int) -> str | None:
+        char = chr(codepoint)
+        kept = char if char.isdigit() else None
+        self[codepoint] = kept
+        return kept
+
+
+_DIGITS_ONLY = _DigitsOnly()
+
+# ITU-T E.164 country calling codes. The set is prefix-free, so a trie walk
+# stops at the first terminal digit.
+_CALLING_CODES = (
+    "1 7 20 27 30 31 32 33 34 36 39 40 41 43 44 45 46 47 48 49 51 52 53 54 55 56 57 58 "
+    "60 61 62 63 64 65 66 81 82 84 86 90 91 92 93 94 95 98 "
+    "211 212 213 216 218 220 221 222 223 224 225 226 227 228 229 230 231 232 233 234 235 "
+    "236 237 238 239 240 241 242 243 244 245 246 247 248 249 250 251 252 253 254 255 256 "
+    "257 258 260 261 262 263 264 265 266 267 268 269 290 291 297 298 299 "
+    "350 351 352 353 354 355 356 357 358 359 370 371 372 373 374 375 376 377 378 379 380 "
+    "381 382 383 385 386 387 389 420 421 423 500 501 502 503 504 505 506 507 508 509 "
+    "590 591 592 593 594 595 596 597 598 599 670 672 673 674 675 676 677 678 679 680 681 "
+    "682 683 685 686 687 688 689 690 691 692 800 808 850 852 853 855 856 870 878 880 881 "
+    "882 883 886 888 960 961 962 963 964 965 966 967 968 970 971 972 973 974 975 976 977 "
+    "979 992 993 994 995 996 998"
+).split()
+
+_TERMINAL = ""
+
+
+def _build_trie(codes: Iterable[str]) -> dict[str, dict]:
+    root: dict[str, dict] = {}
+    for code in codes:
+        node = root
+        for digit in code:
+            node = node.setdefault(digit, {})
+        node[_TERMINAL] = {}
+    return root
+
+
+_CALLING_CODE_TRIE = _build_trie(_CALLING_CODES)
+
+
+def _phone_from_digits(digits: str, international: bool) -> str:
+    if not digits:
+        return ""
+    if international:
+        return f"+{digits}"
     if len(digits) == 10:
         return f"+1{digits}"
     if digits.startswith("00"):
         return f"+{digits[2:]}"
-    if digits.startswith("1") and len(digits) == 11:
-        return f"+{digits}"
-    if digits.startswith("+"):
-        return digits
-    return f"+{digits}" if digits else ""
+    return f"+{digits}"
+
+
+def normalize_phone(value: str) -> str:
+    return _phone_from_digits(
+        value.translate(_DIGITS_ONLY),
+        value.lstrip().startswith("+"),
+    )
+
+
+def normalize_phones(values: Iterable[str]) -> list[str]:
+    table = _DIGITS_ONLY
+    to_phone = _phone_from_digits
+    return [to_phone(v.translate(table), v.lstrip().startswith("+")) for v in values]
+
+
+def split_e164(value: str) -> tuple[str, str]:
+    """Split a phone number into ``(country_code, national_number)``.
+
+    The value is normalized first. An unassigned prefix yields an empty
+    country code with all digits as the national number.
+    """
+    digits = normalize_phone(value)[1:]
+    node = _CALLING_CODE_TRIE
+    for index, digit in enumerate(digits):
+        node = node.get(digit, {})
+        if _TERMINAL in node:
+            return digits[: index + 1], digits[index + 1 :]
+        if not node:
+            break
+    return "", digits
 
 
 def normalize_email(value: str) -> str:
     return value.strip().lower()
 
 
+def normalize_emails(values: Iterable[str]) -> list[str]:
+    return [v.strip().lower() for v in values]
+
+
 def normalize_text(value: str) -> str:
     return " ".join(value.strip().lower().split())
+
+
+def normalize_texts(values: Iterable[str]) -> list[str]:
+    join = " ".join
+    return [join(v.lower().split()) for v in values]
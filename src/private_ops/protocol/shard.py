@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import heapq
+import json
+import shutil
+import tempfile
+import zlib
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import IO, Any, TypeVar
+
+from private_ops.protocol.builder import merge_entity
+from private_ops.protocol.graph_io import WRITE_BUFFER_BYTES, is_ndjson, iter_graph_records
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta
+from private_ops.protocol.validation import GraphReport
+from private_ops.telemetry import span
+
+MANIFEST_NAME = "manifest.json"
+
+_encode = json.JSONEncoder(sort_keys=True).encode
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def shard_of(entity_id: str, shards: int) -> int:
+    """Shard for ``entity_id``: its hash prefix for ``protocol.ids`` ids, else a CRC32."""
+    try:
+        key = int(entity_id[2:10], 16) if entity_id[1:2] == "_" else None
+    except ValueError:
+        key = None
+    if key is None:
+        key = zlib.crc32(entity_id.encode("utf-8"))
+    return key % shards
+
+
+def _shard_path(directory: Path, shard: int, kind: str = "records") -> Path:
+    return directory / f"{kind}-{shard:05d}.ndjson"
+
+
+def _shard_index(path: Path) -> int:
+    return int(path.stem.rsplit("-", 1)[1])
+
+
+class GraphPartitioner:
+    """Stream graph records into ``shards`` NDJSON files keyed by id.
+
+    A node lives in ``shard_of(node.id)``; an edge lives with its ``from``
+    node. An edge whose ``to`` node belongs to another shard also leaves a
+    ``ref`` record in that shard, so every shard can check and count the
+    edges that touch its nodes without reading any other shard. Only open
+    file handles are held in memory.
+    """
+
+    def __init__(self, directory: str | Path | None = None, *, shards: int = 16) -> None:
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self._owns_dir = directory is None
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="private-ops-shards-")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shards = shards
+        self._handles: dict[int, IO[str]] = {}
+        self.run_metas: list[RunMeta] = []
+        self.counts = [{"nodes": 0, "edges": 0, "refs": 0} for _ in range(shards)]
+
+    def _write(self, shard: int, kind: str, data: dict[str, Any]) -> None:
+        handle = self._handles.get(shard)
+        if handle is None:
+            handle = self._handles[shard] = _shard_path(self.directory, shard).open(
+                "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES
+            )
+        handle.write(_encode({"type": kind, "data": data}) + "\n")
+
+    def add_record(self, kind: str, data: dict[str, Any]) -> None:
+        if kind == "run_meta":
+            self.run_metas.append(RunMeta.from_dict(data))
+            return
+        if kind == "node":
+            shard = shard_of(str(data["id"]), self.shards)
+            self._write(shard, "node", data)
+            self.counts[shard]["nodes"] += 1
+            return
+        if kind != "edge":
+            raise ValueError(f"cannot partition record of type '{kind}'")
+        shard = shard_of(str(data["from"]), self.shards)
+        self._write(shard, "edge", data)
+        self.counts[shard]["edges"] += 1
+        target = shard_of(str(data["to"]), self.shards)
+        if target != shard:
+            self._write(target, "ref", {"edge": data["id"], "node": data["to"], "shard": shard})
+            self.counts[target]["refs"] += 1
+
+    def add_graph(self, graph: GraphPayload) -> None:
+        self.run_metas.append(graph.run_meta)
+        for node in graph.nodes:
+            self.add_record("node", node.to_dict())
+        for edge in graph.edges:
+            self.add_record("edge", edge.to_dict())
+
+    def add_file(self, path: str | Path) -> None:
+        with span("partition", path=str(path), shards=self.shards):
+            for kind, data in iter_graph_records(path):
+                self.add_record(kind, data)
+
+    def finish(self) -> "ShardedGraph":
+        """Close the shard files, write the manifest and open the result."""
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+        manifest = {
+            "shards": self.shards,
+            "run_metas": [meta.to_dict() for meta in self.run_metas],
+            "counts": self.counts,
+        }
+        (self.directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), "utf-8")
+        return ShardedGraph(self.directory, owns_dir=self._owns_dir)
+
+
+@dataclass
+class _Shard:
+    nodes: dict[str, Node] = field(default_factory=dict)
+    edges: dict[str, Edge] = field(default_factory=dict)
+    # Edge id -> node id here, for edges stored in other shards.
+    refs: dict[str, str] = field(default_factory=dict)
+    duplicate_nodes: list[str] = field(default_factory=list)
+    duplicate_edges: list[str] = field(default_factory=list)
+
+
+def _add(entities: dict[str, Any], duplicates: list[str], entity: Node | Edge) -> None:
+    existing = entities.get(entity.id)
+    if existing is None:
+        entities[entity.id] = entity
+    else:
+        duplicates.append(entity.id)
+        entities[entity.id] = merge_entity(existing, entity)
+
+
+def _load_shard(path: Path) -> _Shard:
+    """Read one shard, merging duplicate ids the way ``GraphBuilder`` does."""
+    shard = _Shard()
+    if not path.exists():
+        return shard
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            record = json.loads(line)
+            kind, data = record["type"], record["data"]
+            if kind == "ref":
+                shard.refs[data["edge"]] = data["node"]
+                continue
+            if kind == "node":
+                _add(shard.nodes, shard.duplicate_nodes, Node.from_dict(data))
+            else:
+                _add(shard.edges, shard.duplicate_edges, Edge.from_dict(data))
+    return shard
+
+
+def _validate_shard(
+    path: Path, *, shards: int, max_errors: int, allow_duplicates: bool
+) -> GraphReport:
+    shard = _load_shard(path)
+    report = GraphReport(
+        nodes=len(shard.nodes) + len(shard.duplicate_nodes),
+        edges=len(shard.edges) + len(shard.duplicate_edges),
+    )
+
+    def error(message: str) -> None:
+        report.error_count += 1
+        if len(report.errors) < max_errors:
+            report.errors.append(message)
+
+    if not allow_duplicates:
+        for entity_id in shard.duplicate_nodes:
+            error(f"duplicate node id {entity_id}")
+        for entity_id in shard.duplicate_edges:
+            error(f"duplicate edge id {entity_id}")
+    local = _shard_index(path)
+    for edge in shard.edges.values():
+        if edge.from_id not in shard.nodes:
+            error(f"edge {edge.id} has unknown from node {edge.from_id}")
+        # A remote ``to`` node is checked by its own shard, through the ref record.
+        if shard_of(edge.to_id, shards) == local and edge.to_id not in shard.nodes:
+            error(f"edge {edge.id} has unknown to node {edge.to_id}")
+    for edge_id, node_id in shard.refs.items():
+        if node_id not in shard.nodes:
+            error(f"edge {edge_id} has unknown to node {node_id}")
+    return report
+
+
+@dataclass
+class _ShardStats:
+    nodes_by_type: Counter[str]
+    edges_by_type: Counter[str]
+    cross_shard_edges: int
+    top_degree: list[tuple[int, str, str, str]]
+
+
+def _stats_shard(path: Path, *, top: int) -> _ShardStats:
+    shard = _load_shard(path)
+    degree: Counter[str] = Counter()
+    for edge in shard.edges.values():
+        degree[edge.from_id] += 1
+        if edge.to_id in shard.nodes:
+            degree[edge.to_id] += 1
+    degree.update(shard.refs.values())
+    ranked = heapq.nlargest(
+        top,
+        ((count, node_id) for node_id, count in degree.items() if node_id in shard.nodes),
+    )
+    return _ShardStats(
+        nodes_by_type=Counter(node.type for node in shard.nodes.values()),
+        edges_by_type=Counter(edge.type for edge in shard.edges.values()),
+        cross_shard_edges=len(shard.refs),
+        top_degree=[
+            (count, node_id, shard.nodes[node_id].type, shard.nodes[node_id].label)
+            for count, node_id in ranked
+        ],
+    )
+
+
+def _export_shard(path: Path) -> tuple[int, int]:
+    """Write the merged nodes and edges of one shard as one JSON object per line."""
+    shard = _load_shard(path)
+    for kind, entities in (("nodes", shard.nodes), ("edges", shard.edges)):
+        out = _shard_path(path.parent, _shard_index(path), kind)
+        with out.open("w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as handle:
+            for entity in entities.values():
+                handle.write(_encode(entity.to_dict()) + "\n")
+    return len(shard.nodes), len(shard.edges)
+
+
+def _map(fn: Callable[[_T], _R], items: list[_T], workers: int) -> Iterator[_R]:
+    if workers <= 1 or len(items) <= 1:
+        yield from map(fn, items)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        yield from pool.map(fn, items)
+
+
+class ShardedGraph:
+    """A graph split by ``GraphPartitioner``, processed one shard per task.
+
+    ``validate``, ``export`` and ``stats`` load one shard per worker
+    process and reduce the per-shard results, so no process ever holds
+    more than one shard. ``workers`` of 1 runs everything in-process.
+    """
+
+    def __init__(self, directory: str | Path, *, owns_dir: bool = False) -> None:
+        self.directory = Path(directory)
+        manifest = json.loads((self.directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+        self.shards = int(manifest["shards"])
+        self.run_metas = [RunMeta.from_dict(meta) for meta in manifest["run_metas"]]
+        self.counts: list[dict[str, int]] = manifest["counts"]
+        self._owns_dir = owns_dir
+
+    @classmethod
+    def from_files(
+        cls,
+        paths: Iterable[str | Path],
+        directory: str | Path | None = None,
+        *,
+        shards: int = 16,
+    ) -> "ShardedGraph":
+        partitioner = GraphPartitioner(directory, shards=shards)
+        for path in paths:
+            partitioner.add_file(path)
+        return partitioner.finish()
+
+    @property
+    def shard_paths(self) -> list[Path]:
+        return [_shard_path(self.directory, shard) for shard in range(self.shards)]
+
+    def validate(
+        self, *, workers: int = 1, max_errors: int = 100, allow_duplicates: bool = False
+    ) -> GraphReport:
+        """Check ids and edge endpoints; ``allow_duplicates`` for inputs about to be merged."""
+        total = GraphReport()
+        with span("validate", shards=self.shards, workers=workers):
+            task = partial(
+                _validate_shard,
+                shards=self.shards,
+                max_errors=max_errors,
+                allow_duplicates=allow_duplicates,
+            )
+            for report in _map(task, self.shard_paths, workers):
+                total.nodes += report.nodes
+                total.edges += report.edges
+                total.error_count += report.error_count
+                total.errors.extend(report.errors[: max(0, max_errors - len(total.errors))])
+        return total
+
+    def stats(self, *, workers: int = 1, top: int = 10) -> dict[str, Any]:
+        """Entity counts by type and the ``top`` nodes by degree."""
+        nodes_by_type: Counter[str] = Counter()
+        edges_by_type: Counter[str] = Counter()
+        cross_shard = 0
+        candidates: list[tuple[int, str, str, str]] = []
+        with span("stats", shards=self.shards, workers=workers):
+            for result in _map(partial(_stats_shard, top=top), self.shard_paths, workers):
+                nodes_by_type.update(result.nodes_by_type)
+                edges_by_type.update(result.edges_by_type)
+                cross_shard += result.cross_shard_edges
+                candidates.extend(result.top_degree)
+        return {
+            "shards": self.shards,
+            "nodes": sum(nodes_by_type.values()),
+            "edges": sum(edges_by_type.values()),
+            "cross_shard_edges": cross_shard,
+            "nodes_by_type": dict(nodes_by_type.most_common()),
+            "edges_by_type": dict(edges_by_type.most_common()),
+            "top_degree": [
+                {"id": node_id, "type": kind, "label": label, "degree": degree}
+                for degree, node_id, kind, label in heapq.nlargest(top, candidates)
+            ],
+        }
+
+    def export(self, path: str | Path, run_meta: RunMeta, *, workers: int = 1) -> tuple[int, int]:
+        """Merge duplicates shard by shard and write one JSON or NDJSON graph.
+
+        Returns ``(nodes, edges)``. Shard outputs are concatenated as text,
+        so the writing process never parses the graph.
+        """
+        nodes = edges = 0
+        with span("export", shards=self.shards, workers=workers):
+            for shard_nodes, shard_edges in _map(_export_shard, self.shard_paths, workers):
+                nodes += shard_nodes
+                edges += shard_edges
+            with Path(path).open("w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as handle:
+                if is_ndjson(path):
+                    self._write_ndjson(handle, run_meta)
+                else:
+                    self._write_json(handle, run_meta)
+        return nodes, edges
+
+    def _parts(self, kind: str) -> Iterator[str]:
+        for shard in range(self.shards):
+            with _shard_path(self.directory, shard, kind).open("r", encoding="utf-8") as part:
+                for line in part:
+                    yield line.rstrip("\n")
+
+    def _write_ndjson(self, handle: IO[str], run_meta: RunMeta) -> None:
+        handle.write(_encode({"type": "run_meta", "data": run_meta.to_dict()}) + "\n")
+        for kind in ("node", "edge"):
+            suffix = f', "type": "{kind}"}}\n'
+            for line in self._parts(f"{kind}s"):
+                handle.write('{"data": ' + line + suffix)
+
+    def _write_json(self, handle: IO[str], run_meta: RunMeta) -> None:
+        handle.write("{")
+        for kind in ("edges", "nodes"):
+            handle.write(f'"{kind}": [')
+            separator = "\n"
+            for line in self._parts(kind):
+                handle.write(separator + line)
+                separator = ",\n"
+            handle.write("\n], ")
+        handle.write(f'"run_meta": {_encode(run_meta.to_dict())}}}\n')
+
+    def close(self) -> None:
+        if self._owns_dir:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "ShardedGraph":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from private_ops.protocol.graph_io import NumberedRecord, iter_numbered_records
+
+NODE_FIELDS = ("id", "type", "canonical_key", "label")
+EDGE_FIELDS = ("id", "type", "from", "to", "canonical_key")
+_ROLES = ("from", "to")
+
+
+@dataclass
+class GraphReport:
+    nodes: int = 0
+    edges: int = 0
+    error_count: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    @property
+    def omitted(self) -> int:
+        return self.error_count - len(self.errors)
+
+
+class StreamingGraphValidator:
+    """Check graph records one at a time, keeping only hashed ids.
+
+    Node and edge ids are remembered as 64-bit hashes, so memory grows with
+    the number of entities but not with their size. An edge whose endpoint
+    has not been seen yet is parked as ``(hash, record ordinal, role)`` in
+    flat arrays and re-checked once every node has been read; for the
+    ``run-transform --ndjson`` stream, which writes nodes first, nothing is
+    parked. Only the first ``max_errors`` messages are kept. Two distinct ids
+    whose hashes collide are indistinguishable here: the second is reported
+    as a duplicate, and an edge naming a missing node can pass if that
+    node's hash matches a known one. With 64-bit hashes either is unlikely
+    below billions of ids; use ``GraphPayload.validate`` for exact checks.
+    """
+
+    def __init__(self, *, max_errors: int = 100) -> None:
+        if max_errors < 0:
+            raise ValueError("max_errors must be >= 0")
+        self.max_errors = max_errors
+        self.report = GraphReport()
+        self._node_ids: set[int] = set()
+        self._edge_ids: set[int] = set()
+        self._ordinal = 0
+        self._pending_ids = array("q")
+        self._pending_ordinals = array("Q")
+        self._pending_roles = bytearray()
+
+    def error(self, line: int | None, message: str) -> None:
+        self.report.error_count += 1
+        if len(self.report.errors) < self.max_errors:
+            self.report.errors.append(message if line is None else f"line {line}: {message}")
+
+    def _missing(self, line: int, kind: str, data: Any, required: tuple[str, ...]) -> bool:
+        if not isinstance(data, dict):
+            self.error(line, f"{kind} record must be an object")
+            return True
+        missing = [name for name in required if not isinstance(data.get(name), str)]
+        if missing:
+            self.error(line, f"{kind} record is missing {', '.join(missing)}")
+            return True
+        return False
+
+    def add(self, line: int, kind: str, data: Any) -> None:
+        ordinal = self._ordinal
+        self._ordinal += 1
+        if kind == "node":
+            self.report.nodes += 1
+            if self._missing(line, kind, data, NODE_FIELDS):
+                return
+            key = hash(data["id"])
+            if key in self._node_ids:
+                self.error(line, f"duplicate node id {data['id']}")
+            self._node_ids.add(key)
+        elif kind == "edge":
+            self.report.edges += 1
+            if self._missing(line, kind, data, EDGE_FIELDS):
+                return
+            key = hash(data["id"])
+            if key in self._edge_ids:
+                self.error(line, f"duplicate edge id {data['id']}")
+            self._edge_ids.add(key)
+            for role_index, role in enumerate(_ROLES):
+                endpoint = hash(data[role])
+                if endpoint not in self._node_ids:
+                    self._pending_ids.append(endpoint)
+                    self._pending_ordinals.append(ordinal)
+                    self._pending_roles.append(role_index)
+
+    def unresolved(self) -> dict[int, list[str]]:
+        """Record ordinal -> endpoint roles that still name no known node."""
+        node_ids = self._node_ids
+        missing: dict[int, list[str]] = {}
+        for endpoint, ordinal, role in zip(
+            self._pending_ids, self._pending_ordinals, self._pending_roles
+        ):
+            if endpoint not in node_ids:
+                missing.setdefault(ordinal, []).append(_ROLES[role])
+        return missing
+
+    def finish(self, records: Iterable[NumberedRecord] = ()) -> GraphReport:
+        """Report dangling edges; ``records`` replays the input to name them."""
+        missing = self.unresolved()
+        if missing:
+            self._report_dangling(missing, records)
+        self._pending_ids = array("q")
+        self._pending_ordinals = array("Q")
+        self._pending_roles = bytearray()
+        return self.report
+
+    def _report_dangling(
+        self,
+        missing: dict[int, list[str]],
+        records: Iterable[NumberedRecord],
+    ) -> None:
+        remaining = sum(len(roles) for roles in missing.values())
+        for ordinal, (line, _, data) in enumerate(records):
+            roles = missing.get(ordinal)
+            if roles is None:
+                continue
+            for role in roles:
+                self.error(line, f"edge {data['id']} has unknown {role} node {data[role]}")
+                remaining -= 1
+            if not remaining or len(self.report.errors) >= self.max_errors:
+                break
+        # Without a replay (or once the message cap is hit) just count the rest.
+        self.report.error_count += remaining
+
+
+def validate_graph_file(path: str | Path, *, max_errors: int = 100) -> GraphReport:
+    """Validate a JSON or NDJSON graph file without loading it.
+
+    Memory stays bounded by the id hashes plus any edges that arrive before
+    their nodes; dangling edges are named by re-reading the file.
+    """
+    validator = StreamingGraphValidator(max_errors=max_errors)
+    try:
+        for line, kind, data in iter_numbered_records(path, on_error=validator.error):
+            validator.add(line, kind, data)
+    except ValueError as exc:
+        validator.error(None, str(exc))
+        return validator.finish()
+    return validator.finish(iter_numbered_records(path, on_error=lambda *_: None))
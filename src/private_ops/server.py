@@ -0,0 +1,361 @@
+"""
+CTW: James 1:19 — “swift to hear, slow to speak”
+Intent: Accept transform requests promptly and shed load explicitly instead of stalling.
+Theme: Speech
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import CancelledError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from xml.etree.ElementTree import ParseError
+
+from private_ops.adapters.maltego import (
+    MaltegoXmlWriter,
+    parse_maltego_request,
+    to_maltego_mapping,
+)
+from private_ops.protocol.models import TransformRequest, TransformResponse
+from private_ops.telemetry import get_telemetry
+from private_ops.transforms import list_transforms, load_transforms
+from private_ops.transforms.scheduler import DEFAULT_INVESTIGATION, RateLimit, TransformScheduler
+
+_LATENCY_WINDOW = 1024
+
+
+class _NoRoute(Exception):
+    """The request path names no POST endpoint."""
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class ServerMetrics:
+    """Per-transform request counts, error counts and recent latencies."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._latencies: dict[str, deque[float]] = {}
+        self.rejected = 0
+
+    def record(self, transform: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._counts[transform] = self._counts.get(transform, 0) + 1
+            if not ok:
+                self._errors[transform] = self._errors.get(transform, 0) + 1
+            self._latencies.setdefault(transform, deque(maxlen=_LATENCY_WINDOW)).append(seconds)
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            transforms = {}
+            for name, count in sorted(self._counts.items()):
+                samples = list(self._latencies.get(name, ()))
+                transforms[name] = {
+                    "requests": count,
+                    "errors": self._errors.get(name, 0),
+                    "latency_ms_p50": round(_percentile(samples, 0.50) * 1000, 3),
+                    "latency_ms_p99": round(_percentile(samples, 0.99) * 1000, 3),
+                }
+            return {"transforms": transforms, "rejected": self.rejected}
+
+
+class TransformServer:
+    """Local HTTP endpoint for Maltego-style transform requests.
+
+    ``POST /run/<transform>`` accepts a Maltego ``MaltegoTransformRequestMessage``
+    (XML) or a JSON ``inputs`` object; ``POST /run`` accepts a full
+    ``TransformRequest`` JSON. XML requests (or ``Accept: application/xml``)
+    get a streamed ``MaltegoTransformResponseMessage``, others the JSON
+    mapping. Requests run on a ``TransformScheduler``; the ``X-Investigation``
+    and ``X-Priority`` headers pick the queue and the priority within it. At
+    most ``workers + max_queue`` requests are admitted at once; beyond that
+    the server answers 503 with ``Retry-After`` instead of queueing without
+    bound. Connections are HTTP/1.1 keep-alive.
+    ``GET /metrics`` reports per-transform latency percentiles and
+    ``GET /scheduler`` the scheduler backlog;
+    ``GET /metrics/prometheus`` dumps the telemetry registry, which
+    ``private-ops serve`` enables.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8787,
+        *,
+        workers: int = 8,
+        max_queue: int = 64,
+        request_timeout: float = 30.0,
+        max_body_bytes: int = 1 << 20,
+        rate_limits: Mapping[str, RateLimit] | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        self.metrics = ServerMetrics()
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        load_transforms()
+        self.scheduler = TransformScheduler(workers=workers, rate_limits=rate_limits)
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.scheduler.shutdown(wait=True, cancel_pending=True)
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "TransformServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+    def run(
+        self,
+        request: TransformRequest,
+        *,
+        investigation: str = DEFAULT_INVESTIGATION,
+        priority: int = 0,
+    ) -> tuple[TransformResponse | None, float]:
+        """Dispatch on the scheduler; ``None`` means the server is saturated.
+
+        The admission slot is held until the worker finishes, even if the
+        caller gives up after ``request_timeout``. A transform that raises,
+        times out or is cancelled at shutdown is recorded as an error and
+        its exception re-raised.
+        """
+        if not self._slots.acquire(blocking=False):
+            self.metrics.reject()
+            return None, 0.0
+        with self._in_flight_lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            future = self.scheduler.submit(
+                request, investigation=investigation, priority=priority
+            )
+        except RuntimeError:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        try:
+            response = future.result(timeout=self.request_timeout)
+        except Exception:
+            self.metrics.record(request.transform, time.perf_counter() - started, False)
+            raise
+        elapsed = time.perf_counter() - started
+        self.metrics.record(request.transform, elapsed, response.ok)
+        return response, elapsed
+
+    def _release(self) -> None:
+        with self._in_flight_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+
+class _ChunkedStream:
+    """Binary sink that frames writes as HTTP/1.1 chunked transfer encoding."""
+
+    def __init__(self, wfile: Any) -> None:
+        self._wfile = wfile
+
+    def write(self, data: bytes) -> None:
+        if data:
+            self._wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def flush(self) -> None:
+        self._wfile.flush()
+
+    def close(self) -> None:
+        self._wfile.write(b"0\r\n\r\n")
+        self._wfile.flush()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "private-ops"
+
+    @property
+    def app(self) -> TransformServer:
+        return self.server.app  # type: ignore[attr-defined]
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        payload: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        body = json.dumps(payload, sort_keys=True).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok", "in_flight": self.app.in_flight})
+        elif self.path == "/metrics":
+            self._send(HTTPStatus.OK, self.app.metrics.snapshot())
+        elif self.path == "/metrics/prometheus":
+            body = get_telemetry().prometheus_text().encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/scheduler":
+            self._send(HTTPStatus.OK, self.app.scheduler.snapshot())
+        elif self.path == "/transforms":
+            self._send(HTTPStatus.OK, {"transforms": list_transforms()})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"no route for {self.path}"})
+
+    def _content_length(self) -> int:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length < 0:
+            raise ValueError("Content-Length must be >= 0")
+        return length
+
+    def do_POST(self) -> None:  # noqa: N802
+        try:
+            length = self._content_length()
+        except ValueError as exc:
+            # Without a usable length the body cannot be skipped, so drop the connection.
+            self.close_connection = True
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"invalid request: {exc}"})
+            return
+        if length > self.app.max_body_bytes:
+            self.close_connection = True
+            self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "request body too large"})
+            return
+        body = self.rfile.read(length)
+        wants_xml = body.lstrip().startswith(b"<") or "xml" in self.headers.get("Accept", "")
+
+        try:
+            request = self._parse(body)
+            priority = int(self.headers.get("X-Priority") or 0)
+        except _NoRoute:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"no route for {self.path}"})
+            return
+        except (ValueError, KeyError, TypeError, ParseError) as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"invalid request: {exc}"})
+            return
+
+        try:
+            response, elapsed = self.app.run(
+                request,
+                investigation=self.headers.get("X-Investigation") or DEFAULT_INVESTIGATION,
+                priority=priority,
+            )
+        except FutureTimeoutError:
+            self._send(HTTPStatus.GATEWAY_TIMEOUT, {"error": "transform timed out"})
+            return
+        except CancelledError:
+            self._send(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "server is shutting down"},
+                headers={"Retry-After": "1"},
+            )
+            return
+        except Exception as exc:
+            self._send(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"error": f"transform failed: {type(exc).__name__}: {exc}"},
+            )
+            return
+        if response is None:
+            self._send(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "server is at capacity"},
+                headers={"Retry-After": "1"},
+            )
+            return
+
+        if wants_xml:
+            self._send_xml(response, elapsed)
+            return
+        self._send(
+            HTTPStatus.OK,
+            {
+                "ok": response.ok,
+                "status": response.status,
+                "errors": response.errors,
+                "run_meta": response.graph.run_meta.to_dict(),
+                "maltego": to_maltego_mapping(response.graph),
+            },
+            headers={"X-Latency-Ms": f"{elapsed * 1000:.3f}"},
+        )
+
+    def _send_xml(self, response: TransformResponse, elapsed: float) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/xml; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Latency-Ms", f"{elapsed * 1000:.3f}")
+        self.end_headers()
+        stream = _ChunkedStream(self.wfile)
+        with MaltegoXmlWriter(stream) as writer:
+            writer.write_graph(response.graph, response.errors)
+        stream.close()
+
+    def _parse(self, body: bytes) -> TransformRequest:
+        if self.path == "/run":
+            return TransformRequest.from_dict(json.loads(body))
+        if not self.path.startswith("/run/"):
+            raise _NoRoute(self.path)
+        transform = self.path[len("/run/"):]
+        if body.lstrip().startswith(b"<"):
+            return parse_maltego_request(body, transform)
+        inputs = json.loads(body) if body.strip() else {}
+        if not isinstance(inputs, dict):
+            raise ValueError("JSON body must be an object of transform inputs")
+        return TransformRequest(transform=transform, inputs=inputs)
@@ -0,0 +1,380 @@
+"""
+CTW: Proverbs 22:29 — “Seest thou a man diligent in his business?”
+Intent: Persist graphs durably with indexed, batched access for repeatable queries.
+Theme: Workmanship
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta, SourceRef
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    transform TEXT NOT NULL,
+    request_id TEXT NOT NULL DEFAULT '',
+    generated_at TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source_pk INTEGER PRIMARY KEY,
+    source_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    UNIQUE (source_id, title, url, confidence)
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    canonical_key TEXT NOT NULL,
+    label TEXT NOT NULL,
+    properties TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS edges (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    from_id TEXT NOT NULL,
+    to_id TEXT NOT NULL,
+    canonical_key TEXT NOT NULL,
+    properties TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entity_sources (
+    entity_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    source_pk INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (entity_id, run_id, source_pk)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS run_entities (
+    run_id TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (run_id, entity_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS nodes_canonical_key ON nodes (canonical_key);
+CREATE INDEX IF NOT EXISTS nodes_type ON nodes (type);
+CREATE INDEX IF NOT EXISTS edges_from ON edges (from_id);
+CREATE INDEX IF NOT EXISTS edges_to ON edges (to_id);
+CREATE INDEX IF NOT EXISTS edges_type ON edges (type);
+CREATE INDEX IF NOT EXISTS run_entities_entity ON run_entities (entity_id);
+"""
+
+_UPSERT_RUN = """
+INSERT INTO runs (run_id, transform, request_id, generated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (run_id) DO UPDATE SET
+    transform = excluded.transform,
+    request_id = excluded.request_id,
+    generated_at = excluded.generated_at
+"""
+_UPSERT_NODE = """
+INSERT INTO nodes (id, type, canonical_key, label, properties) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET label = excluded.label, properties = excluded.properties
+"""
+_UPSERT_EDGE = """
+INSERT INTO edges (id, type, from_id, to_id, canonical_key, properties) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET properties = excluded.properties
+"""
+_INSERT_SOURCE = """
+INSERT OR IGNORE INTO sources (source_id, title, url, confidence) VALUES (?, ?, ?, ?)
+"""
+_SELECT_SOURCE_PK = """
+SELECT source_pk FROM sources WHERE source_id = ? AND title = ? AND url = ? AND confidence = ?
+"""
+_LINK_SOURCE = """
+INSERT OR IGNORE INTO entity_sources (entity_id, run_id, source_pk, position) VALUES (?, ?, ?, ?)
+"""
+_CLEAR_RUN = "DELETE FROM run_entities WHERE run_id = ?"
+_CLEAR_RUN_SOURCES = "DELETE FROM entity_sources WHERE run_id = ?"
+_LINK_RUN = """
+INSERT OR IGNORE INTO run_entities (run_id, entity_id, kind, position) VALUES (?, ?, ?, ?)
+"""
+
+_NODE_COLUMNS = "n.id, n.type, n.canonical_key, n.label, n.properties"
+_EDGE_COLUMNS = "e.id, e.type, e.from_id, e.to_id, e.canonical_key, e.properties"
+_SELECT_NODE = f"SELECT {_NODE_COLUMNS} FROM nodes n WHERE n.id = ?"
+_SELECT_NODES_BY_TYPE = (
+    f"SELECT {_NODE_COLUMNS} FROM nodes n WHERE n.type = :type ORDER BY n.id LIMIT :limit"
+)
+_SELECT_NODES_BY_KEY = (
+    f"SELECT {_NODE_COLUMNS} FROM nodes n WHERE n.canonical_key = :key ORDER BY n.id"
+)
+_SELECT_EDGES_OUT = f"SELECT {_EDGE_COLUMNS} FROM edges e WHERE e.from_id = :id ORDER BY e.id"
+_SELECT_EDGES_IN = f"SELECT {_EDGE_COLUMNS} FROM edges e WHERE e.to_id = :id ORDER BY e.id"
+_SELECT_RUN = "SELECT run_id, transform, request_id, generated_at FROM runs WHERE run_id = ?"
+_SELECT_RUNS = "SELECT run_id, transform, request_id, generated_at FROM runs ORDER BY run_id"
+_SELECT_RUN_NODES = f"""
+SELECT {_NODE_COLUMNS} FROM run_entities r JOIN nodes n ON n.id = r.entity_id
+WHERE r.run_id = ? AND r.kind = 'node' ORDER BY r.position
+"""
+_SELECT_RUN_EDGES = f"""
+SELECT {_EDGE_COLUMNS} FROM run_entities r JOIN edges e ON e.id = r.entity_id
+WHERE r.run_id = ? AND r.kind = 'edge' ORDER BY r.position
+"""
+_SELECT_RUN_SOURCES = """
+SELECT es.entity_id, s.source_id, s.title, s.url, s.confidence
+FROM run_entities r
+JOIN entity_sources es ON es.entity_id = r.entity_id AND es.run_id = r.run_id
+JOIN sources s ON s.source_pk = es.source_pk
+WHERE r.run_id = ?
+ORDER BY es.entity_id, es.position, es.source_pk
+"""
+# Outside a run an entity carries the union of the sources every run gave it.
+_SELECT_ENTITY_SOURCES = """
+SELECT s.source_id, s.title, s.url, s.confidence
+FROM entity_sources es JOIN sources s ON s.source_pk = es.source_pk
+WHERE es.entity_id = ?
+GROUP BY es.source_pk
+ORDER BY MIN(es.position), es.source_pk
+"""
+_NEIGHBOR_IDS = {
+    "out": "SELECT e.to_id FROM edges e WHERE e.from_id = :id",
+    "in": "SELECT e.from_id FROM edges e WHERE e.to_id = :id",
+}
+_NEIGHBOR_IDS["both"] = f"{_NEIGHBOR_IDS['out']} UNION {_NEIGHBOR_IDS['in']}"
+_SELECT_NEIGHBORS = {
+    direction: f"""
+WITH nb(id) AS ({ids})
+SELECT {_NODE_COLUMNS} FROM nb JOIN nodes n ON n.id = nb.id ORDER BY n.id
+"""
+    for direction, ids in _NEIGHBOR_IDS.items()
+}
+
+
+def _select_sources(ids: str) -> str:
+    """Sources of every entity id ``ids`` selects, in one query."""
+    return f"""
+WITH nb(id) AS ({ids})
+SELECT es.entity_id, s.source_id, s.title, s.url, s.confidence
+FROM nb
+JOIN entity_sources es ON es.entity_id = nb.id
+JOIN sources s ON s.source_pk = es.source_pk
+GROUP BY es.entity_id, es.source_pk
+ORDER BY es.entity_id, MIN(es.position), es.source_pk
+"""
+
+
+_SELECT_NEIGHBOR_SOURCES = {
+    direction: _select_sources(ids) for direction, ids in _NEIGHBOR_IDS.items()
+}
+_SELECT_NODES_BY_TYPE_SOURCES = _select_sources(
+    "SELECT n.id FROM nodes n WHERE n.type = :type ORDER BY n.id LIMIT :limit"
+)
+_SELECT_NODES_BY_KEY_SOURCES = _select_sources(
+    "SELECT n.id FROM nodes n WHERE n.canonical_key = :key"
+)
+_EDGE_IDS = {
+    "out": "SELECT e.id FROM edges e WHERE e.from_id = :id",
+    "in": "SELECT e.id FROM edges e WHERE e.to_id = :id",
+}
+_EDGE_IDS["both"] = f"{_EDGE_IDS['out']} UNION {_EDGE_IDS['in']}"
+_SELECT_EDGE_SOURCES = {direction: _select_sources(ids) for direction, ids in _EDGE_IDS.items()}
+
+
+class GraphStore:
+    """SQLite-backed persistent graph store.
+
+    The database runs in WAL mode so readers do not block the writer. Nodes
+    and edges are keyed by their stable ids and upserted in batches; sources
+    are deduplicated into their own table and linked per entity and run.
+    Each run records which entities it produced, so ``load_run`` returns the
+    graph as that run wrote it, with that run's sources and current property
+    values; other lookups see the union of sources across runs.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path), cached_statements=256)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._source_pks: dict[SourceRef, int] = {}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "GraphStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _source_pk_map(self, sources: Iterable[SourceRef]) -> dict[SourceRef, int]:
+        missing = {s for s in sources if s not in self._source_pks}
+        if missing:
+            rows = [(s.source_id, s.title, s.url, s.confidence) for s in missing]
+            self._conn.executemany(_INSERT_SOURCE, rows)
+            for source, row in zip(missing, rows):
+                (pk,) = self._conn.execute(_SELECT_SOURCE_PK, row).fetchone()
+                self._source_pks[source] = pk
+        return self._source_pks
+
+    def put_graph(self, graph: GraphPayload) -> None:
+        run = graph.run_meta
+        nodes = list(graph.nodes)
+        edges = list(graph.edges)
+        try:
+            self._write_graph(run, nodes, edges)
+        except sqlite3.Error:
+            self._source_pks.clear()
+            raise
+
+    def _write_graph(self, run: RunMeta, nodes: list[Node], edges: list[Edge]) -> None:
+        with self._conn:
+            self._conn.execute(
+                _UPSERT_RUN, (run.run_id, run.transform, run.request_id, run.generated_at),
+            )
+            self._conn.execute(_CLEAR_RUN, (run.run_id,))
+            self._conn.execute(_CLEAR_RUN_SOURCES, (run.run_id,))
+            self._conn.executemany(
+                _UPSERT_NODE,
+                (
+                    (n.id, n.type, n.canonical_key, n.label, json.dumps(n.properties, sort_keys=True))
+                    for n in nodes
+                ),
+            )
+            self._conn.executemany(
+                _UPSERT_EDGE,
+                (
+                    (
+                        e.id,
+                        e.type,
+                        e.from_id,
+                        e.to_id,
+                        e.canonical_key,
+                        json.dumps(e.properties, sort_keys=True),
+                    )
+                    for e in edges
+                ),
+            )
+            entities: list[Node | Edge] = [*nodes, *edges]
+            pks = self._source_pk_map(s for entity in entities for s in entity.sources)
+            self._conn.executemany(
+                _LINK_SOURCE,
+                (
+                    (entity.id, run.run_id, pks[source], position)
+                    for entity in entities
+                    for position, source in enumerate(entity.sources)
+                ),
+            )
+            self._conn.executemany(
+                _LINK_RUN,
+                [
+                    *((run.run_id, n.id, "node", i) for i, n in enumerate(nodes)),
+                    *((run.run_id, e.id, "edge", i) for i, e in enumerate(edges)),
+                ],
+            )
+
+    def _sources_for(self, entity_id: str) -> list[SourceRef]:
+        return [
+            SourceRef.shared(source_id, title, url, confidence)
+            for source_id, title, url, confidence in self._conn.execute(
+                _SELECT_ENTITY_SOURCES, (entity_id,)
+            )
+        ]
+
+    @staticmethod
+    def _node(row: tuple[Any, ...], sources: list[SourceRef]) -> Node:
+        entity_id, entity_type, canonical_key, label, properties = row
+        return Node(
+            id=entity_id,
+            type=entity_type,
+            canonical_key=canonical_key,
+            label=label,
+            properties=json.loads(properties),
+            sources=sources,
+        )
+
+    @staticmethod
+    def _edge(row: tuple[Any, ...], sources: list[SourceRef]) -> Edge:
+        entity_id, edge_type, from_id, to_id, canonical_key, properties = row
+        return Edge(
+            id=entity_id,
+            type=edge_type,
+            from_id=from_id,
+            to_id=to_id,
+            canonical_key=canonical_key,
+            properties=json.loads(properties),
+            sources=sources,
+        )
+
+    def get_node(self, entity_id: str) -> Node | None:
+        row = self._conn.execute(_SELECT_NODE, (entity_id,)).fetchone()
+        return self._node(row, self._sources_for(row[0])) if row else None
+
+    def _sources_by_id(self, query: str, params: dict[str, Any]) -> dict[str, list[SourceRef]]:
+        sources: dict[str, list[SourceRef]] = {}
+        for entity_id, source_id, title, url, confidence in self._conn.execute(query, params):
+            sources.setdefault(entity_id, []).append(
+                SourceRef.shared(source_id, title, url, confidence)
+            )
+        return sources
+
+    def nodes_by_type(self, entity_type: str, *, limit: int = -1) -> list[Node]:
+        params = {"type": entity_type, "limit": limit}
+        sources = self._sources_by_id(_SELECT_NODES_BY_TYPE_SOURCES, params)
+        return [
+            self._node(row, sources.get(row[0], []))
+            for row in self._conn.execute(_SELECT_NODES_BY_TYPE, params)
+        ]
+
+    def nodes_by_canonical_key(self, canonical_key: str) -> list[Node]:
+        params = {"key": canonical_key}
+        sources = self._sources_by_id(_SELECT_NODES_BY_KEY_SOURCES, params)
+        return [
+            self._node(row, sources.get(row[0], []))
+            for row in self._conn.execute(_SELECT_NODES_BY_KEY, params)
+        ]
+
+    def edges_of(self, entity_id: str, *, direction: str = "both") -> list[Edge]:
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"direction must be one of out/in/both, got '{direction}'")
+        params = {"id": entity_id}
+        rows: list[tuple[Any, ...]] = []
+        if direction in ("out", "both"):
+            rows.extend(self._conn.execute(_SELECT_EDGES_OUT, params))
+        if direction in ("in", "both"):
+            rows.extend(self._conn.execute(_SELECT_EDGES_IN, params))
+        sources = self._sources_by_id(_SELECT_EDGE_SOURCES[direction], params)
+        return [self._edge(row, sources.get(row[0], [])) for row in rows]
+
+    def neighbors(self, entity_id: str, *, direction: str = "both") -> list[Node]:
+        """Nodes one edge away, ordered by id; two queries whatever the degree."""
+        if direction not in _NEIGHBOR_IDS:
+            raise ValueError(f"direction must be one of out/in/both, got '{direction}'")
+        params = {"id": entity_id}
+        sources = self._sources_by_id(_SELECT_NEIGHBOR_SOURCES[direction], params)
+        return [
+            self._node(row, sources.get(row[0], []))
+            for row in self._conn.execute(_SELECT_NEIGHBORS[direction], params)
+        ]
+
+    def runs(self) -> list[RunMeta]:
+        return [RunMeta(*row) for row in self._conn.execute(_SELECT_RUNS)]
+
+    def load_run(self, run_id: str) -> GraphPayload | None:
+        row = self._conn.execute(_SELECT_RUN, (run_id,)).fetchone()
+        if row is None:
+            return None
+        sources: dict[str, list[SourceRef]] = {}
+        for entity_id, source_id, title, url, confidence in self._conn.execute(
+            _SELECT_RUN_SOURCES, (run_id,)
+        ):
+            sources.setdefault(entity_id, []).append(
+                SourceRef.shared(source_id, title, url, confidence)
+            )
+        nodes = [
+            self._node(r, sources.get(r[0], []))
+            for r in self._conn.execute(_SELECT_RUN_NODES, (run_id,))
+        ]
+        edges = [
+            self._edge(r, sources.get(r[0], []))
+            for r in self._conn.execute(_SELECT_RUN_EDGES, (run_id,))
+        ]
+        return GraphPayload(run_meta=RunMeta(*row), nodes=nodes, edges=edges)
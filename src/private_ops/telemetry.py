@@ -0,0 +1,277 @@
+"""
+CTW: Proverbs 4:7 — “Wisdom is the principal thing; therefore get wisdom”
+Intent: Show where a run spends its time without slowing runs that do not ask.
+Theme: Wisdom
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any, TextIO
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (1, 5, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)
+MAX_SPANS = 10_000
+
+Labels = tuple[tuple[str, str], ...]
+
+_current_span: ContextVar[int | None] = ContextVar("private_ops_span", default=None)
+_span_ids = itertools.count(1)
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class Span:
+    """A timed operation; set attributes while it runs with ``span.set``."""
+
+    __slots__ = (
+        "_telemetry", "name", "attrs", "span_id", "parent_id", "start", "_started", "_token",
+    )
+
+    def __init__(self, telemetry: "Telemetry", name: str, attrs: dict[str, Any]) -> None:
+        self._telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+        self.span_id = 0
+        self.parent_id: int | None = None
+        self.start = 0.0
+        self._started = 0.0
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def __enter__(self) -> "Span":
+        self.span_id = next(_span_ids)
+        self.parent_id = _current_span.get()
+        self._token = _current_span.set(self.span_id)
+        self.start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        duration = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        self._telemetry._finish(self, duration, "error" if exc_type is not None else "ok")
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        return
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Telemetry:
+    """Span, counter and histogram registry.
+
+    Every finished span also feeds a ``<name>_seconds`` latency histogram
+    labelled with the span's ``transform`` attribute when it has one. Spans
+    are kept in a bounded buffer, or streamed as NDJSON to ``sink`` as they
+    finish. ``prometheus_text`` renders counters and histograms in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, *, enabled: bool = False, max_spans: int = MAX_SPANS) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._spans: deque[dict[str, Any]] = deque(maxlen=max_spans)
+        self._sink: TextIO | None = None
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    def span(self, name: str, **attrs: Any) -> Span | _NoopSpan:
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attrs)
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        **labels: Any,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def _finish(self, span: Span, duration: float, status: str) -> None:
+        record = {
+            "type": "span",
+            "name": span.name,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "start": span.start,
+            "duration_ms": round(duration * 1000, 3),
+            "status": status,
+            "attrs": span.attrs,
+        }
+        transform = span.attrs.get("transform")
+        labels = {"transform": transform} if transform is not None else {}
+        self.observe(f"private_ops_{span.name}_seconds", duration, **labels)
+        with self._lock:
+            if self._sink is not None:
+                self._sink.write(json.dumps(record, sort_keys=True, default=str) + "\n")
+            else:
+                self._spans.append(record)
+
+    def stream_spans(self, sink: TextIO | None) -> None:
+        """Write each span to ``sink`` as it finishes instead of buffering it."""
+        with self._lock:
+            self._sink = sink
+
+    def spans(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._spans)
+
+    def export_ndjson(self, handle: TextIO) -> int:
+        spans = self.spans()
+        for record in spans:
+            handle.write(json.dumps(record, sort_keys=True, default=str) + "\n")
+        return len(spans)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Histogram | None:
+        with self._lock:
+            return self._histograms.get(name, {}).get(_labels(labels))
+
+    def prometheus_text(self) -> str:
+        return "".join(self._prometheus_lines())
+
+    def _prometheus_lines(self) -> Iterator[str]:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+        for name, series in sorted(counters.items()):
+            yield f"# TYPE {name} counter\n"
+            for labels, value in sorted(series.items()):
+                yield f"{name}{_format_labels(labels)} {_format_value(value)}\n"
+        for name, series in sorted(histograms.items()):
+            yield f"# TYPE {name} histogram\n"
+            for labels, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, math.inf), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else _format_value(bound)
+                    yield f"{name}_bucket{_format_labels(labels, le=le)} {cumulative}\n"
+                yield f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}\n"
+                yield f"{name}_count{_format_labels(labels)} {histogram.count}\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, **extra: str) -> str:
+    items = [*labels, *extra.items()]
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in items) + "}"
+
+
+_TELEMETRY = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    return _TELEMETRY
+
+
+def enable_telemetry(*, reset: bool = False) -> Telemetry:
+    if reset:
+        _TELEMETRY.reset()
+    _TELEMETRY.enabled = True
+    return _TELEMETRY
+
+
+def disable_telemetry() -> None:
+    _TELEMETRY.enabled = False
+    _TELEMETRY.stream_spans(None)
+
+
+def span(name: str, **attrs: Any) -> Span | _NoopSpan:
+    """Time a block as a span; a shared no-op when telemetry is disabled."""
+    if not _TELEMETRY.enabled:
+        return _NOOP_SPAN
+    return Span(_TELEMETRY, name, attrs)
+
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    if _TELEMETRY.enabled:
+        _TELEMETRY.count(name, value, **labels)
+
+
+def observe(
+    name: str,
+    value: float,
+    buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    **labels: Any,
+) -> None:
+    if _TELEMETRY.enabled:
+        _TELEMETRY.observe(name, value, buckets, **labels)
@@ -1,5 +1,28 @@
-from private_ops.transforms import phone as _phone  # noqa: F401
+from private_ops.transforms.aio import dispatch_async, dispatch_many_async
+from private_ops.transforms.cache import TransformCache, set_default_cache
 from private_ops.transforms.dispatcher import dispatch
-from private_ops.transforms.registry import get_transform, list_transforms, register
+from private_ops.transforms.registry import (
+    get_spec,
+    get_transform,
+    list_transforms,
+    load_transforms,
+    register,
+    register_lazy,
+)
+from private_ops.transforms.scheduler import RateLimit, TransformScheduler
 
-__all__ = ["dispatch", "register", "get_transform", "list_transforms"]
+__all__ = [
+    "dispatch",
+    "dispatch_async",
+    "dispatch_many_async",
+    "register",
+    "register_lazy",
+    "get_spec",
+    "get_transform",
+    "list_transforms",
+    "load_transforms",
+    "TransformCache",
+    "TransformScheduler",
+    "RateLimit",
+    "set_default_cache",
+]
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor
+from functools import partial
+
+from private_ops.protocol.models import GraphPayload, TransformRequest, TransformResponse
+from private_ops.telemetry import span
+from private_ops.transforms.cache import TransformCache
+from private_ops.transforms.dispatcher import (
+    annotated,
+    cached_response,
+    graph_response,
+    record_failure,
+    record_response,
+    resolve_cache,
+    resolve_run_meta,
+    unknown_transform_response,
+)
+from private_ops.transforms.registry import TransformSpec, get_spec
+
+_SEMAPHORES: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+
+def _semaphore(spec: TransformSpec) -> asyncio.Semaphore | None:
+    if spec.concurrency is None:
+        return None
+    per_loop = _SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    semaphore = per_loop.get(spec.name)
+    if semaphore is None:
+        semaphore = per_loop[spec.name] = asyncio.Semaphore(spec.concurrency)
+    return semaphore
+
+
+def _timeout_response(request: TransformRequest, timeout: float) -> TransformResponse:
+    return TransformResponse(
+        ok=False,
+        status="error",
+        graph=GraphPayload(run_meta=resolve_run_meta(request)),
+        errors=[f"Transform '{request.transform}' timed out after {timeout:g}s."],
+    )
+
+
+def _failure_response(request: TransformRequest, exc: Exception) -> TransformResponse:
+    return TransformResponse(
+        ok=False,
+        status="error",
+        graph=GraphPayload(run_meta=resolve_run_meta(request)),
+        errors=[f"Transform '{request.transform}' failed: {type(exc).__name__}: {exc}"],
+    )
+
+
+async def _run(
+    spec: TransformSpec,
+    request: TransformRequest,
+    executor: Executor | None,
+) -> GraphPayload:
+    with span("transform", transform=spec.name):
+        if spec.is_async:
+            return await spec.fn(request)  # type: ignore[misc]
+        loop = asyncio.get_running_loop()
+        call = partial(spec.fn, request)
+        return await loop.run_in_executor(executor, call)  # type: ignore[arg-type]
+
+
+async def dispatch_async(
+    request: TransformRequest,
+    *,
+    timeout: float | None = None,
+    executor: Executor | None = None,
+    cache: TransformCache | None = None,
+    use_cache: bool = True,
+    refresh: bool = False,
+) -> TransformResponse:
+    """Async counterpart of ``dispatch``.
+
+    Coroutine transforms are awaited; sync transforms run on ``executor``
+    (the loop's default thread pool when ``None``). Transforms registered
+    with ``concurrency`` share a per-loop semaphore. ``timeout`` (or the
+    transform's registered timeout) bounds the wait including time queued on
+    the semaphore; a sync transform that times out keeps running in its
+    worker thread, but its result is discarded.
+    """
+    with span("dispatch", transform=request.transform) as current:
+        try:
+            response, cached = await _dispatch_async(
+                request, timeout, executor, cache, use_cache, refresh
+            )
+        except Exception:
+            current.set("status", "error")
+            record_failure(request.transform)
+            raise
+        current.set("status", response.status)
+    record_response(request.transform, response, cached=cached)
+    return response
+
+
+async def _dispatch_async(
+    request: TransformRequest,
+    timeout: float | None,
+    executor: Executor | None,
+    cache: TransformCache | None,
+    use_cache: bool,
+    refresh: bool,
+) -> tuple[TransformResponse, bool]:
+    spec = get_spec(request.transform)
+    if spec is None:
+        return unknown_transform_response(request), False
+
+    cache = resolve_cache(cache, use_cache)
+    key, hit = cached_response(spec, request, cache, refresh)
+    if hit is not None:
+        return hit, True
+
+    run_meta = resolve_run_meta(request)
+    transform_request = TransformRequest(transform=request.transform, inputs=request.inputs, run_meta=run_meta)
+    deadline = timeout if timeout is not None else spec.timeout
+
+    async def _guarded() -> GraphPayload:
+        semaphore = _semaphore(spec)
+        if semaphore is None:
+            return await _run(spec, transform_request, executor)
+        async with semaphore:
+            return await _run(spec, transform_request, executor)
+
+    try:
+        graph = await asyncio.wait_for(_guarded(), deadline)
+    except asyncio.TimeoutError:
+        return _timeout_response(transform_request, deadline or 0.0), False
+
+    response = graph_response(graph)
+    if cache is not None:
+        cache.put(request.transform, key, response)
+    return annotated(spec, request, response), False
+
+
+async def _aiter(
+    requests: Iterable[TransformRequest] | AsyncIterable[TransformRequest],
+) -> AsyncIterator[TransformRequest]:
+    if isinstance(requests, AsyncIterable):
+        async for request in requests:
+            yield request
+    else:
+        for request in requests:
+            yield request
+
+
+async def dispatch_many_async(
+    requests: Iterable[TransformRequest] | AsyncIterable[TransformRequest],
+    *,
+    max_in_flight: int = 100,
+    timeout: float | None = None,
+    executor: Executor | None = None,
+    cache: TransformCache | None = None,
+) -> AsyncIterator[tuple[int, TransformResponse]]:
+    """Dispatch many requests, yielding ``(index, response)`` as each finishes.
+
+    At most ``max_in_flight`` requests are pending at once. A transform that
+    raises yields an error response for its request instead of ending the
+    iteration. Closing the iterator early (or cancelling its consumer)
+    cancels the pending requests.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be >= 1")
+
+    pending: dict[asyncio.Task[TransformResponse], tuple[int, TransformRequest]] = {}
+    source = _aiter(requests).__aiter__()
+    exhausted = False
+    index = 0
+    try:
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    request = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                task = asyncio.create_task(
+                    dispatch_async(request, timeout=timeout, executor=executor, cache=cache)
+                )
+                pending[task] = (index, request)
+                index += 1
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position, request = pending.pop(task)
+                try:
+                    response = task.result()
+                except Exception as exc:
+                    response = _failure_response(request, exc)
+                yield position, response
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
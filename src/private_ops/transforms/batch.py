@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+
+from private_ops.protocol.models import TransformRequest
+from private_ops.transforms.dispatcher import dispatch
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    line: int
+    ok: bool
+    payload: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"line": self.line, **self.payload}
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    ok: int = 0
+    errors: int = 0
+
+    def record(self, result: BatchResult) -> None:
+        self.total += 1
+        if result.ok:
+            self.ok += 1
+        else:
+            self.errors += 1
+
+    def to_dict(self) -> dict[str, int]:
+        return {"total": self.total, "ok": self.ok, "errors": self.errors}
+
+
+def _error_result(line_no: int, message: str) -> BatchResult:
+    return BatchResult(
+        line=line_no,
+        ok=False,
+        payload={"ok": False, "status": "error", "graph": None, "errors": [message]},
+    )
+
+
+def _run_line(line_no: int, line: str) -> BatchResult:
+    try:
+        request = TransformRequest.from_dict(json.loads(line))
+    except (ValueError, KeyError, TypeError) as exc:
+        return _error_result(line_no, f"invalid request on line {line_no}: {exc}")
+
+    # One failing transform must not abort the rest of the batch.
+    try:
+        response = dispatch(request)
+    except Exception as exc:
+        return _error_result(
+            line_no, f"transform failed on line {line_no}: {type(exc).__name__}: {exc}"
+        )
+    return BatchResult(line=line_no, ok=response.ok, payload=response.to_dict())
+
+
+def _run_chunk(chunk: list[tuple[int, str]]) -> list[BatchResult]:
+    return [_run_line(line_no, line) for line_no, line in chunk]
+
+
+def _numbered_lines(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    for line_no, line in enumerate(lines, start=1):
+        if line.strip():
+            yield line_no, line
+
+
+def _make_executor(kind: str, workers: int) -> Executor:
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    raise ValueError(f"executor must be one of {'/'.join(EXECUTOR_KINDS)}, got '{kind}'")
+
+
+def dispatch_batch(
+    lines: Iterable[str],
+    *,
+    workers: int = 4,
+    executor: str = "thread",
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    chunk_size: int = 1,
+) -> Iterator[BatchResult]:
+    """Dispatch NDJSON ``TransformRequest`` lines over a worker pool.
+
+    At most ``max_in_flight`` chunks are queued at once, so memory stays flat
+    regardless of input size. With ``ordered=False`` results are yielded as
+    soon as they finish instead of in input order.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    limit = max_in_flight if max_in_flight is not None else workers * 2
+    if limit < 1:
+        raise ValueError("max_in_flight must be >= 1")
+
+    source = _numbered_lines(lines)
+    with _make_executor(executor, workers) as pool:
+        if ordered:
+            queue: deque[Future[list[BatchResult]]] = deque()
+            while True:
+                chunk = list(islice(source, chunk_size))
+                if chunk:
+                    queue.append(pool.submit(_run_chunk, chunk))
+                if queue and (len(queue) >= limit or not chunk):
+                    yield from queue.popleft().result()
+                if not chunk and not queue:
+                    return
+        else:
+            pending: set[Future[list[BatchResult]]] = set()
+            while True:
+                chunk = list(islice(source, chunk_size))
+                if chunk:
+                    pending.add(pool.submit(_run_chunk, chunk))
+                if pending and (len(pending) >= limit or not chunk):
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+                if not chunk and not pending:
+                    return
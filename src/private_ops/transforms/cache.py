@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from private_ops.protocol.models import GraphPayload, RunMeta, TransformResponse
+
+
+def cache_key(transform: str, version: str, inputs: dict[str, Any]) -> str:
+    """Hash of transform name, transform version and canonical JSON inputs."""
+    canonical = json.dumps(
+        {"transform": transform, "version": version, "inputs": inputs},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _file_size(path: Path) -> int:
+    # Another process may evict the file between the glob and the stat.
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def with_run_meta(response: TransformResponse, run_meta: RunMeta) -> TransformResponse:
+    graph = response.graph
+    return TransformResponse(
+        ok=response.ok,
+        status=response.status,
+        # Fresh lists: callers may extend the graph, which must not reach the cached entry.
+        graph=GraphPayload.prevalidated(
+            run_meta, list(graph.nodes), list(graph.edges), response.errors
+        ),
+        errors=list(response.errors),
+    )
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+class TransformCache:
+    """Two-tier cache of successful ``TransformResponse`` objects.
+
+    The first tier is an in-process LRU of at most ``max_entries`` responses.
+    The optional second tier stores JSON files under ``directory`` and evicts
+    least recently written files once they exceed ``max_bytes``. Entries
+    expire after a TTL in seconds resolved per transform: an explicit
+    ``set_ttl`` wins, then the TTL the transform was registered with, then the
+    cache-wide ``ttl`` (``None`` never expires).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        self._memory: OrderedDict[str, tuple[float, TransformResponse]] = OrderedDict()
+        self._max_entries = max_entries
+        self._dir = Path(directory) if directory is not None else None
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._ttls: dict[str, float | None] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None
+        self.stats = CacheStats()
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+
+    def set_ttl(self, transform: str, ttl: float | None) -> None:
+        self._ttls[transform] = ttl
+
+    def ttl_for(self, transform: str, default: float | None = None) -> float | None:
+        if transform in self._ttls:
+            return self._ttls[transform]
+        return default if default is not None else self._ttl
+
+    def _expired(self, ttl: float | None, created: float) -> bool:
+        return ttl is not None and self._clock() - created > ttl
+
+    def _path(self, key: str) -> Path:
+        assert self._dir is not None
+        return self._dir / key[:2] / f"{key}.json"
+
+    def get(
+        self,
+        transform: str,
+        key: str,
+        *,
+        ttl: float | None = None,
+    ) -> TransformResponse | None:
+        ttl = self.ttl_for(transform, ttl)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, response = entry
+                if not self._expired(ttl, created):
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return response
+                del self._memory[key]
+                self.stats.expired += 1
+
+        response = self._disk_get(key, ttl)
+        with self._lock:
+            if response is None:
+                self.stats.misses += 1
+            else:
+                self.stats.disk_hits += 1
+        return response
+
+    def _disk_get(self, key: str, ttl: float | None) -> TransformResponse | None:
+        if self._dir is None:
+            return None
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        # A truncated or foreign entry is a miss and is evicted, so the next put replaces it.
+        try:
+            record = json.loads(text)
+            created = float(record["created"])
+        except (ValueError, KeyError, TypeError):
+            path.unlink(missing_ok=True)
+            return None
+        if self._expired(ttl, created):
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.stats.expired += 1
+            return None
+        try:
+            response = TransformResponse.from_dict(record["response"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            path.unlink(missing_ok=True)
+            return None
+        self._remember(key, created, response)
+        return response
+
+    def _remember(self, key: str, created: float, response: TransformResponse) -> None:
+        if self._max_entries == 0:
+            return
+        with self._lock:
+            self._memory[key] = (created, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+                self.stats.evictions += 1
+
+    def put(self, transform: str, key: str, response: TransformResponse) -> None:
+        if not response.ok:
+            return
+        created = self._clock()
+        # Keep lists of our own; the caller gets ``response`` back and may extend it.
+        self._remember(key, created, with_run_meta(response, response.graph.run_meta))
+        with self._lock:
+            self.stats.stores += 1
+        if self._dir is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        body = json.dumps(
+            {"created": created, "transform": transform, "response": response.to_dict()}
+        ).encode("utf-8")
+        tmp.write_bytes(body)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        os.replace(tmp, path)
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(_file_size(p) for p in self._dir.glob("*/*.json"))
+            else:
+                self._disk_bytes += len(body) - replaced
+            over_budget = self._disk_bytes > self._max_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        assert self._dir is not None
+        files = []
+        for path in self._dir.glob("*/*.json"):
+            try:
+                files.append((path.stat(), path))
+            except OSError:
+                continue
+        total = sum(stat.st_size for stat, _ in files)
+        files.sort(key=lambda item: item[0].st_mtime)
+        evicted = 0
+        for stat, path in files:
+            if total <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self.stats.evictions += evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = None
+        if self._dir is not None:
+            for path in self._dir.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+
+_DEFAULT_CACHE: TransformCache | None = None
+
+
+def set_default_cache(cache: TransformCache | None) -> None:
+    global _DEFAULT_CACHE
+    _DEFAULT_CACHE = cache
+
+
+def get_default_cache() -> TransformCache | None:
+    return _DEFAULT_CACHE
@@ -1,29 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+
 from private_ops.protocol.models import (
     GraphPayload,
     RunMeta,
     TransformRequest,
     TransformResponse,
 )
-from private_ops.transforms.registry import get_transform, list_transforms
+from private_ops.telemetry import SIZE_BUCKETS, count, observe, span
+from private_ops.transforms.cache import TransformCache, cache_key, get_default_cache, with_run_meta
+from private_ops.transforms.registry import TransformSpec, get_spec, list_transforms
 
 
-def dispatch(request: TransformRequest) -> TransformResponse:
-    transform = get_transform(request.transform)
-    if transform is None:
-        run_meta = request.run_meta or RunMeta(
-            run_id="unknown-run",
-            transform=request.transform,
-        )
-        available = ', '.join(list_transforms()) or 'none'
-        return TransformResponse(
-            ok=False,
-            status="error",
-            graph=GraphPayload(run_meta=run_meta, nodes=[], edges=[]),
-            errors=[f"Unknown transform '{request.transform}'. Available transforms: {available}."],
-        )
+def unknown_transform_response(request: TransformRequest) -> TransformResponse:
+    run_meta = request.run_meta or RunMeta(
+        run_id="unknown-run",
+        transform=request.transform,
+    )
+    available = ', '.join(list_transforms()) or 'none'
+    return TransformResponse(
+        ok=False,
+        status="error",
+        graph=GraphPayload(run_meta=run_meta, nodes=[], edges=[]),
+        errors=[f"Unknown transform '{request.transform}'. Available transforms: {available}."],
+    )
+
 
+def resolve_run_meta(request: TransformRequest) -> RunMeta:
     run_meta = request.run_meta
     if run_meta is None:
         request_id = "request"
@@ -32,8 +36,47 @@ def dispatch(request: TransformRequest) -> TransformResponse:
             transform=request.transform,
             request_id=request_id,
         )
+    return run_meta
+
+
+def resolve_cache(cache: TransformCache | None, use_cache: bool) -> TransformCache | None:
+    if not use_cache:
+        return None
+    return cache if cache is not None else get_default_cache()
+
+
+def cached_response(
+    spec: TransformSpec,
+    request: TransformRequest,
+    cache: TransformCache | None,
+    refresh: bool,
+) -> tuple[str, TransformResponse | None]:
+    if cache is None:
+        return "", None
+    key = cache_key(spec.name, spec.version, spec.cache_inputs(request.inputs))
+    if refresh:
+        return key, None
+    cached = cache.get(spec.name, key, ttl=spec.cache_ttl)
+    if cached is None:
+        return key, None
+    return key, annotated(spec, request, with_run_meta(cached, resolve_run_meta(request)))
+
+
+def annotated(
+    spec: TransformSpec, request: TransformRequest, response: TransformResponse
+) -> TransformResponse:
+    """Apply the transform's ``annotate`` hook; runs after the cache, never before a put."""
+    if spec.annotate is None:
+        return response
+    return TransformResponse(
+        ok=response.ok,
+        status=response.status,
+        graph=spec.annotate(response.graph, request),
+        errors=list(response.errors),
+    )
 
-    graph = transform(TransformRequest(transform=request.transform, inputs=request.inputs, run_meta=run_meta))
+
+def graph_response(graph: GraphPayload) -> TransformResponse:
     errors = graph.validate()
     return TransformResponse(
         ok=len(errors) == 0,
@@ -41,3 +84,79 @@ def dispatch(request: TransformRequest) -> TransformResponse:
         graph=graph,
         errors=errors,
     )
+
+
+def record_response(transform: str, response: TransformResponse, *, cached: bool = False) -> None:
+    """Count the request and its entity output for per-transform telemetry."""
+    count("private_ops_transform_requests_total", transform=transform, status=response.status)
+    if cached:
+        count("private_ops_transform_cache_hits_total", transform=transform)
+    observe(
+        "private_ops_transform_entities",
+        len(response.graph.nodes) + len(response.graph.edges),
+        SIZE_BUCKETS,
+        transform=transform,
+    )
+
+
+def record_failure(transform: str) -> None:
+    """Count a request whose transform raised instead of returning a graph."""
+    count("private_ops_transform_requests_total", transform=transform, status="error")
+
+
+def dispatch(
+    request: TransformRequest,
+    *,
+    cache: TransformCache | None = None,
+    use_cache: bool = True,
+    refresh: bool = False,
+) -> TransformResponse:
+    with span("dispatch", transform=request.transform) as current:
+        try:
+            response, cached = _dispatch(request, cache, use_cache, refresh)
+        except Exception:
+            current.set("status", "error")
+            record_failure(request.transform)
+            raise
+        current.set("status", response.status)
+    record_response(request.transform, response, cached=cached)
+    return response
+
+
+def _run_coroutine(spec: TransformSpec, request: TransformRequest) -> GraphPayload:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(spec.fn(request))  # type: ignore[arg-type]
+    raise RuntimeError(
+        f"Transform '{spec.name}' is async and dispatch() was called from a running event "
+        "loop; await private_ops.transforms.aio.dispatch_async() instead."
+    )
+
+
+def _dispatch(
+    request: TransformRequest,
+    cache: TransformCache | None,
+    use_cache: bool,
+    refresh: bool,
+) -> tuple[TransformResponse, bool]:
+    spec = get_spec(request.transform)
+    if spec is None:
+        return unknown_transform_response(request), False
+
+    cache = resolve_cache(cache, use_cache)
+    key, hit = cached_response(spec, request, cache, refresh)
+    if hit is not None:
+        return hit, True
+
+    run_meta = resolve_run_meta(request)
+    transform_request = TransformRequest(transform=request.transform, inputs=request.inputs, run_meta=run_meta)
+    with span("transform", transform=spec.name):
+        if spec.is_async:
+            graph = _run_coroutine(spec, transform_request)
+        else:
+            graph = spec.fn(transform_request)  # type: ignore[assignment]
+    response = graph_response(graph)  # type: ignore[arg-type]
+    if cache is not None:
+        cache.put(request.transform, key, response)
+    return annotated(spec, request, response), False
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from private_ops.protocol.builder import GraphBuilder
+from private_ops.protocol.models import (
+    GraphPayload,
+    Node,
+    RunMeta,
+    TransformRequest,
+    TransformResponse,
+)
+from private_ops.transforms.dispatcher import dispatch, resolve_run_meta
+
+InputBuilder = Callable[[Node], dict[str, Any]]
+
+
+def default_inputs(node: Node) -> dict[str, Any]:
+    """Feed an entity to a transform as ``{<entity type>: <label>}``."""
+    return {node.type: node.label}
+
+
+@dataclass(frozen=True)
+class ExpansionPolicy:
+    """Which transforms to run for each entity type, and how far to go.
+
+    ``max_depth`` counts hops from the seeds; ``max_fanout`` caps the new
+    entities a single transform call may add to the next frontier, and
+    ``max_nodes`` caps the merged graph.
+    """
+
+    transforms: Mapping[str, Sequence[str]]
+    max_depth: int = 2
+    max_fanout: int = 50
+    max_nodes: int = 10_000
+    inputs: InputBuilder = default_inputs
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ExpansionPolicy":
+        return cls(
+            transforms={str(k): [str(t) for t in v] for k, v in data["transforms"].items()},
+            max_depth=int(data.get("max_depth", 2)),
+            max_fanout=int(data.get("max_fanout", 50)),
+            max_nodes=int(data.get("max_nodes", 10_000)),
+        )
+
+
+@dataclass(frozen=True)
+class HopResult:
+    depth: int
+    graph: GraphPayload
+    expanded: int
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"depth": self.depth, "expanded": self.expanded, "errors": self.errors}
+
+
+class ExpansionEngine:
+    """Breadth-first multi-hop expansion over transform outputs.
+
+    Each hop dispatches the policy's transforms for every frontier entity in
+    parallel, merges the outputs into one ``GraphBuilder`` (deduplicating by
+    stable id) and builds the next frontier from entities not expanded yet.
+    ``iter_hops`` yields a snapshot of the merged graph after every hop.
+    """
+
+    def __init__(
+        self,
+        policy: ExpansionPolicy,
+        *,
+        workers: int = 8,
+        dispatcher: Callable[[TransformRequest], TransformResponse] = dispatch,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.policy = policy
+        self._workers = workers
+        self._dispatch = dispatcher
+
+    def _requests(
+        self,
+        frontier: Iterable[Node],
+        run_meta: RunMeta,
+    ) -> list[tuple[Node, TransformRequest]]:
+        return [
+            (
+                node,
+                TransformRequest(
+                    transform=transform,
+                    inputs=self.policy.inputs(node),
+                    run_meta=RunMeta(
+                        run_id=f"{run_meta.run_id}:{transform}:{node.id}",
+                        transform=transform,
+                        request_id=node.id,
+                    ),
+                ),
+            )
+            for node in frontier
+            for transform in self.policy.transforms.get(node.type, ())
+        ]
+
+    def _dispatch_safely(self, request: TransformRequest) -> TransformResponse:
+        # One failing transform call is reported in its hop, not raised out of the expansion.
+        try:
+            return self._dispatch(request)
+        except Exception as exc:
+            return TransformResponse(
+                ok=False,
+                status="error",
+                graph=GraphPayload(run_meta=resolve_run_meta(request)),
+                errors=[f"{type(exc).__name__}: {exc}"],
+            )
+
+    def iter_hops(self, seeds: Iterable[Node], run_meta: RunMeta) -> Iterator[HopResult]:
+        builder = GraphBuilder(run_meta)
+        seeded: dict[str, Node] = {}
+        for seed in seeds:
+            seeded[seed.id] = builder.merge_node(seed)
+        frontier = list(seeded.values())
+        expanded: set[str] = set()
+
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            for depth in range(1, self.policy.max_depth + 1):
+                frontier = [n for n in frontier if n.id not in expanded]
+                if not frontier:
+                    return
+                expanded.update(n.id for n in frontier)
+                requests = self._requests(frontier, run_meta)
+
+                errors: list[str] = []
+                next_frontier: dict[str, Node] = {}
+                responses = pool.map(lambda item: self._dispatch_safely(item[1]), requests)
+                for (source_node, request), response in zip(requests, responses):
+                    if not response.ok:
+                        errors.extend(
+                            f"{request.transform} on {source_node.id}: {err}" for err in response.errors
+                        )
+                    added = 0
+                    for node in response.graph.nodes:
+                        known = builder.get_node(node.id) is not None
+                        if not known and builder.node_count >= self.policy.max_nodes:
+                            break
+                        builder.merge_node(node)
+                        if known or node.id in expanded or node.id in next_frontier:
+                            continue
+                        if added < self.policy.max_fanout:
+                            next_frontier[node.id] = node
+                            added += 1
+                    for edge in response.graph.edges:
+                        if builder.get_node(edge.from_id) and builder.get_node(edge.to_id):
+                            builder.merge_edge(edge)
+
+                yield HopResult(
+                    depth=depth,
+                    graph=builder.freeze(),
+                    expanded=len(frontier),
+                    errors=errors,
+                )
+                frontier = list(next_frontier.values())
+
+    def expand(self, seeds: Iterable[Node], run_meta: RunMeta) -> GraphPayload:
+        seeds = list(seeds)
+        graph: GraphPayload | None = None
+        for hop in self.iter_hops(seeds, run_meta):
+            graph = hop.graph
+        if graph is None:
+            builder = GraphBuilder(run_meta)
+            for seed in seeds:
+                builder.merge_node(seed)
+            graph = builder.freeze()
+        return graph
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any
+
+from private_ops.protocol.models import GraphPayload, TransformRequest
+from private_ops.protocol.normalize import normalize_phone
+
+
+def normalize_phone_inputs(inputs: dict[str, Any]) -> dict[str, Any]:
+    """Cache-key inputs for phone transforms: every spelling of a number keys alike."""
+    return {**inputs, "phone": normalize_phone(str(inputs.get("phone", "")))}
+
+
+def echo_raw_phone(graph: GraphPayload, request: TransformRequest) -> GraphPayload:
+    """Record the caller's own spelling as ``raw`` on the phone nodes.
+
+    Applied after the cache, since a cached graph may have been built for
+    another spelling of the same number.
+    """
+    raw = str(request.inputs.get("phone", ""))
+    nodes = [
+        replace(node, properties={"raw": raw, **node.properties}) if node.type == "phone" else node
+        for node in graph.nodes
+    ]
+    return GraphPayload.prevalidated(graph.run_meta, nodes, list(graph.edges), graph.validate())
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
-from private_ops.protocol.ids import edge_id, node_id
+from private_ops.protocol.builder import GraphBuilder
 from private_ops.protocol.models import (
-    Edge,
     GraphPayload,
-    Node,
     RunMeta,
     SourceRef,
     TransformRequest,
 )
 from private_ops.protocol.normalize import normalize_phone
+from private_ops.transforms.inputs import echo_raw_phone, normalize_phone_inputs
 from private_ops.transforms.registry import register
 
+_INPUT_SOURCE = SourceRef.shared(source_id="input", title="provided input", confidence=1.0)
+_LOW_CONF_SOURCE = SourceRef.shared(
+    source_id="starter-phone-transform",
+    title="Deterministic placeholder entity generation",
+    confidence=0.3,
+)
+
 
-@register("resolve.phone_to_entities")
+@register(
+    "resolve.phone_to_entities", normalize_inputs=normalize_phone_inputs, annotate=echo_raw_phone
+)
 def resolve_phone_to_entities(request: TransformRequest) -> GraphPayload:
     raw_phone = str(request.inputs.get("phone", ""))
     normalized_phone = normalize_phone(raw_phone)
@@ -22,65 +30,53 @@ def resolve_phone_to_entities(request: TransformRequest) -> GraphPayload:
         run_id=f"run:{request.transform}:{normalized_phone}",
         transform=request.transform,
     )
-
-    low_conf_source = SourceRef(
-        source_id="starter-phone-transform",
-        title="Deterministic placeholder entity generation",
-        confidence=0.3,
-    )
+    builder = GraphBuilder(run_meta)
 
     phone_key = f"phone:{normalized_phone}"
-    phone = Node(
-        id=node_id("phone", phone_key),
-        type="phone",
-        canonical_key=phone_key,
-        label=normalized_phone,
-        properties={"raw": raw_phone, "normalized": normalized_phone, "confidence": 1.0},
-        sources=[SourceRef(source_id="input", title="provided input", confidence=1.0)],
+    phone = builder.add_node(
+        "phone",
+        phone_key,
+        normalized_phone,
+        properties={"normalized": normalized_phone, "confidence": 1.0},
+        sources=[_INPUT_SOURCE],
     )
 
     person_key = f"person:placeholder:{normalized_phone}"
-    person = Node(
-        id=node_id("person", person_key),
-        type="person",
-        canonical_key=person_key,
-        label=f"Possible person owner {normalized_phone[-4:] if normalized_phone else 'unknown'}",
+    person = builder.add_node(
+        "person",
+        person_key,
+        f"Possible person owner {normalized_phone[-4:] if normalized_phone else 'unknown'}",
         properties={"placeholder": True, "confidence": 0.3},
-        sources=[low_conf_source],
+        sources=[_LOW_CONF_SOURCE],
     )
 
     org_key = f"organization:placeholder:{normalized_phone}"
-    org = Node(
-        id=node_id("organization", org_key),
-        type="organization",
-        canonical_key=org_key,
-        label=f"Possible organization owner {normalized_phone[-4:] if normalized_phone else 'unknown'}",
+    org = builder.add_node(
+        "organization",
+        org_key,
+        f"Possible organization owner {normalized_phone[-4:] if normalized_phone else 'unknown'}",
         properties={"placeholder": True, "confidence": 0.3},
-        sources=[low_conf_source],
+        sources=[_LOW_CONF_SOURCE],
     )
 
     person_edge_key = f"associated_with:{phone_key}->{person_key}"
     org_edge_key = f"associated_with:{phone_key}->{org_key}"
 
-    edges = [
-        Edge(
-            id=edge_id("associated_with", phone.id, person.id, person_edge_key),
-            type="associated_with",
-            from_id=phone.id,
-            to_id=person.id,
-            canonical_key=person_edge_key,
-            properties={"confidence": 0.3},
-            sources=[low_conf_source],
-        ),
-        Edge(
-            id=edge_id("associated_with", phone.id, org.id, org_edge_key),
-            type="associated_with",
-            from_id=phone.id,
-            to_id=org.id,
-            canonical_key=org_edge_key,
-            properties={"confidence": 0.3},
-            sources=[low_conf_source],
-        ),
-    ]
+    builder.add_edge(
+        "associated_with",
+        phone.id,
+        person.id,
+        person_edge_key,
+        properties={"confidence": 0.3},
+        sources=[_LOW_CONF_SOURCE],
+    )
+    builder.add_edge(
+        "associated_with",
+        phone.id,
+        org.id,
+        org_edge_key,
+        properties={"confidence": 0.3},
+        sources=[_LOW_CONF_SOURCE],
+    )
 
-    return GraphPayload(run_meta=run_meta, nodes=[phone, person, org], edges=edges)
+    return builder.freeze()
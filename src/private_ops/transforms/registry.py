@@ -1,33 +1,208 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import inspect
+import threading
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any, Union
 
 from private_ops.protocol.models import GraphPayload, TransformRequest
 
-TransformFn = Callable[[TransformRequest], GraphPayload]
-_REGISTRY: dict[str, TransformFn] = {}
+SyncTransformFn = Callable[[TransformRequest], GraphPayload]
+AsyncTransformFn = Callable[[TransformRequest], Awaitable[GraphPayload]]
+TransformFn = Union[SyncTransformFn, AsyncTransformFn]
+InputNormalizer = Callable[[dict[str, Any]], dict[str, Any]]
+GraphAnnotator = Callable[[GraphPayload, TransformRequest], GraphPayload]
+
+ENTRY_POINT_GROUP = "private_ops.transforms"
+
+# Transform name -> "module" or "module:attr"; the module is imported on first use.
+BUILTIN_TRANSFORMS = {
+    "resolve.phone_to_entities": "private_ops.transforms.phone",
+    "starter.phone_to_entities": "private_ops.transforms.starter",
+}
+
+
+@dataclass(frozen=True)
+class TransformSpec:
+    name: str
+    fn: TransformFn
+    version: str = "1"
+    cache_ttl: float | None = None
+    is_async: bool = False
+    concurrency: int | None = None
+    timeout: float | None = None
+    source: str | None = None
+    rate_limit: float | None = None
+    burst: int | None = None
+    expected_latency: float | None = None
+    cost: float = 0.0
+    normalize_inputs: InputNormalizer | None = None
+    annotate: GraphAnnotator | None = None
+
+    @property
+    def limit_key(self) -> str:
+        """Name of the upstream source whose rate limit this transform shares."""
+        return self.source or self.name
+
+    def cache_inputs(self, inputs: dict[str, Any]) -> dict[str, Any]:
+        """Inputs as the cache keys them, so equivalent spellings share one entry."""
+        return self.normalize_inputs(inputs) if self.normalize_inputs is not None else inputs
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "is_async": self.is_async,
+            "cache_ttl": self.cache_ttl,
+            "concurrency": self.concurrency,
+            "timeout": self.timeout,
+            "source": self.limit_key,
+            "rate_limit": self.rate_limit,
+            "burst": self.burst,
+            "expected_latency": self.expected_latency,
+            "cost": self.cost,
+        }
+
+
+_REGISTRY: dict[str, TransformSpec] = {}
+_MANIFEST: dict[str, str] = dict(BUILTIN_TRANSFORMS)
+_entry_points_loaded = False
+_load_lock = threading.RLock()
 
 
 class DuplicateTransformNameError(ValueError):
     """Raised when attempting to register a transform name that already exists."""
 
 
-def register(name: str, *, override: bool = False) -> Callable[[TransformFn], TransformFn]:
+def register(
+    name: str,
+    *,
+    override: bool = False,
+    version: str = "1",
+    cache_ttl: float | None = None,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+    source: str | None = None,
+    rate_limit: float | None = None,
+    burst: int | None = None,
+    expected_latency: float | None = None,
+    cost: float = 0.0,
+    normalize_inputs: InputNormalizer | None = None,
+    annotate: GraphAnnotator | None = None,
+) -> Callable[[TransformFn], TransformFn]:
+    """Register a transform with its scheduling metadata.
+
+    ``source`` names the upstream service it calls; transforms sharing a
+    source share its ``rate_limit`` (calls per second, refilling a bucket of
+    ``burst`` tokens). Within a priority the scheduler runs lower
+    ``expected_latency`` (seconds) first; ``cost`` (any unit the caller
+    budgets in, e.g. API credits) does not affect ordering and is only
+    reported as queued and spent. ``normalize_inputs`` maps inputs
+    to the canonical form the response cache is keyed on; ``annotate`` then
+    adds what depends on the exact request (e.g. the raw input spelling) to
+    every response, cached or not, so the cache never stores it.
+    """
+    if concurrency is not None and concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    if rate_limit is not None and rate_limit <= 0:
+        raise ValueError("rate_limit must be > 0")
+    if burst is not None and burst < 1:
+        raise ValueError("burst must be >= 1")
+    if expected_latency is not None and expected_latency < 0:
+        raise ValueError("expected_latency must be >= 0")
+    if cost < 0:
+        raise ValueError("cost must be >= 0")
+
     def _decorator(fn: TransformFn) -> TransformFn:
         if name in _REGISTRY and not override:
             raise DuplicateTransformNameError(
                 f"Transform '{name}' is already registered. "
                 "Pass override=True to replace it explicitly."
             )
-        _REGISTRY[name] = fn
+        _REGISTRY[name] = TransformSpec(
+            name=name,
+            fn=fn,
+            version=version,
+            cache_ttl=cache_ttl,
+            is_async=inspect.iscoroutinefunction(fn),
+            concurrency=concurrency,
+            timeout=timeout,
+            source=source,
+            rate_limit=rate_limit,
+            burst=burst,
+            expected_latency=expected_latency,
+            cost=cost,
+            normalize_inputs=normalize_inputs,
+            annotate=annotate,
+        )
         return fn
 
     return _decorator
 
 
+def register_lazy(name: str, target: str, *, override: bool = False) -> None:
+    """Declare that importing ``target`` (``module`` or ``module:attr``) provides ``name``.
+
+    Nothing is imported until the transform is first looked up. A plain
+    callable named by ``module:attr`` is registered under ``name`` if the
+    module does not register it itself.
+    """
+    with _load_lock:
+        if not override and (name in _REGISTRY or name in _MANIFEST):
+            raise DuplicateTransformNameError(
+                f"Transform '{name}' is already registered. "
+                "Pass override=True to replace it explicitly."
+            )
+        _MANIFEST[name] = target
+
+
+def _discover_entry_points() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    with _load_lock:
+        if _entry_points_loaded:
+            return
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            # Built-ins and earlier entries win over later duplicates.
+            _MANIFEST.setdefault(entry_point.name, entry_point.value)
+        _entry_points_loaded = True
+
+
+def _load(name: str) -> TransformSpec | None:
+    with _load_lock:
+        spec = _REGISTRY.get(name)
+        if spec is not None:
+            return spec
+        if name not in _MANIFEST:
+            _discover_entry_points()
+        target = _MANIFEST.get(name)
+        if target is None:
+            return None
+        loaded = EntryPoint(name=name, value=target, group=ENTRY_POINT_GROUP).load()
+        if name not in _REGISTRY and callable(loaded):
+            register(name)(loaded)
+        return _REGISTRY.get(name)
+
+
+def get_spec(name: str) -> TransformSpec | None:
+    spec = _REGISTRY.get(name)
+    return spec if spec is not None else _load(name)
+
+
 def get_transform(name: str) -> TransformFn | None:
-    return _REGISTRY.get(name)
+    spec = get_spec(name)
+    return spec.fn if spec is not None else None
 
 
 def list_transforms() -> list[str]:
-    return sorted(_REGISTRY)
+    """Registered and declared transform names; listing imports nothing."""
+    _discover_entry_points()
+    return sorted(set(_REGISTRY) | set(_MANIFEST))
+
+
+def load_transforms() -> list[str]:
+    """Import every declared transform up front, e.g. before serving requests."""
+    return [name for name in list_transforms() if get_spec(name) is not None]
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+from private_ops.protocol.models import TransformRequest, TransformResponse
+from private_ops.telemetry import observe
+from private_ops.transforms.cache import TransformCache
+from private_ops.transforms.dispatcher import (
+    cached_response,
+    dispatch,
+    record_response,
+    resolve_cache,
+)
+from private_ops.transforms.registry import TransformSpec, get_spec
+
+DEFAULT_INVESTIGATION = "default"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float
+    burst: int = 1
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``; starts full."""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated")
+
+    def __init__(self, rate: float, burst: int = 1, *, now: float = 0.0) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = now
+
+    def tokens(self, now: float) -> float:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+        return self._tokens
+
+    def take(self, now: float) -> bool:
+        if self.tokens(now) < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available."""
+        return max(0.0, (1 - self.tokens(now)) / self.rate)
+
+
+class _Job:
+    __slots__ = ("request", "investigation", "limit_key", "cost", "enqueued", "future")
+
+    def __init__(
+        self,
+        request: TransformRequest,
+        investigation: str,
+        limit_key: str,
+        cost: float,
+        enqueued: float,
+    ) -> None:
+        self.request = request
+        self.investigation = investigation
+        self.limit_key = limit_key
+        self.cost = cost
+        self.enqueued = enqueued
+        self.future: Future[TransformResponse] = Future()
+
+
+class _Investigation:
+    __slots__ = ("queues", "queued", "running", "completed", "cost_spent")
+
+    def __init__(self) -> None:
+        # limit key -> heap of ((-priority, expected latency, seq), job)
+        self.queues: dict[str, list[tuple[tuple[float, float, int], _Job]]] = {}
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.cost_spent = 0.0
+
+
+class TransformScheduler:
+    """Run transform requests on worker threads under per-source rate limits.
+
+    Every investigation has its own priority queue; workers take from the
+    investigations round-robin so one large run cannot starve the others.
+    Within an investigation the highest ``priority`` runs first, then the
+    lowest registered ``expected_latency``. Queues are split by upstream
+    source, and a source whose token bucket is empty is skipped rather than
+    blocking the queue, so work for other sources keeps every worker busy.
+
+    Bucket limits come from the transforms' registered ``rate_limit`` and
+    ``burst`` (the first registration seen for a source wins);
+    ``rate_limits`` overrides them per source. A request already answered
+    by ``cache`` (the default cache when ``None``) completes at submit time
+    without queueing or spending a token. ``snapshot`` reports the backlog
+    per investigation, transform and source.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 8,
+        rate_limits: Mapping[str, RateLimit] | None = None,
+        dispatcher: Callable[[TransformRequest], TransformResponse] = dispatch,
+        cache: TransformCache | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self._dispatch = dispatcher
+        self._cache = cache
+        self._clock = clock
+        self._rate_limits = dict(rate_limits or {})
+        self._cond = threading.Condition()
+        self._investigations: dict[str, _Investigation] = {}
+        self._order: deque[str] = deque()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._seq = itertools.count()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"private-ops-scheduler-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        request: TransformRequest,
+        *,
+        investigation: str = DEFAULT_INVESTIGATION,
+        priority: int = 0,
+    ) -> Future[TransformResponse]:
+        """Queue ``request``; higher ``priority`` runs sooner within its investigation."""
+        spec = get_spec(request.transform)
+        if self._closed:
+            raise RuntimeError("cannot submit after shutdown")
+        if spec is not None:
+            _, hit = cached_response(spec, request, resolve_cache(self._cache, True), False)
+            if hit is not None:
+                record_response(request.transform, hit, cached=True)
+                done: Future[TransformResponse] = Future()
+                done.set_result(hit)
+                return done
+        limit_key = spec.limit_key if spec is not None else request.transform
+        expected = (spec.expected_latency or 0.0) if spec is not None else 0.0
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("cannot submit after shutdown")
+            now = self._clock()
+            self._ensure_bucket(limit_key, spec, now)
+            state = self._investigations.get(investigation)
+            if state is None:
+                state = self._investigations[investigation] = _Investigation()
+                self._order.append(investigation)
+            job = _Job(request, investigation, limit_key, spec.cost if spec else 0.0, now)
+            key = (-priority, expected, next(self._seq))
+            heapq.heappush(state.queues.setdefault(limit_key, []), (key, job))
+            state.queued += 1
+            self._queued += 1
+            self._cond.notify()
+        return job.future
+
+    def _ensure_bucket(self, limit_key: str, spec: TransformSpec | None, now: float) -> None:
+        if limit_key in self._buckets:
+            return
+        limit = self._rate_limits.get(limit_key)
+        if limit is None and spec is not None and spec.rate_limit is not None:
+            limit = RateLimit(spec.rate_limit, spec.burst or 1)
+        if limit is not None:
+            self._buckets[limit_key] = TokenBucket(limit.rate, limit.burst, now=now)
+
+    def _take(self, now: float) -> tuple[_Job | None, float | None]:
+        """Pop the next runnable job, or return how long until a bucket refills."""
+        wait: float | None = None
+        for _ in range(len(self._order)):
+            if not self._order:
+                break
+            name = self._order[0]
+            self._order.rotate(-1)
+            state = self._investigations[name]
+            best: tuple[tuple[float, float, int], str] | None = None
+            for limit_key, heap in state.queues.items():
+                while heap and heap[0][1].future.cancelled():
+                    heapq.heappop(heap)
+                    state.queued -= 1
+                    self._queued -= 1
+                if not heap:
+                    continue
+                bucket = self._buckets.get(limit_key)
+                if bucket is not None and bucket.tokens(now) < 1:
+                    delay = bucket.wait_time(now)
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+                if best is None or heap[0][0] < best[0]:
+                    best = (heap[0][0], limit_key)
+            if best is None:
+                self._prune(name, state)
+                continue
+            heap = state.queues[best[1]]
+            _, job = heapq.heappop(heap)
+            if not heap:
+                del state.queues[best[1]]
+            bucket = self._buckets.get(best[1])
+            if bucket is not None:
+                bucket.take(now)
+            state.queued -= 1
+            state.running += 1
+            self._queued -= 1
+            self._running += 1
+            return job, None
+        return None, wait
+
+    def _prune(self, name: str, state: _Investigation) -> None:
+        if state.queued == 0 and state.running == 0:
+            state.queues.clear()
+            del self._investigations[name]
+            self._order.remove(name)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    job, wait = self._take(self._clock())
+                    if job is not None:
+                        break
+                    if self._closed and self._queued == 0:
+                        return
+                    self._cond.wait(wait)
+            self._run(job)
+
+    def _run(self, job: _Job) -> None:
+        ran = job.future.set_running_or_notify_cancel()
+        try:
+            if ran:
+                waited = self._clock() - job.enqueued
+                observe("private_ops_scheduler_wait_seconds", waited, source=job.limit_key)
+                try:
+                    response = self._dispatch(job.request)
+                except BaseException as exc:
+                    job.future.set_exception(exc)
+                else:
+                    job.future.set_result(response)
+        finally:
+            with self._cond:
+                state = self._investigations[job.investigation]
+                state.running -= 1
+                self._running -= 1
+                if ran:
+                    state.completed += 1
+                    state.cost_spent += job.cost
+                    self._completed += 1
+                self._prune(job.investigation, state)
+                if self._closed:
+                    self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Backlog and queue depth per investigation and per upstream source."""
+        with self._cond:
+            now = self._clock()
+            sources: dict[str, dict[str, Any]] = {}
+            investigations: dict[str, dict[str, Any]] = {}
+            for name, state in self._investigations.items():
+                transforms: dict[str, int] = {}
+                oldest: float | None = None
+                cost_queued = 0.0
+                for limit_key, heap in state.queues.items():
+                    source = sources.setdefault(limit_key, {"queued": 0})
+                    for _, job in heap:
+                        if job.future.cancelled():
+                            continue
+                        source["queued"] += 1
+                        transforms[job.request.transform] = (
+                            transforms.get(job.request.transform, 0) + 1
+                        )
+                        cost_queued += job.cost
+                        if oldest is None or job.enqueued < oldest:
+                            oldest = job.enqueued
+                investigations[name] = {
+                    "queued": sum(transforms.values()),
+                    "running": state.running,
+                    "completed": state.completed,
+                    "cost_queued": round(cost_queued, 6),
+                    "cost_spent": round(state.cost_spent, 6),
+                    "oldest_wait_s": round(now - oldest, 3) if oldest is not None else 0.0,
+                    "transforms": dict(sorted(transforms.items())),
+                }
+            for limit_key, bucket in self._buckets.items():
+                sources.setdefault(limit_key, {"queued": 0}).update(
+                    rate=bucket.rate,
+                    burst=bucket.burst,
+                    tokens=round(bucket.tokens(now), 3),
+                    next_token_s=round(bucket.wait_time(now), 3),
+                )
+            return {
+                "workers": len(self._threads),
+                "running": self._running,
+                "queued": sum(item["queued"] for item in investigations.values()),
+                "completed": self._completed,
+                "investigations": dict(sorted(investigations.items())),
+                "sources": dict(sorted(sources.items())),
+            }
+
+    def shutdown(self, *, wait: bool = True, cancel_pending: bool = False) -> None:
+        """Stop accepting work; queued jobs still run unless ``cancel_pending``."""
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                for name, state in list(self._investigations.items()):
+                    for heap in state.queues.values():
+                        for _, job in heap:
+                            job.future.cancel()
+                    self._queued -= state.queued
+                    state.queued = 0
+                    state.queues.clear()
+                    self._prune(name, state)
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> "TransformScheduler":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
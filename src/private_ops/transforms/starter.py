@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-from private_ops.protocol.ids import edge_id, node_id
+from private_ops.protocol.builder import GraphBuilder
 from private_ops.protocol.models import (
-    Edge,
     GraphPayload,
-    Node,
     RunMeta,
     SourceRef,
     TransformRequest,
 )
 from private_ops.protocol.normalize import normalize_phone
+from private_ops.transforms.inputs import echo_raw_phone, normalize_phone_inputs
 from private_ops.transforms.registry import register
 
+_STARTER_SOURCE = SourceRef.shared(
+    source_id="starter-transform",
+    title="Deterministic starter transform",
+    confidence=0.5,
+)
+
 
-@register("starter.phone_to_entities")
+@register(
+    "starter.phone_to_entities", normalize_inputs=normalize_phone_inputs, annotate=echo_raw_phone
+)
 def resolve_phone_to_entities(request: TransformRequest) -> GraphPayload:
     raw_phone = str(request.inputs.get("phone", ""))
     normalized_phone = normalize_phone(raw_phone)
@@ -22,42 +29,34 @@ def resolve_phone_to_entities(request: TransformRequest) -> GraphPayload:
         run_id=f"run:{request.transform}:{normalized_phone}",
         transform=request.transform,
     )
-
-    source = SourceRef(
-        source_id="starter-transform",
-        title="Deterministic starter transform",
-        confidence=0.5,
-    )
+    builder = GraphBuilder(run_meta)
 
     phone_canonical = f"phone:{normalized_phone}"
-    phone_node = Node(
-        id=node_id("phone", phone_canonical),
-        type="phone",
-        canonical_key=phone_canonical,
-        label=normalized_phone,
-        properties={"raw": raw_phone, "normalized": normalized_phone},
-        sources=[source],
+    phone_node = builder.add_node(
+        "phone",
+        phone_canonical,
+        normalized_phone,
+        properties={"normalized": normalized_phone},
+        sources=[_STARTER_SOURCE],
     )
 
     person_canonical = f"person:subscriber:{normalized_phone}"
-    person_node = Node(
-        id=node_id("person", person_canonical),
-        type="person",
-        canonical_key=person_canonical,
-        label=f"Subscriber {normalized_phone[-4:] if normalized_phone else 'unknown'}",
+    person_node = builder.add_node(
+        "person",
+        person_canonical,
+        f"Subscriber {normalized_phone[-4:] if normalized_phone else 'unknown'}",
         properties={"role": "subscriber"},
-        sources=[source],
+        sources=[_STARTER_SOURCE],
     )
 
     relation_key = f"owns:{phone_canonical}->{person_canonical}"
-    phone_edge = Edge(
-        id=edge_id("ownership", phone_node.id, person_node.id, relation_key),
-        type="ownership",
-        from_id=phone_node.id,
-        to_id=person_node.id,
-        canonical_key=relation_key,
+    builder.add_edge(
+        "ownership",
+        phone_node.id,
+        person_node.id,
+        relation_key,
         properties={"asserted_by": "starter_transform"},
-        sources=[source],
+        sources=[_STARTER_SOURCE],
     )
 
-    return GraphPayload(run_meta=run_meta, nodes=[phone_node, person_node], edges=[phone_edge])
+    return builder.freeze()
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import pytest
+
+from private_ops.transforms import registry
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_REGISTRY", dict(registry._REGISTRY))
+    monkeypatch.setattr(registry, "_MANIFEST", dict(registry._MANIFEST))
+    monkeypatch.setattr(registry, "_entry_points_loaded", False)
+    return registry
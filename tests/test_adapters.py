@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import io
+import json
+from xml.etree import ElementTree
+
+from private_ops.adapters.maltego import MaltegoXmlWriter, to_maltego_mapping
+from private_ops.adapters.ndjson import NdjsonGraphWriter
+from private_ops.protocol.models import Node, RunMeta, TransformRequest
+from private_ops.transforms import dispatch
+
+
+def _phone_response():
+    return dispatch(
+        TransformRequest(
+            transform="resolve.phone_to_entities",
+            inputs={"phone": "+1 (555) 123-4567"},
+            run_meta=RunMeta(run_id="run-1", transform="resolve.phone_to_entities"),
+        )
+    )
+
+
+def test_ndjson_writer_matches_record_by_record_dump() -> None:
+    response = _phone_response()
+    graph = response.graph
+    records = [{"type": "run_meta", "data": graph.run_meta.to_dict()}]
+    records.extend({"type": "node", "data": n.to_dict()} for n in graph.nodes)
+    records.extend({"type": "edge", "data": e.to_dict()} for e in graph.edges)
+    records.append({"type": "maltego", "data": to_maltego_mapping(graph)})
+    records.append({"type": "errors", "data": response.errors})
+    expected = "".join(json.dumps(r, sort_keys=True) + "\n" for r in records)
+
+    buffer = io.StringIO()
+    with NdjsonGraphWriter(buffer, buffer_records=2) as writer:
+        writer.write_graph(graph, response.errors)
+
+    assert buffer.getvalue() == expected
+    assert writer.records_written == len(records)
+
+
+def test_ndjson_writer_streams_empty_maltego_record() -> None:
+    buffer = io.StringIO()
+    writer = NdjsonGraphWriter(buffer)
+    writer.write_maltego([], [])
+    writer.flush()
+
+    assert json.loads(buffer.getvalue()) == {
+        "type": "maltego",
+        "data": {"entities": [], "links": []},
+    }
+
+
+def test_maltego_xml_writer_streams_response_message() -> None:
+    response = _phone_response()
+    buffer = io.BytesIO()
+    with MaltegoXmlWriter(buffer, buffer_bytes=64) as writer:
+        writer.write_graph(response.graph, ["partial failure <x>"])
+
+    root = ElementTree.fromstring(buffer.getvalue())
+    entities = root.findall("MaltegoTransformResponseMessage/Entities/Entity")
+    assert [e.findtext("Value") for e in entities] == [n.label for n in response.graph.nodes]
+    assert entities[0].get("Type") == "maltego.PhoneNumber"
+    fields = {f.get("Name"): f.text for f in entities[1].findall("AdditionalFields/Field")}
+    assert fields["private_ops.id"] == response.graph.nodes[1].id
+    assert fields["link#maltego.link.label"] == response.graph.edges[0].type
+    messages = root.findall("MaltegoTransformResponseMessage/UIMessages/UIMessage")
+    assert [(m.get("MessageType"), m.text) for m in messages] == [
+        ("PartialError", "partial failure <x>")
+    ]
+    assert writer.entities_written == len(entities)
+
+
+def test_maltego_xml_writer_escapes_labels_and_properties() -> None:
+    node = Node(
+        id="n1",
+        type="person",
+        canonical_key="a&b",
+        label='<Ann "A" & Co>\x00\uffff',
+        properties={"score": 0.5, "tags": ["x", "y"], "note": "1 < 2\ud800\ufffe"},
+    )
+    buffer = io.BytesIO()
+    with MaltegoXmlWriter(buffer) as writer:
+        writer.write_entity(node)
+
+    entity = ElementTree.fromstring(buffer.getvalue()).find(
+        "MaltegoTransformResponseMessage/Entities/Entity"
+    )
+    assert entity.findtext("Value") == '<Ann "A" & Co>'
+    fields = {f.get("Name"): f.text for f in entity.findall("AdditionalFields/Field")}
+    assert fields["private_ops.canonical_key"] == "a&b"
+    assert fields["score"] == "0.5"
+    assert json.loads(fields["tags"]) == ["x", "y"]
+    assert fields["note"] == "1 < 2"
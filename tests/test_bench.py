@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+
+from private_ops.bench import SHAPES, compare_results, run_suite, synthetic_graph
+from private_ops.cli import main
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_synthetic_graph_is_deterministic_and_valid(shape: str) -> None:
+    graph = synthetic_graph(50, shape=shape, edges_per_node=2.0, seed=7)
+
+    assert len(graph.nodes) == 50
+    assert len(graph.edges) == 100
+    assert graph.validate() == []
+    assert graph.to_dict() == synthetic_graph(50, shape=shape, edges_per_node=2.0, seed=7).to_dict()
+
+
+def test_run_suite_reports_throughput_and_latency() -> None:
+    document = run_suite(["node_id", "validate", "dispatch"], nodes=20, rounds=2, isolate=False)
+
+    assert document["meta"]["nodes"] == 20
+    result = document["results"]["dispatch"]
+    assert result["ops"] == 20
+    assert result["ops_per_sec"] > 0
+    assert result["max_us"] >= result["p99_us"] >= result["p50_us"] >= result["min_us"] > 0
+
+    with pytest.raises(ValueError, match="unknown bench cases"):
+        run_suite(["nope"], isolate=False)
+
+
+def test_compare_results_flags_regressions() -> None:
+    baseline = {"results": {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}}}
+    current = {
+        "results": {
+            "a": {"ops_per_sec": 80.0},
+            "b": {"ops_per_sec": 95.0},
+            "c": {"ops_per_sec": 1.0},
+        }
+    }
+
+    assert compare_results(current, baseline, threshold=0.1) == [
+        {"name": "a", "status": "regressed", "change": -0.2},
+        {"name": "b", "status": "ok", "change": -0.05},
+        {"name": "c", "status": "new", "change": None},
+    ]
+
+
+def test_bench_command_fails_on_regression(tmp_path, monkeypatch, capsys) -> None:
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"validate": {"ops_per_sec": 1e15}}}))
+    out = tmp_path / "bench.json"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "private_ops", "bench", "--cases", "validate", "--nodes", "10", "--rounds", "1",
+            "--no-isolate", "--out", str(out), "--baseline", str(baseline),
+        ],
+    )
+
+    assert main() == 1
+    assert "Regressions against" in capsys.readouterr().out
+    assert set(json.loads(out.read_text())["results"]) == {"validate"}
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+
+from private_ops.cli import main
+from private_ops.protocol.binary import BinaryGraphReader, read_binary_graph, write_binary_graph
+from private_ops.protocol.graph_io import read_graph
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta, SourceRef
+
+
+def _graph() -> GraphPayload:
+    source = SourceRef(source_id="s1", title="Input", url="https://example.test", confidence=0.5)
+    return GraphPayload(
+        run_meta=RunMeta(run_id="run-1", transform="t", request_id="r"),
+        nodes=[
+            Node(id="n1", type="phone", canonical_key="+1555", label="+1555", sources=[source]),
+            Node(
+                id="n2",
+                type="person",
+                canonical_key="ann",
+                label="Ann ü",
+                properties={"confidence": 0.9, "tags": ["a"]},
+                sources=[source],
+            ),
+        ],
+        edges=[
+            Edge(
+                id="e1",
+                type="owns",
+                from_id="n2",
+                to_id="n1",
+                canonical_key="k",
+                properties={"confidence": 0.9, "tags": ["a"]},
+            )
+        ],
+    )
+
+
+def test_binary_graph_round_trips_and_decodes_rows_lazily(tmp_path) -> None:
+    graph = _graph()
+    path = tmp_path / "graph.pogb"
+    write_binary_graph(graph, path)
+
+    with BinaryGraphReader(path) as reader:
+        assert (reader.node_count, reader.edge_count) == (2, 1)
+        assert reader.node(1) == graph.nodes[1]
+        assert reader.edge(0) == graph.edges[0]
+        assert reader.as_payload().to_dict() == graph.to_dict()
+        assert reader.validate() == []
+        with pytest.raises(IndexError):
+            reader.node(2)
+
+    assert read_binary_graph(path).to_dict() == graph.to_dict()
+    assert read_graph(path).to_dict() == graph.to_dict()
+
+
+def test_binary_graph_validate_reports_dangling_edges(tmp_path) -> None:
+    graph = _graph()
+    broken = GraphPayload(run_meta=graph.run_meta, nodes=graph.nodes[:1], edges=graph.edges)
+    path = tmp_path / "broken.pogb"
+    write_binary_graph(broken, path)
+
+    with BinaryGraphReader(path) as reader:
+        assert reader.validate() == broken.validate()
+
+
+def test_binary_graph_rejects_foreign_files(tmp_path) -> None:
+    path = tmp_path / "graph.pogb"
+    path.write_bytes(b"{}")
+    with pytest.raises(ValueError, match="not a binary graph"):
+        BinaryGraphReader(path)
+
+
+def test_convert_command_round_trips_ndjson(tmp_path, monkeypatch) -> None:
+    source = tmp_path / "graph.ndjson"
+    binary = tmp_path / "graph.pogb"
+    back = tmp_path / "back.json"
+    lines = [{"type": "run_meta", "data": _graph().run_meta.to_dict()}]
+    lines += [{"type": "node", "data": n.to_dict()} for n in _graph().nodes]
+    lines += [{"type": "edge", "data": e.to_dict()} for e in _graph().edges]
+    source.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+    for argv in (
+        ["private_ops", "convert", str(source), "--out", str(binary)],
+        ["private_ops", "convert", str(binary), "--out", str(back)],
+        ["private_ops", "validate-graph", str(binary)],
+    ):
+        monkeypatch.setattr(sys, "argv", argv)
+        assert main() == 0
+
+    assert json.loads(back.read_text(encoding="utf-8")) == _graph().to_dict()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import dataclasses
+
+from private_ops.protocol.builder import GraphBuilder
+from private_ops.protocol.ids import edge_id, node_id
+from private_ops.protocol.models import Node, RunMeta, SourceRef
+
+
+def test_builder_merges_duplicate_nodes() -> None:
+    low = SourceRef(source_id="low", title="low", confidence=0.2)
+    high = SourceRef(source_id="high", title="high", confidence=0.9)
+    builder = GraphBuilder(RunMeta(run_id="r", transform="t"))
+
+    builder.add_node("person", "person:1", "Old label", properties={"name": "a", "x": 1}, sources=[low])
+    merged = builder.add_node(
+        "person", "person:1", "New label", properties={"name": "b", "y": 2}, sources=[high, low]
+    )
+
+    assert merged.label == "New label"
+    assert merged.properties == {"name": "b", "x": 1, "y": 2}
+    assert merged.sources == [low, high]
+    assert builder.find_node("person", "person:1") is merged
+    assert len(builder.freeze().nodes) == 1
+
+
+def test_builder_tracks_dangling_edges_until_node_arrives() -> None:
+    builder = GraphBuilder(RunMeta(run_id="r", transform="t"))
+    phone = builder.add_node("phone", "phone:1", "1")
+    person_id = node_id("person", "person:1")
+
+    edge = builder.add_edge("owns", phone.id, person_id, "owns:1")
+    assert builder.dangling() == {person_id: {edge.id}}
+    assert builder.freeze().validate() == [f"edge {edge.id} has unknown to node {person_id}"]
+
+    builder.add_node("person", "person:1", "Person")
+    assert builder.dangling() == {}
+    graph = builder.freeze()
+    assert graph.validate() == []
+    assert graph.validate() == type(graph)(graph.run_meta, graph.nodes, graph.edges).validate()
+
+
+def test_builder_merges_nodes_sharing_a_canonical_key_under_another_id() -> None:
+    builder = GraphBuilder(RunMeta(run_id="r", transform="t"))
+    phone = builder.add_node("phone", "phone:1", "1", properties={"raw": "1"})
+    foreign = Node(
+        id="n_foreign", type="phone", canonical_key="phone:1", label="1", properties={"x": 2}
+    )
+    person = builder.add_node("person", "person:1", "Person")
+    early = builder.add_edge("owns", "n_foreign", person.id, "owns:early")
+
+    merged = builder.merge_node(foreign)
+    late = builder.merge_edge(dataclasses.replace(early, id="e_late", canonical_key="owns:late"))
+
+    assert merged.id == phone.id and merged.properties == {"raw": "1", "x": 2}
+    assert builder.get_node("n_foreign") is merged
+    graph = builder.freeze()
+    assert [n.id for n in graph.nodes] == [phone.id, person.id]
+    assert {(e.id, e.from_id) for e in graph.edges} == {
+        (edge_id("owns", phone.id, person.id, "owns:early"), phone.id),
+        (late.id, phone.id),
+    }
+    assert late.id == edge_id("owns", phone.id, person.id, "owns:late")
+    assert graph.validate() == [] and builder.dangling() == {}
+
+
+def test_builder_merges_edges_that_aliasing_makes_identical() -> None:
+    low = SourceRef(source_id="low", title="low", confidence=0.2)
+    high = SourceRef(source_id="high", title="high", confidence=0.9)
+    for foreign_first in (True, False):
+        builder = GraphBuilder(RunMeta(run_id="r", transform="t"))
+        person = builder.add_node("person", "person:1", "Person")
+        foreign = Node(id="n_foreign", type="phone", canonical_key="phone:1", label="1")
+        if foreign_first:
+            builder.merge_node(foreign)
+        builder.add_node("phone", "phone:1", "1")
+        builder.add_edge("owns", node_id("phone", "phone:1"), person.id, "owns", sources=[low])
+        builder.add_edge("owns", foreign.id, person.id, "owns", sources=[high])
+        if not foreign_first:
+            builder.merge_node(foreign)
+
+        graph = builder.freeze()
+        owner = builder.find_node("phone", "phone:1")
+        assert owner is not None and len(graph.nodes) == 2
+        [edge] = graph.edges
+        assert edge.id == edge_id("owns", owner.id, person.id, "owns")
+        assert (edge.from_id, edge.to_id) == (owner.id, person.id)
+        assert edge.sources == [low, high]
+        assert graph.validate() == [] and builder.dangling() == {}
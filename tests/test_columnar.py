@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import io
+import json
+
+from private_ops.adapters.maltego import to_maltego_mapping
+from private_ops.adapters.ndjson import NdjsonGraphWriter
+from private_ops.protocol.columnar import ColumnarGraph
+from private_ops.protocol.models import Edge, GraphPayload, Node, RunMeta, SourceRef, TransformRequest
+from private_ops.transforms import dispatch
+
+
+def _phone_graph() -> GraphPayload:
+    return dispatch(
+        TransformRequest(transform="resolve.phone_to_entities", inputs={"phone": "(555) 123-4567"})
+    ).graph
+
+
+def test_columnar_round_trips_through_object_api() -> None:
+    graph = _phone_graph()
+    columnar = ColumnarGraph.from_payload(graph)
+
+    view = columnar.as_payload()
+    assert len(view.nodes) == 3
+    assert view.nodes[-1] == graph.nodes[-1]
+    assert view.to_dict() == graph.to_dict()
+    assert len(columnar.sources) == 2
+    assert columnar.validate() == []
+
+
+def test_columnar_validate_matches_object_validate() -> None:
+    source = SourceRef(source_id="s", title="s")
+    graph = GraphPayload(
+        run_meta=RunMeta(run_id="r", transform="t"),
+        nodes=[Node(id="n1", type="phone", canonical_key="k", label="l", sources=[source])] * 2,
+        edges=[
+            Edge(id="e1", type="t", from_id="n1", to_id="missing", canonical_key="k"),
+            Edge(id="e2", type="t", from_id="gone", to_id="n1", canonical_key="k"),
+        ],
+    )
+
+    assert ColumnarGraph.from_payload(graph).validate() == graph.validate()
+
+
+def test_columnar_maltego_json_matches_mapping() -> None:
+    graph = _phone_graph()
+    columnar = ColumnarGraph.from_payload(graph)
+
+    buffer = io.StringIO()
+    writer = NdjsonGraphWriter(buffer)
+    writer.write_maltego_json(columnar.iter_maltego_entity_json(), columnar.iter_maltego_link_json())
+    writer.flush()
+
+    expected = json.dumps({"type": "maltego", "data": to_maltego_mapping(graph)}, sort_keys=True)
+    assert buffer.getvalue() == expected + "\n"
@@ -26,3 +26,11 @@ def test_invalid_env_and_provider_rejected():
     errors = cfg.validate()
     assert any("env must be one of" in e for e in errors)
     assert any("provider must be one of" in e for e in errors)
+
+
+def test_unparseable_concurrency_is_reported_not_raised(monkeypatch):
+    monkeypatch.setenv("PRIVATE_OPS_LLM_CONCURRENCY", "four")
+
+    cfg = OpsConfig.from_env()
+    assert cfg.llm_concurrency == 4
+    assert cfg.validate() == ["PRIVATE_OPS_LLM_CONCURRENCY must be an integer, got 'four'"]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import dataclasses
+import re
+
+import pytest
+
+from private_ops.bench import synthetic_graph
+from private_ops.llm import ContextPacker, estimate_tokens
+from private_ops.protocol.builder import GraphBuilder
+from private_ops.protocol.index import GraphIndex
+from private_ops.protocol.models import GraphPayload, RunMeta, SourceRef
+
+CARRIER = SourceRef(
+    source_id="carrier", title="Carrier lookup", url="https://carrier.test", confidence=0.9
+)
+FORUM = SourceRef(source_id="forum", title="Forum post", confidence=0.3)
+
+
+def _star() -> tuple[GraphPayload, dict[str, str]]:
+    builder = GraphBuilder(RunMeta(run_id="r", transform="t"))
+    phone = builder.add_node("phone", "phone:1", "+15550001", sources=[CARRIER])
+    strong = builder.add_node("person", "person:strong", "Strong", sources=[CARRIER])
+    weak = builder.add_node("person", "person:weak", "Weak", sources=[FORUM])
+    far = builder.add_node("email", "email:far", "far@example.test", properties={"confidence": 1.0})
+    builder.add_edge("owned_by", phone.id, strong.id, "e:strong", sources=[CARRIER])
+    builder.add_edge("owned_by", phone.id, weak.id, "e:weak", sources=[FORUM])
+    builder.add_edge("uses", strong.id, far.id, "e:far", sources=[CARRIER])
+    ids = {"phone": phone.id, "strong": strong.id, "weak": weak.id, "far": far.id}
+    return builder.freeze(), ids
+
+
+def test_packer_ranks_by_confidence_and_distance() -> None:
+    graph, ids = _star()
+    packed = ContextPacker(10_000).pack(graph, [ids["phone"]])
+
+    assert packed.node_ids == (ids["phone"], ids["strong"], ids["far"], ids["weak"])
+    assert packed.resolve("N1") == ids["phone"]
+    assert packed.resolve("N4") == ids["weak"]
+    assert len(packed.edge_ids) == 3 and packed.omitted_nodes == packed.omitted_edges == 0
+    # Sources appear once each; entities and links refer to them by alias.
+    assert packed.text.count("Carrier lookup") == 1
+    assert "S1 \"Carrier lookup\" id=carrier url=https://carrier.test" in packed.text
+    assert "N1 -owned_by-> N2 conf=0.9 src=S1" in packed.text
+    assert not re.search(r"[0-9a-f]{24}", packed.text)
+
+
+def test_packer_respects_budget_and_keeps_focus() -> None:
+    graph = synthetic_graph(200, shape="random", edges_per_node=3)
+    focus = graph.nodes[17].id
+    unbounded = ContextPacker(1_000_000, max_depth=2).pack(graph, [focus])
+
+    for budget in (40, 120, 400):
+        packed = ContextPacker(budget, max_depth=2).pack(graph, [focus])
+        assert packed.tokens <= budget
+        assert packed.tokens == estimate_tokens(packed.text)
+        assert packed.node_ids[0] == focus
+        assert packed.omitted_nodes > 0
+        # Every packed link only refers to packed entities.
+        known = set(packed.aliases)
+        for line in packed.text.partition("# links")[2].splitlines()[1:]:
+            left, _, rest = line.partition(" -")
+            assert left in known and rest.split("-> ", 1)[1].split(" ", 1)[0] in known
+    assert len(unbounded.node_ids) > len(packed.node_ids)
+
+    with pytest.raises(ValueError, match="not in graph"):
+        ContextPacker(100).pack(graph, ["0" * 24])
+
+
+def test_packer_memoizes_per_graph_identity() -> None:
+    graph, ids = _star()
+    packer = ContextPacker(10_000)
+
+    first = packer.pack(graph, [ids["phone"]])
+    assert packer.pack(graph, [ids["phone"]]) is first
+    assert (packer.hits, packer.misses) == (1, 1)
+
+    grown = GraphPayload(graph.run_meta, graph.nodes, graph.edges[:2])
+    assert packer.pack(grown, [ids["phone"]]) is not first
+    assert packer.pack(graph, [ids["phone"]], version=7) is not first
+    assert packer.pack(graph, [ids["phone"]], version=7) is packer.pack(
+        graph, [ids["phone"]], version=7
+    )
+    assert packer.misses == 3
+
+
+def test_packer_cache_sees_property_changes() -> None:
+    graph, ids = _star()
+    packer = ContextPacker(10_000)
+    first = packer.pack(graph, [ids["phone"]])
+
+    nodes = [
+        dataclasses.replace(node, properties={**node.properties, "confidence": 0.01})
+        if node.id != ids["phone"]
+        else node
+        for node in graph.nodes
+    ]
+    changed = packer.pack(GraphPayload(graph.run_meta, nodes, graph.edges), [ids["phone"]])
+
+    assert changed is not first and "conf=0.01" in changed.text
+    assert packer.misses == 2
+
+
+def test_packer_keys_indexes_on_identity_and_version() -> None:
+    graph, ids = _star()
+    packer = ContextPacker(10_000)
+    index = GraphIndex(graph)
+    other = GraphIndex(GraphPayload(graph.run_meta, graph.nodes, graph.edges[:1]))
+
+    first = packer.pack(index, [ids["phone"]])
+    assert packer.pack(index, [ids["phone"]]) is first
+    assert (packer.hits, packer.misses) == (1, 1)
+
+    while other.version < index.version:
+        other.add_node(graph.nodes[0])
+    assert other.version == index.version
+    assert packer.pack(other, [ids["phone"]]).edge_ids != first.edge_ids
+
+    index.remove_edge(first.edge_ids[0])
+    after = packer.pack(index, [ids["phone"]])
+    assert first.edge_ids[0] not in after.edge_ids
+    assert packer.misses == 3
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from private_ops.bench import synthetic_graph
+from private_ops.cli import main
+from private_ops.protocol.diff import (
+    DeltaSummary,
+    apply_delta,
+    diff_graphs,
+    iter_delta,
+    iter_payload_records,
+    read_delta,
+)
+from private_ops.protocol.graph_io import read_graph, write_graph
+from private_ops.protocol.models import GraphPayload, RunMeta, SourceRef
+from private_ops.store import GraphStore
+
+
+def _rerun(base: GraphPayload) -> GraphPayload:
+    """``base`` with one node relabelled, one property changed and one removed, one node gone."""
+    nodes = list(base.nodes)
+    first, second = nodes[1], nodes[2]
+    nodes[1] = dataclasses.replace(
+        first,
+        label="Relabelled",
+        properties={**first.properties, "confidence": 0.99, "note": "new"},
+    )
+    nodes[2] = dataclasses.replace(
+        second, properties={}, sources=[SourceRef(source_id="rerun", title="Re-run")]
+    )
+    removed = nodes.pop(3)
+    edges = [e for e in base.edges if removed.id not in (e.from_id, e.to_id)]
+    extra = synthetic_graph(3, shape="chain", seed=9)
+    return GraphPayload(
+        run_meta=RunMeta(run_id="rerun", transform=base.run_meta.transform),
+        nodes=nodes + [dataclasses.replace(extra.nodes[0], id="n_extra")],
+        edges=edges,
+    )
+
+
+def test_delta_roundtrips_and_is_compact() -> None:
+    base = synthetic_graph(200, shape="random", edges_per_node=2)
+    target = _rerun(base)
+    summary = DeltaSummary()
+
+    delta = list(iter_delta(iter_payload_records(base), iter_payload_records(target), summary))
+
+    assert summary.added == 1 and summary.changed == 2
+    assert summary.removed == 1 + (len(base.edges) - len(target.edges))
+    assert summary.unchanged == len(target.nodes) + len(target.edges) - 3
+    assert len(delta) == 1 + summary.added + summary.removed + summary.changed
+    changed = {data["id"]: data for kind, data in delta if kind == "changed"}
+    relabelled = changed[base.nodes[1].id]
+    assert relabelled["fields"] == {"label": "Relabelled"}
+    assert relabelled["set"] == {"confidence": 0.99, "note": "new"}
+    assert changed[base.nodes[2].id]["unset"] == sorted(base.nodes[2].properties)
+
+    patched = apply_delta(base, delta)
+    assert patched.to_dict() == target.to_dict()
+    assert diff_graphs(patched, target) == [("run_meta", target.run_meta.to_dict())]
+
+
+def test_apply_rejects_a_delta_for_another_base() -> None:
+    base = synthetic_graph(20, shape="chain")
+    delta = diff_graphs(base, _rerun(base))
+    drifted = GraphPayload(
+        run_meta=base.run_meta,
+        nodes=[base.nodes[0], dataclasses.replace(base.nodes[1], label="drift"), *base.nodes[2:]],
+        edges=base.edges,
+    )
+
+    with pytest.raises(ValueError, match="does not match the delta"):
+        apply_delta(drifted, delta)
+    with pytest.raises(ValueError, match="is not in the base graph"):
+        apply_delta(GraphPayload(run_meta=base.run_meta), delta)
+
+
+def test_cli_diff_and_apply_between_files_and_store(tmp_path: Path, monkeypatch) -> None:
+    base = synthetic_graph(50, shape="star")
+    target = _rerun(base)
+    base_path, target_path = tmp_path / "base.json", tmp_path / "target.ndjson"
+    write_graph(base, base_path)
+    write_graph(target, target_path)
+    delta_path, out = tmp_path / "delta.ndjson", tmp_path / "patched.pogb"
+
+    monkeypatch.setattr(
+        "sys.argv",
+        ["private_ops", "diff", str(base_path), str(target_path), "--out", str(delta_path)],
+    )
+    assert main() == 0
+    assert len(list(read_delta(delta_path))) < len(base.nodes)
+
+    monkeypatch.setattr(
+        "sys.argv", ["private_ops", "apply", str(base_path), str(delta_path), "--out", str(out)],
+    )
+    assert main() == 0
+    assert read_graph(out).to_dict() == read_graph(target_path).to_dict()
+
+    db = tmp_path / "graph.db"
+    with GraphStore(db) as store:
+        store.put_graph(base)
+        store.put_graph(target)
+    store_delta = tmp_path / "store-delta.ndjson"
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "private_ops", "diff", "--store", str(db),
+            base.run_meta.run_id, "rerun", "--out", str(store_delta),
+        ],
+    )
+    assert main() == 0
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "private_ops", "apply", "--store", str(db),
+            base.run_meta.run_id, str(store_delta), "--out", str(tmp_path / "from-store.json"),
+        ],
+    )
+    assert main() == 0
+    monkeypatch.setattr(
+        "sys.argv",
+        ["private_ops", "diff", "--store", str(db), "missing", "rerun", "--out", str(store_delta)],
+    )
+    assert main() == 1
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from private_ops.cli import main
+from private_ops.protocol.builder import GraphBuilder
+from private_ops.protocol.graph_io import read_graph
+from private_ops.protocol.index import GraphIndex
+from private_ops.protocol.ids import node_id
+from private_ops.protocol.models import GraphPayload, Node, RunMeta, SourceRef, TransformRequest
+from private_ops.transforms import register
+from private_ops.transforms.expand import ExpansionEngine, ExpansionPolicy
+
+_SEEN: list[str] = []
+
+
+@register("tests.number_neighbors")
+def _number_neighbors(request: TransformRequest) -> GraphPayload:
+    value = int(request.inputs["number"])
+    _SEEN.append(str(value))
+    builder = GraphBuilder(request.run_meta or RunMeta(run_id="r", transform=request.transform))
+    origin = builder.add_node("number", f"number:{value}", str(value))
+    for step in (1, 2, 3):
+        other = builder.add_node("number", f"number:{(value + step) % 10}", str((value + step) % 10))
+        builder.add_edge("next", origin.id, other.id, f"next:{value}->{other.label}")
+    return builder.freeze()
+
+
+@register("tests.number_fails_on_odd")
+def _number_fails_on_odd(request: TransformRequest) -> GraphPayload:
+    if int(request.inputs["number"]) % 2:
+        raise RuntimeError("odd input")
+    return _number_neighbors(request)
+
+
+@register("tests.number_tagged")
+def _number_tagged(request: TransformRequest) -> GraphPayload:
+    # Every caller tags the neighbours it reaches, so later hops change entities written earlier.
+    value = int(request.inputs["number"])
+    builder = GraphBuilder(request.run_meta or RunMeta(run_id="r", transform=request.transform))
+    source = SourceRef(f"from-{value}", f"number {value}")
+    origin = builder.add_node("number", f"number:{value}", str(value))
+    for step in (1, 2):
+        other = builder.add_node(
+            "number",
+            f"number:{(value + step) % 10}",
+            str((value + step) % 10),
+            properties={f"seen_from_{value}": True},
+            sources=[source],
+        )
+        builder.add_edge("near", origin.id, other.id, f"near:{other.label}", sources=[source])
+    return builder.freeze()
+
+
+def _number(value: int) -> Node:
+    return Node(
+        id=node_id("number", f"number:{value}"),
+        type="number",
+        canonical_key=f"number:{value}",
+        label=str(value),
+    )
+
+
+def test_expansion_dedupes_frontier_and_streams_each_hop() -> None:
+    _SEEN.clear()
+    engine = ExpansionEngine(
+        ExpansionPolicy(transforms={"number": ["tests.number_neighbors"]}, max_depth=3, max_fanout=2),
+        workers=4,
+    )
+
+    hops = list(engine.iter_hops([_number(0), _number(0)], RunMeta(run_id="x", transform="expand")))
+
+    assert [h.depth for h in hops] == [1, 2, 3]
+    assert [h.expanded for h in hops] == [1, 2, 2]
+    assert sorted(_SEEN) == ["0", "1", "2", "4", "5"]
+    final = hops[-1].graph
+    assert final.validate() == []
+    assert len({n.id for n in final.nodes}) == len(final.nodes)
+
+
+def test_expansion_with_phone_transform_merges_seed() -> None:
+    phone = Node(
+        id=node_id("phone", "phone:+15551234567"),
+        type="phone",
+        canonical_key="phone:+15551234567",
+        label="+15551234567",
+    )
+    engine = ExpansionEngine(
+        ExpansionPolicy(transforms={"phone": ["resolve.phone_to_entities"]}, max_depth=5, max_nodes=2),
+    )
+
+    graph = engine.expand([phone], RunMeta(run_id="x", transform="expand"))
+
+    assert [n.type for n in graph.nodes] == ["phone", "person"]
+    assert len(graph.edges) == 1
+    assert graph.nodes[0].properties["normalized"] == "+15551234567"
+
+
+def test_expansion_records_a_raising_transform_in_its_hop() -> None:
+    engine = ExpansionEngine(
+        ExpansionPolicy(transforms={"number": ["tests.number_fails_on_odd"]}, max_depth=2),
+        workers=4,
+    )
+
+    hops = list(engine.iter_hops([_number(0)], RunMeta(run_id="x", transform="expand")))
+
+    assert [h.depth for h in hops] == [1, 2]
+    assert hops[0].errors == []
+    assert sorted(hops[1].errors) == [
+        f"tests.number_fails_on_odd on {_number(value).id}: RuntimeError: odd input"
+        for value in sorted((1, 3), key=lambda v: _number(v).id)
+    ]
+    assert {n.label for n in hops[-1].graph.nodes} >= {"0", "1", "2", "3", "4", "5"}
+
+
+def test_expand_ndjson_merges_to_the_engine_graph(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    seeds = GraphPayload(RunMeta(run_id="seeds", transform="t"), [_number(0)])
+    seeds_path = tmp_path / "seeds.json"
+    seeds_path.write_text(json.dumps(seeds.to_dict()), encoding="utf-8")
+    policy = {"transforms": {"number": ["tests.number_tagged"]}, "max_depth": 3}
+    policy_path = tmp_path / "policy.json"
+    policy_path.write_text(json.dumps(policy), encoding="utf-8")
+    out = tmp_path / "expanded.ndjson"
+
+    argv = ["private_ops", "expand", str(seeds_path), "--policy", str(policy_path)]
+    monkeypatch.setattr(sys, "argv", [*argv, "--out", str(out)])
+    assert main() == 0
+
+    expected = ExpansionEngine(ExpansionPolicy.from_dict(policy)).expand(
+        [_number(0)], RunMeta(run_id="expand:seeds.json", transform="expand")
+    )
+    streamed = read_graph(out)
+    assert len(streamed.nodes) > len(expected.nodes)
+    merged = GraphIndex(streamed)
+    assert sorted(merged.nodes(), key=lambda n: n.id) == sorted(expected.nodes, key=lambda n: n.id)
+    assert sorted(merged.edges(), key=lambda e: e.id) == sorted(expected.edges, key=lambda e: e.id)
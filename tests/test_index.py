@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import dataclasses
+from collections import deque
+
+import pytest
+
+from private_ops.bench import synthetic_graph
+from private_ops.protocol import GraphIndex
+from private_ops.protocol.models import Edge, GraphPayload, RunMeta
+
+
+def _bfs(graph: GraphPayload, seed: str, hops: int) -> dict[str, int]:
+    distances = {seed: 0}
+    queue = deque([seed])
+    while queue:
+        current = queue.popleft()
+        if distances[current] == hops:
+            continue
+        for edge in graph.edges:
+            for a, b in ((edge.from_id, edge.to_id), (edge.to_id, edge.from_id)):
+                if a == current and b not in distances:
+                    distances[b] = distances[current] + 1
+                    queue.append(b)
+    return distances
+
+
+def test_index_lookups_match_scans() -> None:
+    graph = synthetic_graph(300, shape="random", edges_per_node=2, seed=5)
+    index = GraphIndex(graph)
+    node = graph.nodes[42]
+
+    assert (index.node_count, index.edge_count) == (300, len(graph.edges))
+    assert {e.id for e in index.edges_of(node.id, direction="out")} == {
+        e.id for e in graph.edges if e.from_id == node.id
+    }
+    assert {n.id for n in index.neighbors(node.id)} == {
+        e.to_id if e.from_id == node.id else e.from_id
+        for e in graph.edges
+        if node.id in (e.from_id, e.to_id)
+    }
+    assert index.nodes_by_type("phone") == [n for n in graph.nodes if n.type == "phone"]
+    assert index.find_node(node.type, node.canonical_key) is node
+    assert index.edges_of(node.id, edge_types={"missing"}) == []
+
+    expected = _bfs(graph, node.id, 2)
+    assert index.k_hop([node.id], 2) == expected
+    phones = {n.id for n in graph.nodes if n.type == "phone"}
+    assert index.k_hop([node.id], 2, node_types={"phone"}) == {
+        node_id: hops for node_id, hops in expected.items() if node_id in phones
+    }
+    with pytest.raises(ValueError, match="direction"):
+        index.neighbors(node.id, direction="sideways")
+
+
+def test_shortest_path_and_subgraph() -> None:
+    graph = synthetic_graph(200, shape="random", edges_per_node=1.5, seed=11)
+    index = GraphIndex(graph)
+    source = graph.nodes[0].id
+    distances = _bfs(graph, source, 200)
+
+    for target, hops in list(distances.items())[::7]:
+        path = index.shortest_path(source, target)
+        assert path is not None and len(path) == hops
+        at = source
+        for edge in path:
+            assert at in (edge.from_id, edge.to_id)
+            at = edge.to_id if edge.from_id == at else edge.from_id
+        assert at == target
+
+    far = max(distances, key=distances.__getitem__)
+    assert index.shortest_path(source, far, max_hops=distances[far] - 1) is None
+    directed = index.shortest_path(source, far, direction="out")
+    assert directed is None or all(
+        a.to_id == b.from_id for a, b in zip(directed, directed[1:])
+    )
+
+    members = list(distances)[:25]
+    sub = index.subgraph(members, RunMeta(run_id="sub", transform="index"))
+    assert [n.id for n in sub.nodes] == members
+    assert {e.id for e in sub.edges} == {
+        e.id for e in graph.edges if e.from_id in members and e.to_id in members
+    }
+    assert sub.validate() == []
+
+
+def test_index_updates_incrementally() -> None:
+    graph = synthetic_graph(30, shape="chain")
+    index = GraphIndex(graph)
+    version = index.version
+    first, last = graph.nodes[0], graph.nodes[-1]
+
+    merged = index.add_node(dataclasses.replace(first, properties={"seen": True}))
+    assert merged.properties["seen"] is True and index.node_count == 30
+    shortcut = Edge(
+        id="e_shortcut",
+        type="calls",
+        from_id=first.id,
+        to_id=graph.nodes[15].id,
+        canonical_key="shortcut",
+    )
+    index.add_graph(GraphPayload(run_meta=graph.run_meta, edges=[shortcut]))
+    assert index.version > version
+    assert index.edges_of(first.id, edge_types={"calls"}) == [shortcut]
+    assert len(index.shortest_path(first.id, graph.nodes[16].id)) == 2
+
+    assert index.remove_edge("e_shortcut") is shortcut
+    assert index.edges_of(first.id, edge_types={"calls"}) == []
+    assert index.remove_node(last.id) is last
+    assert last.id not in index and index.nodes_by_canonical_key(last.canonical_key) == []
+    assert all(last.id not in (e.from_id, e.to_id) for e in index.to_graph(graph.run_meta).edges)
+    assert index.to_graph(graph.run_meta).validate() == []
+    assert index.remove_node(last.id) is None
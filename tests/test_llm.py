@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from private_ops.config import OpsConfig
+from private_ops.llm import (
+    AzureOpenAIProvider,
+    CompletionCache,
+    CompletionRequest,
+    LLMClient,
+    LLMError,
+    OllamaProvider,
+    OpenAIProvider,
+    provider_from_config,
+)
+
+
+class _StubState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.calls: list[dict] = []
+        self.active = 0
+        self.peak = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.received = threading.Event()
+        self.fail = False
+
+
+class _OllamaStub(BaseHTTPRequestHandler):
+    """Minimal Ollama ``/api/generate`` plus an OpenAI-style SSE endpoint."""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self) -> _StubState:
+        return self.server.state  # type: ignore[attr-defined]
+
+    def setup(self) -> None:
+        super().setup()
+        with self.state.lock:
+            self.state.connections += 1
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _chunked(self, lines: list[bytes]) -> None:
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_POST(self) -> None:  # noqa: N802
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        state = self.state
+        with state.lock:
+            state.calls.append(payload)
+            state.received.set()
+            state.active += 1
+            state.peak = max(state.peak, state.active)
+        try:
+            state.gate.wait(5)
+            if state.fail:
+                self._reply(500, {"error": "model not loaded"})
+                return
+            prompt = payload.get("prompt") or payload["messages"][-1]["content"]
+            words = f"echo {prompt}".split()
+            if self.path == "/api/generate":
+                if not payload["stream"]:
+                    self._reply(
+                        200,
+                        {
+                            "model": payload["model"],
+                            "response": " ".join(words),
+                            "done": True,
+                            "prompt_eval_count": len(prompt.split()),
+                            "eval_count": len(words),
+                        },
+                    )
+                    return
+                lines = [
+                    json.dumps({"response": f"{word} ", "done": False}).encode() + b"\n"
+                    for word in words
+                ]
+                lines.append(json.dumps({"response": "", "done": True}).encode() + b"\n")
+                self._chunked(lines)
+            else:
+                lines = [
+                    b"data: "
+                    + json.dumps({"choices": [{"delta": {"content": f"{word} "}}]}).encode()
+                    + b"\n\n"
+                    for word in words
+                ]
+                self._chunked([*lines, b"data: [DONE]\n\n"])
+        finally:
+            with state.lock:
+                state.active -= 1
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaStub)
+    server.daemon_threads = True
+    server.state = _StubState()  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield f"http://{host}:{port}", server.state  # type: ignore[attr-defined]
+    server.state.gate.set()  # type: ignore[attr-defined]
+    server.shutdown()
+    server.server_close()
+
+
+def _request(prompt: str, **settings: object) -> CompletionRequest:
+    return CompletionRequest(prompt=prompt, model="llama3.1", **settings)  # type: ignore[arg-type]
+
+
+def test_completions_reuse_one_keep_alive_connection_and_cache(stub) -> None:
+    url, state = stub
+    with LLMClient(OllamaProvider(url)) as client:
+        first = client.complete(_request("who owns this number"))
+        second = client.complete(_request("who else"))
+        again = client.complete(_request("who owns this number"))
+
+        assert first.text == "echo who owns this number"
+        assert (first.prompt_tokens, first.completion_tokens) == (4, 5)
+        assert second.text == "echo who else"
+        assert again.cached and again.text == first.text
+        assert len(state.calls) == 2
+        assert state.connections == 1
+        assert client.provider.pool.connections_opened == 1
+        assert state.calls[0]["options"] == {"temperature": 0.0}
+
+        sampled = _request("who owns this number", temperature=0.7)
+        client.complete(sampled)
+        client.complete(sampled)
+        assert len(state.calls) == 4
+
+
+def test_stream_yields_tokens_and_caches_finished_streams(stub, tmp_path) -> None:
+    url, state = stub
+    with LLMClient(OllamaProvider(url), cache=CompletionCache(tmp_path)) as client:
+        tokens = list(client.stream(_request("summarize the graph")))
+        assert tokens == ["echo ", "summarize ", "the ", "graph "]
+
+        partial = client.stream(_request("stop early please"))
+        assert next(partial) == "echo "
+        partial.close()
+
+        assert client.complete(_request("summarize the graph")).text == "".join(tokens)
+        assert len(state.calls) == 2
+
+    cold = LLMClient(OllamaProvider(url), cache=CompletionCache(tmp_path))
+    assert list(cold.stream(_request("summarize the graph"))) == ["".join(tokens)]
+    assert cold.complete(_request("stop early please")).text == "echo stop early please"
+    assert len(state.calls) == 3
+    cold.close()
+
+
+def test_identical_in_flight_requests_are_coalesced(stub) -> None:
+    url, state = stub
+    state.gate.clear()
+    client = LLMClient(OllamaProvider(url, max_concurrency=8))
+    results: list[str] = []
+
+    def _call() -> None:
+        results.append(client.complete(_request("same prompt", seed=7, temperature=0.9)).text)
+
+    threads = [threading.Thread(target=_call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    assert state.received.wait(5)
+    state.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["echo same prompt"] * 6
+    assert len(state.calls) == 1
+    assert client.stats.coalesced + client.stats.hits == 5
+    client.close()
+
+
+def test_complete_many_caps_concurrency_per_provider(stub) -> None:
+    url, state = stub
+    state.gate.clear()
+    client = LLMClient(OllamaProvider(url, max_concurrency=2))
+    releaser = threading.Timer(0.2, state.gate.set)
+    releaser.start()
+
+    completions = client.complete_many(_request(f"prompt {i}") for i in range(6))
+
+    assert [c.text for c in completions] == [f"echo prompt {i}" for i in range(6)]
+    assert state.peak == 2
+    assert state.connections == 2
+    client.close()
+
+
+def test_openai_streaming_errors_and_provider_config(stub, monkeypatch) -> None:
+    url, state = stub
+    provider = OpenAIProvider(url, api_key="sk-test")
+    assert "".join(provider.stream(_request("hi", system="be brief"))) == "echo hi "
+    assert state.calls[-1]["messages"][0] == {"role": "system", "content": "be brief"}
+
+    state.fail = True
+    with pytest.raises(LLMError) as excinfo:
+        OllamaProvider(url).complete(_request("boom"))
+    assert excinfo.value.status == 500
+
+    assert isinstance(provider_from_config(OpsConfig(llm_url=url)), OllamaProvider)
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+    azure = provider_from_config(OpsConfig(provider="azure", model="gpt-4o", llm_concurrency=3))
+    assert isinstance(azure, AzureOpenAIProvider)
+    assert azure.max_concurrency == 3
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT")
+    with pytest.raises(ValueError):
+        provider_from_config(OpsConfig(provider="azure"))
+    assert OpsConfig(llm_url="ftp://x", llm_concurrency=0).validate() == [
+        "llm_url must be an http(s) URL, got 'ftp://x'",
+        "llm_concurrency must be >= 1",
+    ]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from private_ops.cli import main
+from private_ops.protocol.graph_io import read_graph
+from private_ops.protocol.merge import SpillingMerger, merge_graphs
+from private_ops.protocol.models import GraphPayload, Node, RunMeta, SourceRef, TransformRequest
+from private_ops.transforms import dispatch
+
+
+def _phone_graph(phone: str) -> GraphPayload:
+    return dispatch(
+        TransformRequest(transform="resolve.phone_to_entities", inputs={"phone": phone})
+    ).graph
+
+
+def _node(confidence: float, source_id: str, **properties: object) -> Node:
+    return Node(
+        id="n1",
+        type="person",
+        canonical_key="person:1",
+        label=f"label-{source_id}",
+        properties={"confidence": confidence, **properties},
+        sources=[SourceRef(source_id=source_id, title=source_id, confidence=confidence)],
+    )
+
+
+def test_spilling_merge_matches_in_memory_merge(tmp_path: Path) -> None:
+    graphs = [_phone_graph("5551234567"), _phone_graph("5551234567"), _phone_graph("5559999999")]
+    run_meta = RunMeta(run_id="merge", transform="merge")
+
+    expected = merge_graphs(graphs, run_meta)
+    with SpillingMerger(tmp_path / "spill", partitions=3) as merger:
+        for graph in graphs:
+            merger.add_graph(graph)
+        merged = merger.to_graph(run_meta)
+
+    assert len(merged.nodes) == 6
+    assert len(merged.edges) == 4
+    assert sorted(n.id for n in merged.nodes) == sorted(n.id for n in expected.nodes)
+    assert merged.validate() == []
+
+
+def test_merge_prefers_more_confident_property_values() -> None:
+    run_meta = RunMeta(run_id="r", transform="t")
+    graphs = [
+        GraphPayload(run_meta=run_meta, nodes=[_node(0.3, "weak", name="Weak", alias="w")]),
+        GraphPayload(run_meta=run_meta, nodes=[_node(0.9, "strong", name="Strong")]),
+        GraphPayload(run_meta=run_meta, nodes=[_node(0.5, "mid", name="Mid")]),
+    ]
+
+    (node,) = merge_graphs(graphs, run_meta).nodes
+
+    assert node.properties == {"confidence": 0.9, "name": "Strong", "alias": "w"}
+    assert [s.source_id for s in node.sources] == ["weak", "strong", "mid"]
+
+
+def test_cli_merge_writes_deduplicated_graph(tmp_path: Path, monkeypatch) -> None:
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text(json.dumps({"graph": _phone_graph("5551234567").to_dict()}), encoding="utf-8")
+    second.write_text(json.dumps(_phone_graph("5551234567").to_dict()), encoding="utf-8")
+    out = tmp_path / "merged.ndjson"
+
+    monkeypatch.setattr(
+        "sys.argv", ["private_ops", "merge", str(first), str(second), "--out", str(out)],
+    )
+    assert main() == 0
+
+    merged = read_graph(out)
+    assert merged.run_meta.transform == "merge"
+    assert len(merged.nodes) == 3
+    assert len(merged.edges) == 2
+
+
+def test_cli_merge_validates_ndjson_and_json_output_alike(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    graph = _phone_graph("5551234567")
+    broken = GraphPayload(run_meta=graph.run_meta, nodes=graph.nodes[1:], edges=graph.edges)
+    source = tmp_path / "broken.json"
+    source.write_text(json.dumps(broken.to_dict()), encoding="utf-8")
+
+    outputs = []
+    for out in (tmp_path / "merged.ndjson", tmp_path / "merged.json"):
+        monkeypatch.setattr("sys.argv", ["private_ops", "merge", str(source), "--out", str(out)])
+        assert main() == 1
+        outputs.append(capsys.readouterr().out)
+
+    missing = graph.nodes[0].id
+    ndjson_out, json_out = outputs
+    assert ndjson_out.count(f"unknown from node {missing}") == len(graph.edges)
+    assert json_out.count(missing) == len(graph.edges)
+
+
+def test_cli_merge_streams_json_like_ndjson(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source.json"
+    graph = _phone_graph("5551234567")
+    source.write_text(json.dumps(graph.to_dict()), encoding="utf-8")
+
+    for suffix in ("ndjson", "json"):
+        out = tmp_path / f"merged.{suffix}"
+        monkeypatch.setattr("sys.argv", ["private_ops", "merge", str(source), "--out", str(out)])
+        assert main() == 0
+
+    document = json.loads((tmp_path / "merged.json").read_text(encoding="utf-8"))
+    assert list(document) == ["run_meta", "nodes", "edges"]
+    assert document == read_graph(tmp_path / "merged.ndjson").to_dict()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from private_ops.protocol.normalize import (
+    normalize_email,
+    normalize_emails,
+    normalize_phone,
+    normalize_phones,
+    normalize_text,
+    normalize_texts,
+    split_e164,
+)
+
+
+def test_normalize_phone_respects_explicit_international_prefix() -> None:
+    assert normalize_phone("(555) 123-4567") == "+15551234567"
+    assert normalize_phone("0044 20 7946 0958") == "+442079460958"
+    assert normalize_phone("+49 30 123456") == "+4930123456"
+    assert normalize_phone("no digits") == ""
+
+
+def test_bulk_normalizers_match_single_item_versions() -> None:
+    phones = ["(555) 123-4567", "+49 30 123456", "", "1-555-123-4567", "0033 1 23 45 67 89"]
+    texts = ["  Hello   World ", "\tMIXED\ncase  "]
+    emails = [" User@Example.COM ", "a@b.c"]
+
+    assert normalize_phones(phones) == [normalize_phone(p) for p in phones]
+    assert normalize_texts(texts) == [normalize_text(t) for t in texts]
+    assert normalize_emails(emails) == [normalize_email(e) for e in emails]
+
+
+def test_split_e164_uses_longest_assigned_calling_code() -> None:
+    assert split_e164("(555) 123-4567") == ("1", "5551234567")
+    assert split_e164("+44 20 7946 0958") == ("44", "2079460958")
+    assert split_e164("+380 44 123 4567") == ("380", "441234567")
+    assert split_e164("+210 123") == ("", "210123")
@@ -7,7 +7,7 @@ from pathlib import Path
 
 from private_ops.adapters.maltego import to_maltego_mapping
 from private_ops.cli import main
-from private_ops.protocol.ids import edge_id, node_id
+from private_ops.protocol.ids import edge_id, edge_ids, node_id, node_ids
 from private_ops.protocol.models import GraphPayload, RunMeta, TransformRequest
 from private_ops.transforms import dispatch, get_transform, list_transforms, register
 
@@ -57,6 +57,17 @@ def test_id_hashing_is_unambiguous_for_delimiter_like_content() -> None:
     assert left != right
 
 
+def test_ids_match_pinned_values_and_batch_apis() -> None:
+    assert node_id("phone", "phone:+15551234567") == "n_6023c4a5fefbbd8a6545f68c"
+    assert edge_id("ownership", "n1", "n2", "k") == "e_5d4f6a9ba86df41289ed1d7b"
+
+    pairs = [("phone", f"phone:+1555123{i:04d}") for i in range(50)] + [("person", "p:1")]
+    assert node_ids(pairs) == [node_id(t, k) for t, k in pairs]
+
+    quads = [("ownership", "n1", "n2", "k"), ("associated_with", "n1", "n3", "k2")]
+    assert edge_ids(quads) == [edge_id(*q) for q in quads]
+
+
 def test_registering_duplicate_transform_name_raises_error() -> None:
     from private_ops.transforms.registry import DuplicateTransformNameError
 
@@ -192,3 +203,23 @@ def test_cli_run_transform_and_validate_graph_fixture(tmp_path: Path, monkeypatc
         ["private_ops", "validate-graph", str(output_path)],
     )
     assert main() == 0
+
+
+def test_models_are_slotted_and_share_pooled_sources() -> None:
+    source = {"source_id": "s1", "title": "Source one", "confidence": 0.4}
+    data = {
+        "run_meta": {"run_id": "r1", "transform": "t1"},
+        "nodes": [
+            {"id": "n1", "type": "phone", "canonical_key": "phone:1", "label": "1", "sources": [source]},
+            {"id": "n2", "type": "phone", "canonical_key": "phone:2", "label": "2", "sources": [source]},
+        ],
+        "edges": [],
+    }
+
+    graph = GraphPayload.from_dict(data)
+    first, second = graph.nodes
+
+    assert not hasattr(first, "__dict__")
+    assert first.sources[0] is second.sources[0]
+    assert first.type is second.type
+    assert graph.to_dict()["nodes"][0]["sources"][0] == {**source, "url": ""}
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+
+from private_ops.protocol.models import TransformRequest
+from private_ops.transforms import dispatch, get_spec, list_transforms, register_lazy, registry
+from private_ops.transforms.registry import DuplicateTransformNameError
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Cumulative `-X importtime` budget for `import private_ops.cli`, in microseconds;
+# wall-clock, so only checked when run with `-m timing`.
+CLI_IMPORT_BUDGET_US = 100_000
+EAGER_MODULES = (
+    "asyncio",
+    "http.server",
+    "multiprocessing",
+    "sqlite3",
+    "private_ops.bench",
+    "private_ops.server",
+    "private_ops.adapters",
+    "private_ops.protocol",
+    "private_ops.transforms",
+)
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+
+def _cli_import_timings() -> dict[str, int]:
+    result = _python("import private_ops.cli", "-X", "importtime")
+    timings = {}
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if cumulative.isdigit():
+            timings[name] = int(cumulative)
+    return timings
+
+
+def test_cli_import_skips_command_modules() -> None:
+    loaded = [name for name in _cli_import_timings() if name.startswith(EAGER_MODULES)]
+    assert loaded == []
+
+
+@pytest.mark.timing
+def test_cli_import_stays_within_budget() -> None:
+    assert _cli_import_timings()["private_ops.cli"] < CLI_IMPORT_BUDGET_US
+
+
+def test_transform_modules_import_on_first_lookup() -> None:
+    result = _python(
+        "import sys\n"
+        "from private_ops.transforms import get_spec, list_transforms\n"
+        "names = list_transforms()\n"
+        "print('private_ops.transforms.phone' in sys.modules)\n"
+        "print(get_spec('starter.phone_to_entities') is not None)\n"
+        "print('private_ops.transforms.starter' in sys.modules)\n"
+        "print(names)\n"
+    )
+
+    before, found, after, names = result.stdout.splitlines()
+    assert (before, found, after) == ("False", "True", "True")
+    assert "starter.phone_to_entities" in names
+    assert "resolve.phone_to_entities" in names
+
+
+def test_entry_point_transforms_are_discovered_lazily(
+    isolated_registry, tmp_path, monkeypatch
+) -> None:
+    (tmp_path / "acme_transforms.py").write_text(
+        "from private_ops.protocol.models import GraphPayload, RunMeta\n"
+        "\n"
+        "def echo(request):\n"
+        "    return GraphPayload(run_meta=RunMeta(run_id='acme', transform=request.transform))\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    discovered = [
+        EntryPoint("acme.echo", "acme_transforms:echo", registry.ENTRY_POINT_GROUP),
+        EntryPoint("resolve.phone_to_entities", "acme_transforms:echo", registry.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(registry, "entry_points", lambda group: discovered)
+
+    assert "acme.echo" in list_transforms()
+    assert "acme_transforms" not in sys.modules
+
+    response = dispatch(TransformRequest(transform="acme.echo", inputs={}), use_cache=False)
+    assert response.ok
+    assert response.graph.run_meta.run_id == "acme"
+    # Built-ins keep their name when a plugin declares it again.
+    assert get_spec("resolve.phone_to_entities").fn.__module__ == "private_ops.transforms.phone"
+    sys.modules.pop("acme_transforms", None)
+
+
+def test_register_lazy_rejects_duplicate_names(isolated_registry) -> None:
+    register_lazy("tests.lazy", "private_ops.transforms.starter:resolve_phone_to_entities")
+    assert get_spec("tests.lazy") is not None
+
+    with pytest.raises(DuplicateTransformNameError):
+        register_lazy("tests.lazy", "private_ops.transforms.phone")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from private_ops.protocol.models import GraphPayload, RunMeta, TransformRequest, TransformResponse
+from private_ops.transforms import (
+    RateLimit,
+    TransformCache,
+    TransformScheduler,
+    dispatch,
+    get_spec,
+    register,
+)
+from private_ops.transforms.scheduler import TokenBucket
+
+
+def _lookup(request: TransformRequest) -> GraphPayload:
+    run_meta = request.run_meta or RunMeta(run_id="r", transform=request.transform)
+    return GraphPayload(run_meta=run_meta)
+
+
+@pytest.fixture(autouse=True)
+def _transforms(isolated_registry) -> None:
+    register("tests.rate_limited", source="tests.upstream", rate_limit=20.0, cost=2.5)(_lookup)
+    register("tests.slow_lookup", expected_latency=2.0)(_lookup)
+    register("tests.fast_lookup", expected_latency=0.01)(_lookup)
+
+
+class _Recorder:
+    """Dispatcher that records call order and can hold the first call."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def __call__(self, request: TransformRequest) -> TransformResponse:
+        self.started.set()
+        self.gate.wait(5)
+        self.calls.append(str(request.inputs.get("tag", request.transform)))
+        return TransformResponse(ok=True, status="ok", graph=GraphPayload(RunMeta("r", "t")))
+
+
+def _request(transform: str, tag: str = "") -> TransformRequest:
+    return TransformRequest(transform=transform, inputs={"tag": tag or transform})
+
+
+def test_token_bucket_refills_at_rate_up_to_burst() -> None:
+    bucket = TokenBucket(2.0, burst=2, now=0.0)
+    assert bucket.take(0.0) and bucket.take(0.0)
+    assert not bucket.take(0.0)
+    assert bucket.wait_time(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.5)
+    assert bucket.tokens(100.0) == 2
+
+
+def test_register_records_and_validates_scheduling_metadata() -> None:
+    spec = get_spec("tests.rate_limited")
+    assert (spec.limit_key, spec.rate_limit, spec.cost) == ("tests.upstream", 20.0, 2.5)
+    assert get_spec("tests.fast_lookup").to_dict()["source"] == "tests.fast_lookup"
+
+    with pytest.raises(ValueError):
+        register("tests.bad_rate", rate_limit=0)
+
+
+def test_priority_then_expected_latency_within_an_investigation_round_robin_across() -> None:
+    recorder = _Recorder()
+    with TransformScheduler(workers=1, dispatcher=recorder) as scheduler:
+        scheduler.submit(_request("tests.fast_lookup", "hold"), investigation="a")
+        assert recorder.started.wait(5)
+        futures = [
+            scheduler.submit(_request("tests.slow_lookup", "a-slow"), investigation="a"),
+            scheduler.submit(_request("tests.fast_lookup", "a-fast"), investigation="a"),
+            scheduler.submit(
+                _request("tests.slow_lookup", "a-urgent"), investigation="a", priority=5
+            ),
+            scheduler.submit(_request("tests.fast_lookup", "b-1"), investigation="b"),
+            scheduler.submit(_request("tests.fast_lookup", "b-2"), investigation="b"),
+        ]
+
+        snapshot = scheduler.snapshot()
+        assert snapshot["running"] == 1
+        assert snapshot["queued"] == 5
+        assert snapshot["investigations"]["a"]["transforms"] == {
+            "tests.fast_lookup": 1,
+            "tests.slow_lookup": 2,
+        }
+        assert snapshot["investigations"]["b"]["queued"] == 2
+
+        recorder.gate.set()
+        for future in futures:
+            assert future.result(5).ok
+
+    assert recorder.calls == ["hold", "a-urgent", "b-1", "a-fast", "b-2", "a-slow"]
+    assert scheduler.snapshot()["investigations"] == {}
+
+
+def test_rate_limited_source_does_not_block_other_work() -> None:
+    recorder = _Recorder()
+    recorder.gate.set()
+    with TransformScheduler(workers=2, dispatcher=recorder) as scheduler:
+        started = time.monotonic()
+        limited = [
+            scheduler.submit(_request("tests.rate_limited", f"limited-{i}")) for i in range(4)
+        ]
+        other = scheduler.submit(_request("tests.fast_lookup", "other"))
+
+        other.result(5)
+        assert recorder.calls.index("other") <= 1
+        source = scheduler.snapshot()["sources"]["tests.upstream"]
+        assert (source["rate"], source["burst"]) == (20.0, 1)
+
+        for future in limited:
+            future.result(5)
+        # One token up front, then 20/s for the remaining three.
+        assert time.monotonic() - started >= 0.14
+
+
+def test_rate_limit_overrides_and_shutdown_cancels_pending() -> None:
+    recorder = _Recorder()
+    scheduler = TransformScheduler(
+        workers=1,
+        dispatcher=recorder,
+        rate_limits={"tests.upstream": RateLimit(rate=0.01, burst=1)},
+    )
+    first = scheduler.submit(_request("tests.rate_limited"))
+    assert recorder.started.wait(5)
+    pending = scheduler.submit(_request("tests.rate_limited"))
+    assert scheduler.snapshot()["sources"]["tests.upstream"]["next_token_s"] > 90
+
+    recorder.gate.set()
+    scheduler.shutdown(cancel_pending=True)
+    assert first.result(5).ok
+    assert pending.cancelled()
+    with pytest.raises(RuntimeError):
+        scheduler.submit(_request("tests.fast_lookup"))
+
+
+def test_cache_hits_complete_at_submit_without_spending_a_token() -> None:
+    cache = TransformCache()
+    cached = _request("tests.rate_limited", "cached")
+    assert dispatch(cached, cache=cache).ok
+    recorder = _Recorder()
+    recorder.gate.set()
+
+    with TransformScheduler(
+        workers=1,
+        dispatcher=recorder,
+        cache=cache,
+        rate_limits={"tests.upstream": RateLimit(rate=0.01, burst=1)},
+    ) as scheduler:
+        hits = [scheduler.submit(cached) for _ in range(3)]
+        assert all(future.done() and future.result().ok for future in hits)
+        # The only token (the next arrives in 100s) is still there for a real call.
+        assert scheduler.submit(_request("tests.rate_limited", "fresh")).result(5).ok
+    assert recorder.calls == ["fresh"]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import time
+from xml.etree import ElementTree
+
+from private_ops.protocol.models import GraphPayload, RunMeta, TransformRequest
+from private_ops.server import TransformServer
+from private_ops.transforms import register
+
+_GATE = threading.Event()
+
+MALTEGO_REQUEST = b"""<MaltegoMessage>
+<MaltegoTransformRequestMessage>
+<Entities>
+<Entity Type="maltego.PhoneNumber"><Value>+1 (555) 123-4567</Value><Weight>100</Weight></Entity>
+</Entities>
+<Limits SoftLimit="12" HardLimit="12"/>
+</MaltegoTransformRequestMessage>
+</MaltegoMessage>"""
+
+
+@register("tests.blocking_transform")
+def _blocking_transform(request: TransformRequest) -> GraphPayload:
+    _GATE.wait(5)
+    return GraphPayload(run_meta=request.run_meta or RunMeta(run_id="r", transform=request.transform))
+
+
+@register("tests.failing_transform")
+def _failing_transform(request: TransformRequest) -> GraphPayload:
+    raise RuntimeError("upstream exploded")
+
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.001)
+
+
+def _post(conn: http.client.HTTPConnection, path: str, body: bytes) -> tuple[int, dict]:
+    conn.request("POST", path, body=body)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_server_handles_maltego_and_json_requests_over_keep_alive() -> None:
+    with TransformServer(port=0, workers=2) as server:
+        conn = http.client.HTTPConnection(*server.address, timeout=5)
+
+        conn.request("POST", "/run/resolve.phone_to_entities", body=MALTEGO_REQUEST)
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.getheader("Transfer-Encoding") == "chunked"
+        root = ElementTree.fromstring(response.read())
+        values = root.findall("MaltegoTransformResponseMessage/Entities/Entity/Value")
+        assert values[0].text == "+15551234567"
+
+        request = {"transform": "resolve.phone_to_entities", "inputs": {"phone": "5551234567"}}
+        status, payload = _post(conn, "/run", json.dumps(request).encode())
+        assert status == 200
+        assert len(payload["maltego"]["links"]) == 2
+
+        status, _ = _post(conn, "/run/resolve.phone_to_entities", b"<broken")
+        assert status == 400
+
+        conn.request("GET", "/metrics")
+        metrics = json.loads(conn.getresponse().read())
+        assert metrics["transforms"]["resolve.phone_to_entities"]["requests"] == 2
+
+        conn.request("GET", "/scheduler")
+        scheduler = json.loads(conn.getresponse().read())
+        assert (scheduler["workers"], scheduler["completed"]) == (2, 2)
+        conn.close()
+
+
+def test_server_rejects_requests_beyond_queue_capacity() -> None:
+    _GATE.clear()
+    with TransformServer(port=0, workers=1, max_queue=0) as server:
+        blocked = threading.Thread(
+            target=_post,
+            args=(http.client.HTTPConnection(*server.address, timeout=5), "/run/tests.blocking_transform", b"{}"),
+        )
+        blocked.start()
+        _wait_until(lambda: server.in_flight > 0)
+
+        conn = http.client.HTTPConnection(*server.address, timeout=5)
+        conn.request("POST", "/run/tests.blocking_transform", body=b"{}")
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 503
+        assert response.getheader("Retry-After") == "1"
+
+        _GATE.set()
+        blocked.join()
+        assert server.metrics.snapshot()["rejected"] == 1
+
+
+def test_server_answers_bad_requests_and_transform_failures() -> None:
+    with TransformServer(port=0, workers=1) as server:
+        conn = http.client.HTTPConnection(*server.address, timeout=5)
+
+        status, payload = _post(conn, "/run/tests.failing_transform", b"{}")
+        assert status == 500
+        assert "RuntimeError: upstream exploded" in payload["error"]
+        errors = server.metrics.snapshot()["transforms"]["tests.failing_transform"]["errors"]
+        assert errors == 1
+
+        status, payload = _post(conn, "/run", json.dumps({"inputs": {}}).encode())
+        assert status == 400
+        for body in (b"[1]", b'"x"', b'{"transform": "resolve.phone_to_entities", "inputs": [1]}'):
+            status, payload = _post(conn, "/run", body)
+            assert status == 400
+            assert "must be a JSON object" in payload["error"]
+        status, payload = _post(conn, "/run/resolve.phone_to_entities", b"[1]")
+        assert status == 400
+        status, _ = _post(conn, "/nowhere", b"{}")
+        assert status == 404
+
+        for length in ("abc", "-5"):
+            conn = http.client.HTTPConnection(*server.address, timeout=5)
+            conn.putrequest("POST", "/run/resolve.phone_to_entities")
+            conn.putheader("Content-Length", length)
+            conn.endheaders()
+            response = conn.getresponse()
+            assert response.status == 400
+            response.read()
+            conn.close()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+
+import pytest
+
+from private_ops.bench import synthetic_graph
+from private_ops.cli import main
+from private_ops.protocol.graph_io import read_graph, write_graph
+from private_ops.protocol.merge import merge_graphs
+from private_ops.protocol.models import GraphPayload, RunMeta
+from private_ops.protocol.shard import GraphPartitioner, ShardedGraph, shard_of
+
+
+def test_partitioner_colocates_edges_and_tracks_cross_shard_refs(tmp_path: Path) -> None:
+    graph = synthetic_graph(300, shape="random", edges_per_node=2)
+    partitioner = GraphPartitioner(tmp_path / "shards", shards=4)
+    partitioner.add_graph(graph)
+    sharded = partitioner.finish()
+
+    cross = sum(1 for e in graph.edges if shard_of(e.from_id, 4) != shard_of(e.to_id, 4))
+    assert [c["nodes"] for c in sharded.counts] == [
+        sum(1 for n in graph.nodes if shard_of(n.id, 4) == shard) for shard in range(4)
+    ]
+    assert sum(c["refs"] for c in sharded.counts) == cross > 0
+    for shard, path in enumerate(sharded.shard_paths):
+        for line in path.read_text(encoding="utf-8").splitlines():
+            record = json.loads(line)
+            owner = {"node": "id", "edge": "from", "ref": "node"}[record["type"]]
+            assert shard_of(record["data"][owner], 4) == shard
+
+    assert sharded.stats()["cross_shard_edges"] == cross
+    assert sharded.validate().ok
+    # Not owned: the directory outlives close().
+    sharded.close()
+    assert (tmp_path / "shards" / "manifest.json").exists()
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_sharded_operations_match_whole_graph(tmp_path: Path, workers: int) -> None:
+    graph = synthetic_graph(400, shape="random", edges_per_node=2, seed=3)
+    # A partial re-run: the same ids with new properties, so shards must merge them.
+    rerun = GraphPayload(
+        run_meta=graph.run_meta,
+        nodes=[dataclasses.replace(n, properties={"rerun": True}) for n in graph.nodes[:200]],
+        edges=graph.edges[:300],
+    )
+    first, second = tmp_path / "first.ndjson", tmp_path / "second.json"
+    write_graph(graph, first)
+    write_graph(rerun, second)
+    run_meta = RunMeta(run_id="sharded", transform="merge")
+    expected = merge_graphs([graph, rerun], run_meta)
+
+    with ShardedGraph.from_files([first, second], shards=8) as sharded:
+        assert sharded.validate(workers=workers).error_count == len(rerun.nodes) + len(
+            rerun.edges
+        )
+        assert sharded.validate(workers=workers, allow_duplicates=True).ok
+        stats = sharded.stats(workers=workers, top=5)
+        out = tmp_path / "merged.json"
+        assert sharded.export(out, run_meta, workers=workers) == (
+            len(expected.nodes),
+            len(expected.edges),
+        )
+        directory = sharded.directory
+    assert not directory.exists()
+
+    merged = read_graph(out)
+    assert merged.run_meta == run_meta
+    key = lambda item: item["id"]  # noqa: E731
+    assert sorted(merged.to_dict()["nodes"], key=key) == sorted(
+        expected.to_dict()["nodes"], key=key
+    )
+    assert sorted(merged.to_dict()["edges"], key=key) == sorted(
+        expected.to_dict()["edges"], key=key
+    )
+
+    degree: dict[str, int] = {}
+    for edge in expected.edges:
+        for endpoint in (edge.from_id, edge.to_id):
+            degree[endpoint] = degree.get(endpoint, 0) + 1
+    assert stats["nodes"] == len(expected.nodes)
+    assert stats["edges_by_type"] == {"linked_to": len(expected.edges)}
+    assert [row["degree"] for row in stats["top_degree"]] == sorted(degree.values())[-5:][::-1]
+
+
+def test_sharded_validation_reports_dangling_edges_across_shards(tmp_path: Path) -> None:
+    graph = synthetic_graph(60, shape="chain")
+    gone = graph.nodes[10]
+    broken = GraphPayload(
+        run_meta=graph.run_meta,
+        nodes=[n for n in graph.nodes if n.id != gone.id] + [graph.nodes[0]],
+        edges=graph.edges + [dataclasses.replace(graph.edges[0], id="e_dangling", to_id="n_x")],
+    )
+    path = tmp_path / "broken.ndjson"
+    write_graph(broken, path)
+
+    with ShardedGraph.from_files([path], shards=5) as sharded:
+        report = sharded.validate(workers=2)
+    expected = {
+        f"duplicate node id {graph.nodes[0].id}",
+        "edge e_dangling has unknown to node n_x",
+        *(
+            f"edge {e.id} has unknown {role} node {gone.id}"
+            for e in graph.edges
+            for role, endpoint in (("from", e.from_id), ("to", e.to_id))
+            if endpoint == gone.id
+        ),
+    }
+    assert set(report.errors) == expected
+    assert report.error_count == len(expected)
+
+
+def test_cli_sharded_merge_validate_and_stats(tmp_path: Path, monkeypatch, capsys) -> None:
+    graph = synthetic_graph(120, shape="star")
+    source = tmp_path / "graph.ndjson"
+    write_graph(graph, source)
+    merged, stats = tmp_path / "merged.ndjson", tmp_path / "stats.json"
+
+    for argv in (
+        ["merge", str(source), str(source), "--out", str(merged), "--shards", "4"],
+        ["validate-graph", str(merged), "--shards", "4", "--workers", "2"],
+        ["stats", str(merged), "--shards", "4", "--top", "1", "--out", str(stats)],
+    ):
+        monkeypatch.setattr("sys.argv", ["private_ops", *argv])
+        assert main() == 0
+
+    assert len(read_graph(merged).nodes) == len(graph.nodes)
+    top = json.loads(stats.read_text(encoding="utf-8"))["top_degree"]
+    assert [row["id"] for row in top] == [graph.nodes[0].id]
+    assert "Graph is valid (120 nodes, 120 edges)." in capsys.readouterr().out
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import dataclasses
+from pathlib import Path
+
+from private_ops.cli import main
+from private_ops.protocol.models import GraphPayload, RunMeta, SourceRef, TransformRequest
+from private_ops.store import GraphStore
+from private_ops.transforms import dispatch
+
+
+def _phone_graph(run_id: str, phone: str = "(555) 123-4567"):
+    return dispatch(
+        TransformRequest(
+            transform="resolve.phone_to_entities",
+            inputs={"phone": phone},
+            run_meta=RunMeta(run_id=run_id, transform="resolve.phone_to_entities"),
+        )
+    ).graph
+
+
+def test_store_round_trips_runs_and_answers_indexed_lookups(tmp_path: Path) -> None:
+    graph = _phone_graph("run-1")
+    phone = graph.nodes[0]
+
+    with GraphStore(tmp_path / "graph.db") as store:
+        store.put_graph(graph)
+        store.put_graph(_phone_graph("run-2"))
+
+        assert store.load_run("run-1").to_dict() == graph.to_dict()
+        assert [r.run_id for r in store.runs()] == ["run-1", "run-2"]
+        assert store.get_node(phone.id) == phone
+        assert store.nodes_by_canonical_key(phone.canonical_key) == [phone]
+        assert len(store.nodes_by_type("person")) == 1
+        assert {n.type for n in store.neighbors(phone.id)} == {"person", "organization"}
+        assert store.edges_of(phone.id, direction="in") == []
+        assert store.load_run("missing") is None
+
+        journal_mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+
+def test_load_run_returns_only_that_runs_sources(tmp_path: Path) -> None:
+    first = _phone_graph("run-1")
+    phone = first.nodes[0]
+    rerun_source = SourceRef(source_id="carrier", title="Carrier lookup", confidence=0.9)
+    second = GraphPayload(
+        run_meta=RunMeta(run_id="run-2", transform="resolve.phone_to_entities"),
+        nodes=[dataclasses.replace(phone, sources=[rerun_source])],
+    )
+
+    with GraphStore(tmp_path / "graph.db") as store:
+        store.put_graph(first)
+        store.put_graph(second)
+
+        assert store.load_run("run-1").to_dict() == first.to_dict()
+        assert store.load_run("run-2").nodes[0].sources == [rerun_source]
+        assert store.get_node(phone.id).sources == [*phone.sources, rerun_source]
+
+        statements: list[str] = []
+        store._conn.set_trace_callback(statements.append)
+        neighbors = store.neighbors(phone.id, direction="out")
+        store._conn.set_trace_callback(None)
+    assert [n.id for n in neighbors] == sorted(e.to_id for e in first.edges)
+    assert [n.sources for n in neighbors] == [
+        next(node.sources for node in first.nodes if node.id == n.id) for n in neighbors
+    ]
+    assert len(statements) == 2
+
+
+def test_cli_run_transform_writes_store_and_validates_from_it(tmp_path: Path, monkeypatch) -> None:
+    db = tmp_path / "graph.db"
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "private_ops",
+            "run-transform",
+            "tests/fixtures/phone_request.json",
+            "--out",
+            str(tmp_path / "out.json"),
+            "--store",
+            str(db),
+        ],
+    )
+    assert main() == 0
+
+    monkeypatch.setattr(
+        "sys.argv",
+        ["private_ops", "validate-graph", "--store", str(db), "--run-id", "fixture-run-1"],
+    )
+    assert main() == 0
+
+
+def test_lookups_fetch_sources_in_one_query(tmp_path: Path) -> None:
+    graph = _phone_graph("run-1")
+    phone = graph.nodes[0]
+    others = [_phone_graph(f"run-{n}", f"(555) 123-000{n}") for n in range(2, 5)]
+
+    with GraphStore(tmp_path / "graph.db") as store:
+        for item in (graph, *others):
+            store.put_graph(item)
+
+        statements: list[str] = []
+        store._conn.set_trace_callback(statements.append)
+        phones = store.nodes_by_type("phone")
+        by_key = store.nodes_by_canonical_key(phone.canonical_key)
+        edges = store.edges_of(phone.id)
+        store._conn.set_trace_callback(None)
+
+    assert len(phones) == 4 and all(node.sources for node in phones)
+    assert by_key == [phone]
+    assert edges == sorted(graph.edges, key=lambda e: e.id)
+    assert len(statements) == 2 + 2 + 3
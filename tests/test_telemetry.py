@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from private_ops.cli import main
+from private_ops.protocol.models import TransformRequest
+from private_ops.telemetry import disable_telemetry, enable_telemetry, get_telemetry, span
+from private_ops.transforms import dispatch, registry
+from private_ops.transforms.aio import dispatch_async
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def telemetry():
+    yield enable_telemetry(reset=True)
+    disable_telemetry()
+    get_telemetry().reset()
+
+
+def _phone_request() -> TransformRequest:
+    return TransformRequest(transform="resolve.phone_to_entities", inputs={"phone": "5551234567"})
+
+
+def test_disabled_telemetry_records_nothing() -> None:
+    get_telemetry().reset()
+    with span("anything", transform="x") as current:
+        current.set("k", "v")
+    dispatch(_phone_request(), use_cache=False)
+
+    assert get_telemetry().spans() == []
+    assert get_telemetry().prometheus_text() == ""
+
+
+def test_dispatch_records_nested_spans_and_per_transform_metrics(telemetry) -> None:
+    dispatch(_phone_request(), use_cache=False)
+    dispatch(TransformRequest(transform="missing.transform", inputs={}))
+
+    transform, first, second = telemetry.spans()
+    names = (transform["name"], first["name"], second["name"])
+    assert names == ("transform", "dispatch", "dispatch")
+    assert transform["parent_id"] == first["span_id"]
+    assert second["attrs"]["status"] == "error"
+
+    name = "resolve.phone_to_entities"
+    assert telemetry.counter_value(
+        "private_ops_transform_requests_total", transform=name, status="ok"
+    ) == 1
+    assert telemetry.counter_value(
+        "private_ops_transform_requests_total", transform="missing.transform", status="error"
+    ) == 1
+    entities = telemetry.histogram("private_ops_transform_entities", transform=name)
+    assert (entities.count, entities.total) == (1, 5)
+
+    text = telemetry.prometheus_text()
+    assert "# TYPE private_ops_transform_seconds histogram" in text
+    assert f'private_ops_transform_seconds_count{{transform="{name}"}} 1' in text
+    assert f'private_ops_transform_entities_bucket{{transform="{name}",le="5"}} 1' in text
+
+
+def test_raising_transforms_count_as_errors(telemetry, monkeypatch) -> None:
+    monkeypatch.setattr(registry, "_REGISTRY", dict(registry._REGISTRY))
+
+    @registry.register("tests.raises")
+    def _raises(request: TransformRequest):
+        raise RuntimeError("upstream down")
+
+    request = TransformRequest(transform="tests.raises", inputs={})
+    with pytest.raises(RuntimeError):
+        dispatch(request, use_cache=False)
+    with pytest.raises(RuntimeError):
+        asyncio.run(dispatch_async(request, use_cache=False))
+
+    assert telemetry.counter_value(
+        "private_ops_transform_requests_total", transform="tests.raises", status="error"
+    ) == 2
+    assert [record["status"] for record in telemetry.spans() if record["name"] == "dispatch"] == [
+        "error",
+        "error",
+    ]
+
+
+def test_cli_writes_trace_and_metrics(tmp_path, monkeypatch) -> None:
+    trace = tmp_path / "trace.ndjson"
+    metrics = tmp_path / "metrics.prom"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "private_ops", "--trace", str(trace), "--metrics", str(metrics),
+            "run-transform", str(FIXTURES / "phone_request.json"),
+            "--out", str(tmp_path / "o.json"),
+        ],
+    )
+
+    try:
+        assert main() == 0
+    finally:
+        get_telemetry().reset()
+
+    records = [json.loads(line) for line in trace.read_text(encoding="utf-8").splitlines()]
+    names = [record["name"] for record in records]
+    assert names[-1] == "command"
+    assert {"dispatch", "transform", "maltego_mapping", "write"} <= set(names)
+    assert "private_ops_write_seconds_count 1" in metrics.read_text(encoding="utf-8")
+    assert not get_telemetry().enabled
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from private_ops.protocol.models import GraphPayload, RunMeta, TransformRequest
+from private_ops.transforms import TransformCache, dispatch, register
+
+_CALLS: list[str] = []
+
+
+@register("tests.counting_transform", cache_ttl=60.0)
+def _counting_transform(request: TransformRequest) -> GraphPayload:
+    _CALLS.append(str(request.inputs.get("value")))
+    return GraphPayload(run_meta=request.run_meta or RunMeta(run_id="r", transform=request.transform))
+
+
+def _request(value: str, run_id: str = "run-1") -> TransformRequest:
+    return TransformRequest(
+        transform="tests.counting_transform",
+        inputs={"value": value},
+        run_meta=RunMeta(run_id=run_id, transform="tests.counting_transform"),
+    )
+
+
+def test_dispatch_consults_memory_then_disk_tier(tmp_path: Path) -> None:
+    _CALLS.clear()
+    cache = TransformCache(tmp_path / "cache")
+
+    first = dispatch(_request("a"), cache=cache)
+    second = dispatch(_request("a", run_id="run-2"), cache=cache)
+    assert _CALLS == ["a"]
+    assert second.graph.run_meta.run_id == "run-2"
+    assert second.graph.nodes == first.graph.nodes
+
+    cold = TransformCache(tmp_path / "cache")
+    dispatch(_request("a"), cache=cold)
+    assert _CALLS == ["a"]
+    assert cold.stats.disk_hits == 1
+
+    dispatch(_request("a"), cache=cold, refresh=True)
+    dispatch(_request("a"), cache=cold, use_cache=False)
+    assert _CALLS == ["a", "a", "a"]
+    assert cache.stats.to_dict() == {
+        "memory_hits": 1,
+        "disk_hits": 0,
+        "misses": 1,
+        "stores": 1,
+        "expired": 0,
+        "evictions": 0,
+    }
+
+
+def test_cache_expires_by_registered_ttl_and_evicts_by_size(tmp_path: Path) -> None:
+    _CALLS.clear()
+    now = [1000.0]
+    cache = TransformCache(tmp_path / "cache", max_entries=1, max_bytes=1, clock=lambda: now[0])
+
+    dispatch(_request("a"), cache=cache)
+    now[0] += 61
+    dispatch(_request("a"), cache=cache)
+    assert _CALLS == ["a", "a"]
+    assert cache.stats.expired == 1
+    assert list((tmp_path / "cache").glob("*/*.json")) == []
+
+    cache.set_ttl("tests.counting_transform", None)
+    dispatch(_request("b"), cache=cache)
+    dispatch(_request("a"), cache=cache)
+    assert _CALLS == ["a", "a", "b", "a"]
+
+
+def test_equivalent_phone_spellings_share_one_entry_but_keep_their_raw_input() -> None:
+    cache = TransformCache()
+    spellings = ("(555) 123-4567", "5551234567", "555.123.4567")
+
+    responses = [
+        dispatch(
+            TransformRequest(transform="resolve.phone_to_entities", inputs={"phone": spelling}),
+            cache=cache,
+        )
+        for spelling in spellings
+    ]
+
+    assert len({tuple(n.id for n in r.graph.nodes) for r in responses}) == 1
+    raws = [
+        node.properties["raw"]
+        for response in responses
+        for node in response.graph.nodes
+        if node.type == "phone"
+    ]
+    assert raws == list(spellings)
+    assert (cache.stats.misses, cache.stats.memory_hits, cache.stats.stores) == (1, 2, 1)
+
+
+def test_unreadable_disk_entries_are_misses_and_evicted(tmp_path: Path) -> None:
+    _CALLS.clear()
+    dispatch(_request("a"), cache=TransformCache(tmp_path / "cache"))
+    [entry] = (tmp_path / "cache").glob("*/*.json")
+
+    for text in ("{trunc", "[]", '{"created": 1}', '{"created": 1, "response": []}'):
+        entry.write_text(text, encoding="utf-8")
+        cold = TransformCache(tmp_path / "cache", clock=lambda: 1.0)
+        assert cold.get("tests.counting_transform", entry.stem) is None
+        assert cold.stats.misses == 1 and not entry.exists()
+        dispatch(_request("a"), cache=cold)
+        assert entry.exists()
+    assert _CALLS == ["a"] * 5
+
+
+def test_cached_responses_do_not_share_graph_lists(tmp_path: Path) -> None:
+    cache = TransformCache()
+    first = dispatch(_request("a"), cache=cache)
+    first.graph.nodes.append(None)  # type: ignore[arg-type]
+
+    second = dispatch(_request("a", run_id="run-2"), cache=cache)
+    assert second.graph.nodes == []
+    second.graph.edges.append(None)  # type: ignore[arg-type]
+    assert dispatch(_request("a", run_id="run-3"), cache=cache).graph.edges == []
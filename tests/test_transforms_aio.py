@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from private_ops.protocol.models import GraphPayload, RunMeta, TransformRequest
+from private_ops.transforms import dispatch, register
+from private_ops.transforms.aio import dispatch_async, dispatch_many_async
+
+_ACTIVE = {"now": 0, "peak": 0}
+
+
+@register("tests.async_lookup", concurrency=2)
+async def _async_lookup(request: TransformRequest) -> GraphPayload:
+    _ACTIVE["now"] += 1
+    _ACTIVE["peak"] = max(_ACTIVE["peak"], _ACTIVE["now"])
+    try:
+        await asyncio.sleep(float(request.inputs.get("delay", 0.01)))
+    finally:
+        _ACTIVE["now"] -= 1
+    return GraphPayload(run_meta=request.run_meta or RunMeta(run_id="r", transform=request.transform))
+
+
+@register("tests.async_failing")
+async def _async_failing(request: TransformRequest) -> GraphPayload:
+    raise RuntimeError("upstream down")
+
+
+def _request(transform: str, **inputs: object) -> TransformRequest:
+    return TransformRequest(transform=transform, inputs=dict(inputs))
+
+
+def test_dispatch_many_async_respects_per_transform_concurrency() -> None:
+    _ACTIVE.update(now=0, peak=0)
+
+    async def _collect() -> list[tuple[int, bool]]:
+        requests = [_request("tests.async_lookup") for _ in range(8)]
+        requests.append(_request("resolve.phone_to_entities", phone="5551234567"))
+        return [(i, r.ok) async for i, r in dispatch_many_async(requests, max_in_flight=6)]
+
+    results = asyncio.run(_collect())
+
+    assert sorted(i for i, _ in results) == list(range(9))
+    assert all(ok for _, ok in results)
+    assert _ACTIVE["peak"] == 2
+
+
+def test_dispatch_async_timeout_and_sync_fallback() -> None:
+    response = asyncio.run(dispatch_async(_request("tests.async_lookup", delay=1.0), timeout=0.01))
+    assert response.ok is False
+    assert "timed out" in response.errors[0]
+
+    assert dispatch(_request("tests.async_lookup")).ok is True
+
+
+def test_closing_iterator_cancels_pending_requests() -> None:
+    _ACTIVE.update(now=0, peak=0)
+
+    async def _first_only() -> None:
+        requests = [_request("tests.async_lookup", delay=d) for d in (0.01, 5, 5)]
+        stream = dispatch_many_async(requests)
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(asyncio.wait_for(_first_only(), 2))
+    assert _ACTIVE["now"] == 0
+
+
+def test_failing_transform_yields_an_error_response() -> None:
+    async def _collect() -> dict[int, list[str]]:
+        requests = [_request("tests.async_lookup"), _request("tests.async_failing")]
+        return {i: r.errors async for i, r in dispatch_many_async(requests)}
+
+    results = asyncio.run(_collect())
+
+    assert results == {
+        0: [],
+        1: ["Transform 'tests.async_failing' failed: RuntimeError: upstream down"],
+    }
+
+
+def test_sync_dispatch_of_async_transform_inside_a_loop_points_to_dispatch_async() -> None:
+    async def _inside_loop() -> None:
+        dispatch(_request("tests.async_lookup"), use_cache=False)
+
+    with pytest.raises(RuntimeError, match="dispatch_async"):
+        asyncio.run(_inside_loop())
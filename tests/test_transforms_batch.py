@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from private_ops.cli import main
+from private_ops.transforms.batch import BatchSummary, dispatch_batch
+
+
+def _request_line(phone: str, transform: str = "resolve.phone_to_entities") -> str:
+    return json.dumps({"transform": transform, "inputs": {"phone": phone}})
+
+
+def test_dispatch_batch_preserves_input_order() -> None:
+    lines = [_request_line(f"555123{i:04d}") for i in range(20)]
+
+    results = list(dispatch_batch(lines, workers=4, max_in_flight=3, chunk_size=2))
+
+    assert [r.line for r in results] == list(range(1, 21))
+    assert all(r.ok for r in results)
+
+
+def test_dispatch_batch_unordered_reports_bad_lines() -> None:
+    lines = [
+        _request_line("5551234567"),
+        "",
+        "{not json",
+        "[1]",
+        json.dumps({"transform": "resolve.phone_to_entities", "inputs": ["x"]}),
+        _request_line("5559876543"),
+    ]
+
+    results = list(dispatch_batch(lines, workers=2, ordered=False))
+
+    assert sorted(r.line for r in results) == [1, 3, 4, 5, 6]
+    bad = sorted((r for r in results if not r.ok), key=lambda r: r.line)
+    assert [r.line for r in bad] == [3, 4, 5]
+    assert "line 3" in bad[0].payload["errors"][0]
+    assert bad[1].payload["errors"] == [
+        "invalid request on line 4: request must be a JSON object, got list"
+    ]
+    assert "inputs must be a JSON object" in bad[2].payload["errors"][0]
+
+
+def test_dispatch_batch_reports_transform_exceptions_per_line(isolated_registry) -> None:
+    @isolated_registry.register("tests.exploding")
+    def _explode(request):
+        raise RuntimeError(f"boom {request.inputs['phone']}")
+
+    lines = [
+        _request_line("5551234567"),
+        _request_line("5550000000", transform="tests.exploding"),
+        _request_line("5559876543"),
+    ]
+    summary = BatchSummary()
+
+    for result in dispatch_batch(lines, workers=2, chunk_size=2):
+        summary.record(result)
+        if result.line == 2:
+            assert result.payload["errors"] == [
+                "transform failed on line 2: RuntimeError: boom 5550000000"
+            ]
+
+    assert summary.to_dict() == {"total": 3, "ok": 2, "errors": 1}
+
+
+def test_cli_run_batch_exit_code_reflects_errors(tmp_path: Path, monkeypatch, capsys) -> None:
+    requests_path = tmp_path / "requests.ndjson"
+    out_path = tmp_path / "responses.ndjson"
+    requests_path.write_text(
+        "\n".join(
+            [
+                _request_line("5551234567"),
+                json.dumps({"transform": "missing.transform", "inputs": {}}),
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    monkeypatch.setattr(
+        "sys.argv",
+        ["private_ops", "run-batch", str(requests_path), "--out", str(out_path), "--workers", "2"],
+    )
+    assert main() == 1
+
+    records = [json.loads(line) for line in out_path.read_text(encoding="utf-8").splitlines()]
+    assert [r["status"] for r in records] == ["ok", "error"]
+    assert "2 requests: 1 ok, 1 error" in capsys.readouterr().out
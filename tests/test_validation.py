@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+
+from private_ops.cli import main
+from private_ops.protocol.graph_io import _JsonStream, _graph_object
+from private_ops.protocol.validation import validate_graph_file
+
+
+def _node(node_id: str) -> dict:
+    return {"id": node_id, "type": "t", "canonical_key": node_id, "label": node_id}
+
+
+def _edge(edge_id: str, from_id: str, to_id: str) -> dict:
+    return {"id": edge_id, "type": "rel", "from": from_id, "to": to_id, "canonical_key": edge_id}
+
+
+def _ndjson(path, records) -> None:
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+
+def test_streaming_validator_reports_line_numbers(tmp_path) -> None:
+    path = tmp_path / "graph.ndjson"
+    path.write_text(
+        "\n".join(
+            [
+                json.dumps({"type": "run_meta", "data": {"run_id": "r", "transform": "t"}}),
+                json.dumps({"type": "node", "data": _node("a")}),
+                json.dumps({"type": "node", "data": _node("a")}),
+                "{not json",
+                json.dumps({"type": "edge", "data": _edge("e1", "a", "missing")}),
+                json.dumps({"type": "node", "data": {"id": "b"}}),
+                json.dumps({"type": "edge", "data": _edge("e2", "late", "a")}),
+                json.dumps({"type": "node", "data": _node("late")}),
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    report = validate_graph_file(path)
+
+    assert (report.nodes, report.edges) == (4, 2)
+    assert report.errors[0] == "line 3: duplicate node id a"
+    assert report.errors[1].startswith("line 4: invalid record:")
+    assert report.errors[2:] == [
+        "line 6: node record is missing type, canonical_key, label",
+        "line 5: edge e1 has unknown to node missing",
+    ]
+
+
+def test_streaming_validator_handles_json_with_edges_before_nodes(tmp_path) -> None:
+    graph = {
+        "run_meta": {"run_id": "r", "transform": "t"},
+        "nodes": [_node("a"), _node("b")],
+        "edges": [_edge("e1", "a", "b")],
+    }
+    pretty = tmp_path / "graph.json"
+    pretty.write_text(json.dumps({"graph": graph, "ok": True}, indent=2, sort_keys=True))
+    assert validate_graph_file(pretty).ok
+
+    graph["edges"].append(_edge("e2", "b", "c"))
+    compact = tmp_path / "compact.json"
+    compact.write_text(json.dumps(graph, sort_keys=True))
+    report = validate_graph_file(compact)
+    assert report.errors == ["line 1: edge e2 has unknown to node c"]
+
+
+def test_json_stream_refills_small_chunks() -> None:
+    text = json.dumps(
+        {"maltego": {"entities": [{"x": 1}]}, "nodes": [_node("a" * 40), _node("b")], "n": 12345},
+        indent=1,
+    )
+    records = list(_graph_object(_JsonStream(io.StringIO(text), chunk_size=5)))
+    assert [(kind, data["id"]) for _, kind, data in records] == [("node", "a" * 40), ("node", "b")]
+    assert [line for line, _, _ in records] == [10, 16]
+
+
+def test_validate_graph_command_caps_errors(tmp_path, monkeypatch, capsys) -> None:
+    path = tmp_path / "graph.ndjson"
+    _ndjson(
+        path,
+        [{"type": "node", "data": _node("a")}]
+        + [{"type": "edge", "data": _edge(f"e{i}", "a", f"x{i}")} for i in range(5)],
+    )
+    monkeypatch.setattr(
+        sys, "argv", ["private_ops", "validate-graph", str(path), "--max-errors", "2"]
+    )
+
+    assert main() == 1
+    out = capsys.readouterr().out
+    assert "line 2: edge e0 has unknown to node x0" in out
+    assert "line 4:" not in out
+    assert "... and 3 more errors" in out